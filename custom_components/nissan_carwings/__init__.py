@@ -10,6 +10,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME, Platform
+from homeassistant.core import SupportsResponse
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
 from homeassistant.exceptions import ServiceValidationError, HomeAssistantError
@@ -18,24 +19,40 @@ import voluptuous as vol
 
 from custom_components.nissan_carwings.const import (
     CONF_PYCARWINGS3_BASE_URL,
+    DATA_AUTH_STATE_KEY,
+    DATA_BATTERY_STATUS_KEY,
+    DATA_CHARGING_SESSIONS_KEY,
     DATA_CLIMATE_STATUS_KEY,
     DATA_DRIVING_ANALYSIS_KEY,
-    DATA_TIMESTAMP_KEY,
+    DATA_DRIVING_HISTORY_KEY,
+    DEFAULT_BUDGET_PER_DAY,
+    DEFAULT_BUDGET_PER_HOUR,
+    DEFAULT_COMMAND_WINDOW,
+    DEFAULT_CHARGING_SESSIONS_LIMIT,
+    DEFAULT_PROFILE_TOP,
     DOMAIN,
     LOGGER,
+    OPTIONS_BUDGET_PER_DAY,
+    OPTIONS_BUDGET_PER_HOUR,
+    OPTIONS_COMMAND_WINDOW,
     SERVICE_UPDATE,
     SERVICE_START_CLIMATE,
     SERVICE_STOP_CLIMATE,
     SERVICE_START_CHARGING,
+    SERVICE_GET_CHARGING_SESSIONS,
+    SERVICE_PROFILE,
 )
 
-from .api import NissanCarwingsApiClient
+from .api import NissanCarwingsApiClient, async_import_pycarwings3
+from .budget import NissanCarwingsRequestBudget, RequestPriority
 from .coordinator import (
     CarwingsClimateDataUpdateCoordinator,
     CarwingsDataUpdateCoordinator,
     CarwingsDrivingAnalysisDataUpdateCoordinator,
 )
 from .data import NissanCarwingsClimatePendingState, NissanCarwingsData
+from .profiler import async_profile_refresh
+from .store import NissanCarwingsSnapshotStore
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -60,6 +77,8 @@ async def async_setup_entry(
     entry: NissanCarwingsConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
+    await async_import_pycarwings3(hass)
+    snapshot_store = NissanCarwingsSnapshotStore(hass, entry.entry_id)
     coordinator = CarwingsDataUpdateCoordinator(
         hass=hass,
         config_entry=entry,
@@ -79,29 +98,64 @@ async def async_setup_entry(
             region=entry.data[CONF_REGION],
             session=async_get_clientsession(hass),
             base_url=entry.data.get(CONF_PYCARWINGS3_BASE_URL),
+            vin=entry.data["vin"],
+            budget=NissanCarwingsRequestBudget(
+                per_day=entry.options.get(OPTIONS_BUDGET_PER_DAY, DEFAULT_BUDGET_PER_DAY),
+                per_hour=entry.options.get(OPTIONS_BUDGET_PER_HOUR, DEFAULT_BUDGET_PER_HOUR),
+            ),
+            command_window=entry.options.get(OPTIONS_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW),
+            auth_state_listener=lambda auth_state: snapshot_store.async_save_snapshot(
+                DATA_AUTH_STATE_KEY, {DATA_AUTH_STATE_KEY: auth_state}
+            ),
         ),
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
         climate_coordinator=climate_coordinator,
         climate_pending_state=NissanCarwingsClimatePendingState(),
         driving_analysis_coordinator=driving_analysis_coordinator,
+        snapshot_store=snapshot_store,
     )
 
-    LOGGER.info(f"Starting Nissan Carwings integration for user={entry.data[CONF_USERNAME]}")
-
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    # requests in flight (an update request may poll for minutes) and the commands still held back
+    # in the coalescing window must not outlive the entry (e.g. on reload)
+    entry.async_on_unload(entry.runtime_data.client.close)
 
-    climate_coordinator.data = {DATA_CLIMATE_STATUS_KEY: None, DATA_TIMESTAMP_KEY: None}
-    driving_analysis_coordinator.data = {
-        DATA_DRIVING_ANALYSIS_KEY: None,
-        DATA_TIMESTAMP_KEY: None,
-    }
+    LOGGER.info(f"Starting Nissan Carwings integration for user={entry.data[CONF_USERNAME]}")
 
-    # synchronize data in background to speedup the startup time for this integration
-    # related entities will stick in the unavailable state until the first data is fetched
-    hass.loop.create_task(climate_coordinator.async_refresh())
-    hass.loop.create_task(driving_analysis_coordinator.async_refresh())
+    # restore the data persisted on the last run, so that the entities have a state right away
+    snapshots = await snapshot_store.async_load()
+
+    # reuse the login session of the last run, the client logs in again if the server rejects it
+    if (auth_snapshot := snapshots.get(DATA_AUTH_STATE_KEY)) is not None:
+        entry.runtime_data.client.restore_auth_state(auth_snapshot[DATA_AUTH_STATE_KEY])
+
+    # without a snapshot (first run), the entities have no state until the first refresh has completed
+    coordinator.restore_snapshot(snapshots.get(DATA_BATTERY_STATUS_KEY))
+    climate_coordinator.restore_snapshot(snapshots.get(DATA_CLIMATE_STATUS_KEY))
+    driving_analysis_coordinator.restore_snapshot(snapshots.get(DATA_DRIVING_ANALYSIS_KEY))
+
+    if (charging_sessions := snapshots.get(DATA_CHARGING_SESSIONS_KEY)) is not None:
+        coordinator.charging_sessions.restore(charging_sessions)
+    if (driving_history := snapshots.get(DATA_DRIVING_HISTORY_KEY)) is not None:
+        driving_analysis_coordinator.driving_history.restore(driving_history)
+
+    # the snapshot sample has already been imported into the statistics on the last run
+    coordinator.add_battery_sample(coordinator.data[DATA_BATTERY_STATUS_KEY], import_statistics=False)
+
+    # the first refreshes run as background tasks of the entry (with a deadline, cancelled on unload),
+    # so that the platform setup and the startup of Home Assistant never wait on the Nissan servers;
+    # with the unified refresh, the battery coordinator also fetches the climate and driving analysis data
+    bootstrap_coordinators = (
+        (coordinator,)
+        if coordinator.is_unified_refresh
+        else (coordinator, climate_coordinator, driving_analysis_coordinator)
+    )
+    for bootstrap_coordinator in bootstrap_coordinators:
+        entry.async_create_background_task(
+            hass,
+            bootstrap_coordinator.async_bootstrap_refresh(),
+            f"nissan_carwings {bootstrap_coordinator.data_key} first refresh",
+        )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -118,13 +172,21 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: NissanCarwingsConfigEntry,
+) -> None:
+    """Remove the persisted data of an entry."""
+    await NissanCarwingsSnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: NissanCarwingsConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # reload via the config entries, so that the background tasks and unload callbacks of the entry are run
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def register_services(hass: HomeAssistant, entry: NissanCarwingsConfigEntry):
@@ -146,42 +208,57 @@ async def register_services(hass: HomeAssistant, entry: NissanCarwingsConfigEntr
         current_vin = entry.data["vin"]
         validate_vin(service_call, current_vin, "update")
         LOGGER.debug("Service call to update data for VIN=%s", current_vin)
-        # request the latest data from the Nissan servers
-        await client.async_update_data()
+        # request the latest data from the Nissan servers (joins an update already in progress)
+        await client.async_update_data(RequestPriority.USER)
         # tell the coordinator to refresh the data
         await coordinator.async_request_refresh()
 
     async def start_climate_service(service_call):
         """Handle starting the climate system."""
-        client = entry.runtime_data.client
         current_vin = entry.data["vin"]
         validate_vin(service_call, current_vin, "start climate")
         LOGGER.debug("Service call to start climate for VIN=%s", current_vin)
-        await client.async_set_climate(switch_on=True)
-        entry.runtime_data.climate_coordinator.set_climate_pending_state(True)
+        await entry.runtime_data.climate_coordinator.async_set_climate(switch_on=True)
 
     async def stop_climate_service(service_call):
         """Handle stopping the climate system."""
-        client = entry.runtime_data.client
         current_vin = entry.data["vin"]
         validate_vin(service_call, current_vin, "stop climate")
         LOGGER.debug("Service call to stop climate for VIN=%s", current_vin)
-        await client.async_set_climate(switch_on=False)
-        entry.runtime_data.climate_coordinator.set_climate_pending_state(False)
+        await entry.runtime_data.climate_coordinator.async_set_climate(switch_on=False)
 
     async def start_charging(service_call):
         """Handle starting charging."""
-        client = entry.runtime_data.client
         current_vin = entry.data["vin"]
         validate_vin(service_call, current_vin, "start charging")
         LOGGER.debug("Service call to start charging for VIN=%s", current_vin)
         try:
-            result = await client.async_start_charging()
+            result = await entry.runtime_data.coordinator.async_start_charging()
             if not result:
                 raise HomeAssistantError("Failed to start charging")
         except Exception as exception:
             raise HomeAssistantError(f"Error starting charging: {exception}")
 
+    async def get_charging_sessions(service_call):
+        """Handle returning the recent charging sessions."""
+        current_vin = entry.data["vin"]
+        validate_vin(service_call, current_vin, "get charging sessions")
+        charging_sessions = entry.runtime_data.coordinator.charging_sessions
+        return {
+            "sessions": [session.as_dict() for session in charging_sessions.recent(service_call.data["limit"])],
+            "active_session": charging_sessions.active.as_dict() if charging_sessions.active is not None else None,
+            "total_energy_kwh": round(charging_sessions.total_energy_wh / 1000, 3),
+        }
+
+    async def profile(service_call):
+        """Handle profiling a full refresh cycle."""
+        current_vin = entry.data["vin"]
+        validate_vin(service_call, current_vin, "profile")
+        LOGGER.debug("Service call to profile a refresh cycle for VIN=%s", current_vin)
+        return await async_profile_refresh(
+            hass, entry, top=service_call.data["top"], save_profile=service_call.data["save_profile"]
+        )
+
     hass.services.async_register(
         DOMAIN,
         SERVICE_UPDATE,
@@ -209,3 +286,30 @@ async def register_services(hass: HomeAssistant, entry: NissanCarwingsConfigEntr
         start_charging,
         schema=vol.Schema({vol.Required("vin"): cv.string}),
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHARGING_SESSIONS,
+        get_charging_sessions,
+        schema=vol.Schema(
+            {
+                vol.Required("vin"): cv.string,
+                vol.Optional("limit", default=DEFAULT_CHARGING_SESSIONS_LIMIT): cv.positive_int,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        profile,
+        schema=vol.Schema(
+            {
+                vol.Required("vin"): cv.string,
+                vol.Optional("top", default=DEFAULT_PROFILE_TOP): cv.positive_int,
+                vol.Optional("save_profile", default=False): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -3,23 +3,71 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from pycarwings3.responses import (
-    CarwingsLatestClimateControlStatusResponse,
-    CarwingsLatestBatteryStatusResponse,
-    CarwingsDrivingAnalysisResponse,
-)
-from pycarwings3 import Session, CarwingsError
+import aiohttp
+from homeassistant.helpers.importlib import async_import_module
 
 from .const import (
+    API_OPERATION_BATTERY_STATUS,
+    API_OPERATION_CLIMATE_RESULT,
+    API_OPERATION_DRIVING_ANALYSIS,
+    API_OPERATION_ELECTRIC_RATE_SIMULATION,
+    API_OPERATION_HVAC_STATUS,
+    API_OPERATION_LOGIN,
+    API_OPERATION_REQUEST_UPDATE,
+    API_OPERATION_START_CHARGING,
+    API_OPERATION_START_CLIMATE,
+    API_OPERATION_STOP_CLIMATE,
+    API_OPERATION_UPDATE_RESULT,
+    CLIMATE_RESULT_POLLING_FIRST_DELAY,
+    CLIMATE_RESULT_POLLING_INTERVAL,
+    CLIMATE_RESULT_POLLING_MAX_INTERVAL,
+    CLIMATE_RESULT_POLLING_TIMEOUT,
+    DEFAULT_COMMAND_WINDOW,
+    LEAF_CACHE_TTL,
     LOGGER,
-    PYCARWINGS_MAX_RESPONSE_ATTEMPTS,
-    PYCARWINGS_SLEEP,
+    RESULT_POLLING_BACKOFF,
+    RESULT_POLLING_FIRST_DELAY,
+    RESULT_POLLING_INTERVAL,
+    RESULT_POLLING_JITTER,
+    RESULT_POLLING_MAX_INTERVAL,
+    RESULT_POLLING_TIMEOUT,
+)
+from .breaker import ErrorClass, NissanCarwingsCircuitBreaker
+from .budget import NissanCarwingsRequestBudget, RequestPriority
+from .command_queue import NissanCarwingsCommandQueue
+from .commands import NissanCarwingsCommandTracker
+from .metrics import NissanCarwingsApiMetrics
+from .models import (
+    AuthState,
+    BatteryState,
+    ClimateCommandResult,
+    ClimateState,
+    DrivingAnalysis,
+    driving_analyses_from_simulation,
 )
 
 if TYPE_CHECKING:
-    import aiohttp
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+    from pycarwings3 import CarwingsError, Leaf
+    from pycarwings3.responses import (
+        CarwingsDrivingAnalysisResponse,
+        CarwingsElectricRateSimulationResponse,
+        CarwingsLatestBatteryStatusResponse,
+        CarwingsLatestClimateControlStatusResponse,
+    )
+
+    from .commands import TrackedCommand
+
+# error messages returned by the Carwings servers when the custom_sessionid is no longer accepted
+SESSION_ERROR_MESSAGES = ("INVALID PARAMS",)
 
 
 class NissanCarwingsApiClientError(Exception):
@@ -38,6 +86,18 @@ class NissanCarwingsApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class NissanCarwingsApiBudgetExceededError(
+    NissanCarwingsApiClientError,
+):
+    """Exception to indicate that the request budget has been used up."""
+
+
+class NissanCarwingsApiCircuitOpenError(
+    NissanCarwingsApiClientError,
+):
+    """Exception to indicate that requests are paused because the Nissan servers are failing."""
+
+
 class NissanCarwingsApiUpdateTimeoutError(Exception):
     """Exception to indicate when an update was not successful."""
 
@@ -52,12 +112,107 @@ def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
     response.raise_for_status()
 
 
+async def async_import_pycarwings3(hass: HomeAssistant) -> None:
+    """
+    Import pycarwings3 in the executor.
+
+    pycarwings3 (and its dependencies) is not imported with the integration but on first use, this
+    is to be awaited before creating an API client so that the import does not block the event loop.
+    """
+    await async_import_module(hass, "pycarwings3")
+
+
+def _is_session_error(exception: CarwingsError) -> bool:
+    """Check if the error indicates that the current login session was rejected by the server."""
+    return str(exception) in SESSION_ERROR_MESSAGES
+
+
+def _classify_error(exception: Exception) -> ErrorClass:
+    """Classify an error of an API call for the circuit breaker."""
+    from pycarwings3 import CarwingsError
+
+    if isinstance(exception, TimeoutError | aiohttp.ClientError):
+        return ErrorClass.TRANSIENT
+    if isinstance(exception, CarwingsError):
+        if _is_session_error(exception):
+            # still rejected after logging in again
+            return ErrorClass.AUTH
+        # pycarwings3 wraps connection errors and non-JSON answers (e.g. maintenance pages)
+        if isinstance(exception.__cause__, aiohttp.ClientError):
+            return ErrorClass.TRANSIENT
+    return ErrorClass.PERMANENT
+
+
+@dataclass(frozen=True)
+class ResultPollingPolicy:
+    """Timing used to poll for the result of an asynchronous (result key based) Carwings operation."""
+
+    # delay before the first probe, in seconds
+    first_delay: float = RESULT_POLLING_FIRST_DELAY
+    # delay between the first and the second probe, in seconds
+    interval: float = RESULT_POLLING_INTERVAL
+    # factor applied to the delay after each unsuccessful probe
+    backoff: float = RESULT_POLLING_BACKOFF
+    # upper limit for the delay between two probes, in seconds
+    max_interval: float = RESULT_POLLING_MAX_INTERVAL
+    # relative random jitter applied to each delay (0.1 => +/- 10%)
+    jitter: float = RESULT_POLLING_JITTER
+    # overall deadline, in seconds
+    timeout: float = RESULT_POLLING_TIMEOUT
+
+
+# polling for the answer of the car to climate control commands
+CLIMATE_RESULT_POLLING = ResultPollingPolicy(
+    first_delay=CLIMATE_RESULT_POLLING_FIRST_DELAY,
+    interval=CLIMATE_RESULT_POLLING_INTERVAL,
+    max_interval=CLIMATE_RESULT_POLLING_MAX_INTERVAL,
+    timeout=CLIMATE_RESULT_POLLING_TIMEOUT,
+)
+
+
+async def async_poll_for_result(
+    probe: Callable[[], Awaitable[Any | None]],
+    policy: ResultPollingPolicy,
+    description: str,
+) -> Any:
+    """
+    Poll until probe() returns a result (anything but None) and return it.
+
+    The first probe is done after policy.first_delay, subsequent probes back off geometrically.
+    Raises NissanCarwingsApiUpdateTimeoutError when the deadline is reached without a result.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + policy.timeout
+    delay = policy.first_delay
+    interval = policy.interval
+    attempt = 0
+
+    while (remaining := deadline - loop.time()) > 0:
+        await asyncio.sleep(min(delay, remaining))
+        attempt += 1
+        result = await probe()
+        if result is not None:
+            LOGGER.debug(
+                "%s: got result after %s attempt(s), %.1fs",
+                description,
+                attempt,
+                loop.time() - started,
+            )
+            return result
+
+        delay = interval * random.uniform(1 - policy.jitter, 1 + policy.jitter)  # noqa: S311
+        interval = min(interval * policy.backoff, policy.max_interval)
+        LOGGER.debug("%s: no result yet (attempt %s), next probe in %.1fs", description, attempt, delay)
+
+    msg = f"{description}: timeout after {attempt} attempt(s), {policy.timeout}s"
+    LOGGER.warning(msg)
+    raise NissanCarwingsApiUpdateTimeoutError(msg)
+
+
 class NissanCarwingsApiClient:
     """Nissan Carwings API Client."""
 
-    is_update_in_progress = False
-    update_semaphore = asyncio.Semaphore(1)
-
     def __init__(
         self,
         username: str,
@@ -65,12 +220,47 @@ class NissanCarwingsApiClient:
         region: str,
         session: aiohttp.ClientSession,
         base_url: str | None,
+        result_polling: ResultPollingPolicy | None = None,
+        vin: str | None = None,
+        budget: NissanCarwingsRequestBudget | None = None,
+        climate_result_polling: ResultPollingPolicy | None = None,
+        command_window: float = DEFAULT_COMMAND_WINDOW,
+        auth_state_listener: Callable[[AuthState], None] | None = None,
     ) -> None:
         """Sample API Client."""
+        from pycarwings3 import Session
+
         self._username = username
         self._password = password
         self._region = region
         self._session = session
+        self._result_polling = result_polling or ResultPollingPolicy()
+        self._climate_result_polling = climate_result_polling or CLIMATE_RESULT_POLLING
+        self._vin = vin
+        # called with the new session state after each login, to persist it
+        self._auth_state_listener = auth_state_listener
+
+        # latency and error metrics of the API calls
+        self.metrics = NissanCarwingsApiMetrics()
+        # request budget, shared by all coordinators and services
+        self.budget = budget or NissanCarwingsRequestBudget()
+        # pauses all requests while the Nissan servers are failing
+        self.breaker = NissanCarwingsCircuitBreaker()
+        # commands sent to the car and their outcome
+        self.commands = NissanCarwingsCommandTracker()
+        # coalesces and serializes the commands of the vehicle
+        self.command_queue = NissanCarwingsCommandQueue(command_window)
+
+        # requests currently in flight, concurrent callers attach to these (single-flight)
+        self._in_flight: dict[str, asyncio.Task] = {}
+
+        # cached Leaf handle (and the monotonic timestamp of the login it belongs to)
+        self._leaf: Leaf | None = None
+        self._leaf_timestamp: float = 0.0
+        # error of the latest failed login, recorded by the circuit breaker once for all the waiting callers
+        self._login_error: Exception | None = None
+        # custom_sessionid of the latest login (the one handed to the auth state listener)
+        self._sessionid: str | None = None
 
         if base_url:
             # use the custom base_url the user has provided via
@@ -91,6 +281,8 @@ class NissanCarwingsApiClient:
         This method tests the credentials by attempting to connect and login
         If there is an error, it raises a NissanCarwingsApiClientError
         """
+        from pycarwings3 import CarwingsError
+
         try:
             response = await self._carwings3.connect()
             LOGGER.info(
@@ -115,66 +307,267 @@ class NissanCarwingsApiClient:
         else:
             return {"vin": response.vin, "nickname": response.nickname}
 
-    async def async_update_data(self):
-        """Update data from the API."""
+    async def _async_get_leaf(self) -> Leaf:
+        """
+        Return the cached Leaf handle.
 
-        # prevent concurrent updates
-        if self.update_semaphore.locked():
-            LOGGER.warning("async_update_data(): previous update is currently in progress, waiting for it to finish.")
-            return_after_release = True
-        else:
-            return_after_release = False
-
-        async with self.update_semaphore:
-            if return_after_release:
-                return
-            self.is_update_in_progress = True
-
-            try:
-                response = await self._carwings3.get_leaf()
-                LOGGER.debug("carwings3.get_leaf() OK: vin=%s", response.vin)
-                result_key = await response.request_update()
-                LOGGER.debug("carwings3.request_update() OK: resultKey=%s", result_key)
-                for attempt in range(PYCARWINGS_MAX_RESPONSE_ATTEMPTS):
-                    status = await response.get_status_from_update(result_key)
-                    LOGGER.debug(
-                        "Waiting %s seconds for battery update (%s) (%s)",
-                        PYCARWINGS_SLEEP,
-                        response.vin,
-                        attempt,
-                    )
-                    await asyncio.sleep(PYCARWINGS_SLEEP)
-
-                    if status is not None:
-                        LOGGER.debug(
-                            "carwings3.get_status_from_update() OK: timestamp=%s",
-                            status.timestamp,
-                        )
-                        break
-                else:
-                    LOGGER.warn(
-                        f"carwings3.request_update() => Timeout after {PYCARWINGS_MAX_RESPONSE_ATTEMPTS} attempts x {PYCARWINGS_SLEEP}s; vin={response.vin}"
-                    )
-                    raise NissanCarwingsApiUpdateTimeoutError
-            except NissanCarwingsApiUpdateTimeoutError:
+        A fresh login is performed when there is no cached handle yet or when the cached one
+        is older than LEAF_CACHE_TTL, so that the session is renewed before the server expires it.
+        """
+        if self._leaf is None or time.monotonic() - self._leaf_timestamp > LEAF_CACHE_TTL:
+            # concurrent calls (e.g. a unified refresh) share a single login
+            return await self._single_flight(f"login:{self._username}", self._async_login)
+        return self._leaf
+
+    async def _async_login(self) -> Leaf:
+        """Log in and cache the Leaf handle."""
+        # force pycarwings3 to log in again instead of handing out its own cached leaf
+        self._carwings3.logged_in = False
+        try:
+            self._leaf = await self._async_measure(API_OPERATION_LOGIN, self._carwings3.get_leaf())
+        except Exception as exception:
+            # the login is shared by concurrent callers (single-flight), one failure is one server error
+            self._record_failure(exception)
+            self._login_error = exception
+            raise
+        self._leaf_timestamp = time.monotonic()
+        LOGGER.debug("carwings3.get_leaf() OK: vin=%s", self._leaf.vin)
+        self._persist_auth_state()
+        return self._leaf
+
+    def _persist_auth_state(self) -> None:
+        """Remember the current session and hand it to the auth state listener."""
+        self._sessionid = self._carwings3.custom_sessionid
+        if self._auth_state_listener is not None:
+            self._auth_state_listener(AuthState.from_session(self._carwings3, datetime.now(UTC)))
+
+    def restore_auth_state(self, auth_state: AuthState) -> bool:
+        """
+        Reuse the session of a previous run instead of logging in again, returns False if it is not usable.
+
+        The restored session is dropped like any other once the server rejects it, or once the login
+        it belongs to is older than LEAF_CACHE_TTL.
+        """
+        from pycarwings3 import Leaf
+
+        age = (datetime.now(UTC) - auth_state.logged_in_at).total_seconds()
+        if (
+            auth_state.username != self._username
+            or auth_state.region != self._region
+            or (self._vin is not None and auth_state.vin != self._vin)
+            or not 0 <= age <= LEAF_CACHE_TTL
+        ):
+            return False
+
+        carwings3 = self._carwings3
+        carwings3.custom_sessionid = auth_state.custom_sessionid
+        carwings3.gdc_user_id = auth_state.gdc_user_id
+        carwings3.dcm_id = auth_state.dcm_id
+        carwings3.tz = auth_state.tz
+        carwings3.language = auth_state.language
+        carwings3.leaf = Leaf(
+            carwings3,
+            {"vin": auth_state.vin, "nickname": auth_state.nickname, "bound_time": auth_state.bound_time},
+        )
+        carwings3.logged_in = True
+        self._leaf = carwings3.leaf
+        self._sessionid = auth_state.custom_sessionid
+        # keep the age of the login, so that the session is renewed on the usual schedule
+        self._leaf_timestamp = time.monotonic() - age
+        LOGGER.debug("Reusing the Carwings session of %s: vin=%s", auth_state.logged_in_at, auth_state.vin)
+        return True
+
+    def _invalidate_leaf(self) -> None:
+        """Drop the cached Leaf handle, the next call will log in again."""
+        self._leaf = None
+        self._carwings3.logged_in = False
+
+    async def _async_measure(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Await an API call and record its latency and outcome in the metrics."""
+        self.budget.record()
+        start = time.monotonic()
+        try:
+            result = await awaitable
+        except Exception as exception:
+            self.metrics.record(name, time.monotonic() - start, exception)
+            raise
+        self.metrics.record(name, time.monotonic() - start)
+        return result
+
+    async def _async_call(
+        self,
+        name: str,
+        operation: Callable[[Leaf], Awaitable[Any]],
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+    ) -> Any:
+        """
+        Run an operation against the cached Leaf handle.
+
+        Raises NissanCarwingsApiCircuitOpenError while the circuit breaker is open and
+        NissanCarwingsApiBudgetExceededError if the request budget does not allow the call.
+        If the server rejects the session, the cache is invalidated and the operation
+        is retried once after logging in again; NissanCarwingsApiClientAuthenticationError
+        is raised if it is still rejected (e.g. the login with the credentials).
+        """
+        if not self.breaker.acquire():
+            msg = f"Nissan servers failing, {name} not sent (retry in {self.breaker.retry_in:.0f}s)"
+            LOGGER.debug(msg)
+            raise NissanCarwingsApiCircuitOpenError(msg)
+        if not self.budget.acquire(priority):
+            self.breaker.release()
+            msg = f"Request budget used up, {name} ({priority.name.lower()} priority) not sent"
+            LOGGER.warning(msg)
+            raise NissanCarwingsApiBudgetExceededError(msg)
+
+        try:
+            result = await self._async_call_with_login(name, operation)
+        except Exception as exception:
+            if exception is self._login_error:
+                # already recorded by the login
+                self.breaker.release()
+            else:
+                self._record_failure(exception)
+            if _classify_error(exception) is ErrorClass.AUTH:
+                self._invalidate_leaf()
+                msg = f"Credentials rejected, {name} not sent - {exception}"
+                raise NissanCarwingsApiClientAuthenticationError(msg) from exception
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _record_failure(self, exception: Exception) -> None:
+        """Record a failed API call in the circuit breaker."""
+        # pycarwings3 errors often have no message, the cause (e.g. the connection error) tells more
+        reason = str(exception) or str(exception.__cause__ or "")
+        self.breaker.record_failure(_classify_error(exception), f"{exception.__class__.__name__}: {reason}")
+
+    async def _async_call_with_login(self, name: str, operation: Callable[[Leaf], Awaitable[Any]]) -> Any:
+        """Run an operation, logging in again once if the server rejects the session."""
+        from pycarwings3 import CarwingsError
+
+        leaf = await self._async_get_leaf()
+        try:
+            result = await self._async_measure(name, operation(leaf))
+        except CarwingsError as exception:
+            if not _is_session_error(exception):
                 raise
-            except Exception as exception:
-                raise NissanCarwingsApiClientError from exception
+            LOGGER.info("Carwings session rejected (%s), logging in again", exception)
+            self._invalidate_leaf()
+            leaf = await self._async_get_leaf()
+            result = await self._async_measure(name, operation(leaf))
+        # pycarwings3 logs in again on its own when a request fails with an HTTP error status
+        if self._carwings3.custom_sessionid and self._carwings3.custom_sessionid != self._sessionid:
+            LOGGER.debug("Carwings session renewed by pycarwings3")
+            self._leaf_timestamp = time.monotonic()
+            self._persist_auth_state()
+        return result
+
+    def _single_flight(self, key: str, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """
+        Return a future for the request identified by key.
 
-            finally:
-                self.is_update_in_progress = False
+        If the same request is already in flight, the caller is attached to it instead of
+        starting a new one, so all callers get the same result (or exception).
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(factory(), name=f"nissan_carwings {key}")
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._on_single_flight_done(key, done))
+        else:
+            LOGGER.debug("%s is already in progress, waiting for its result", key)
+        # shield the shared task, a cancelled caller must not cancel the request for the others
+        return asyncio.shield(task)
+
+    def _on_single_flight_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished request."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # mark the exception as retrieved, the callers may all have been cancelled meanwhile
+            task.exception()
+
+    def close(self) -> None:
+        """Cancel the requests in flight (logins, update requests and their polling) and the queued commands."""
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        self.command_queue.cancel()
+
+    @property
+    def _update_key(self) -> str:
+        """Single-flight key for update requests of the current vehicle."""
+        return f"request_update:{self._vin or self._username}"
+
+    @property
+    def is_update_in_progress(self) -> bool:
+        """Return True if an update request is currently in flight."""
+        return self._update_key in self._in_flight
+
+    def async_request_update(self, priority: RequestPriority = RequestPriority.BACKGROUND) -> asyncio.Future:
+        """
+        Request the car to send a fresh battery status.
 
-    async def async_get_data(self) -> CarwingsLatestBatteryStatusResponse | None:
+        Concurrent calls for the same vehicle are coalesced into a single request_update
+        and all callers get the outcome of that request.
+        """
+        return self._single_flight(self._update_key, lambda: self._async_request_update(priority))
+
+    async def async_update_data(self, priority: RequestPriority = RequestPriority.BACKGROUND) -> None:
+        """Update data from the API."""
+        await self.async_request_update(priority)
+
+    async def _async_request_update(self, priority: RequestPriority) -> None:
+        """Perform the request_update call and wait for the car to respond."""
+        from pycarwings3 import CarwingsError
+
+        try:
+            result_key = await self._async_call(
+                API_OPERATION_REQUEST_UPDATE, lambda leaf: leaf.request_update(), priority
+            )
+            LOGGER.debug("carwings3.request_update() OK: resultKey=%s", result_key)
+            status = await async_poll_for_result(
+                lambda: self._async_call(
+                    API_OPERATION_UPDATE_RESULT, lambda leaf: leaf.get_status_from_update(result_key), priority
+                ),
+                self._result_polling,
+                "carwings3.get_status_from_update()",
+            )
+            LOGGER.debug(
+                "carwings3.get_status_from_update() OK: timestamp=%s",
+                status.timestamp,
+            )
+        except (
+            NissanCarwingsApiUpdateTimeoutError,
+            NissanCarwingsApiBudgetExceededError,
+            NissanCarwingsApiCircuitOpenError,
+            NissanCarwingsApiClientAuthenticationError,
+        ):
+            raise
+        except CarwingsError as exception:
+            if _is_session_error(exception):
+                self._invalidate_leaf()
+            raise NissanCarwingsApiClientError from exception
+        except Exception as exception:
+            raise NissanCarwingsApiClientError from exception
+
+    async def async_get_data(self) -> BatteryState | None:
         """Get data from the API."""
         try:
-            response = await self._carwings3.get_leaf()
-            LOGGER.debug("carwings3.get_leaf() OK: vin=%s", response.vin)
-            battery_status: CarwingsLatestBatteryStatusResponse | None = await response.get_latest_battery_status()
+            battery_status: CarwingsLatestBatteryStatusResponse | None = await self._async_call(
+                API_OPERATION_BATTERY_STATUS, lambda leaf: leaf.get_latest_battery_status()
+            )
             if battery_status:
                 LOGGER.debug(
                     f"carwings3.get_latest_battery_status() OK: SOC={battery_status.battery_percent:.0f}%, timestamp={battery_status.timestamp}"  # noqa: E501
                 )
 
+        except (NissanCarwingsApiCircuitOpenError, NissanCarwingsApiClientAuthenticationError):
+            # fail fast without logging an error for each call, the breaker logs the outage
+            # (and the rejected credentials start the reauthentication)
+            raise
         except Exception as exception:
             msg = f"Error fetching battery status - {exception.__class__.__name__}: {exception}"
             LOGGER.error(msg)
@@ -182,21 +575,25 @@ class NissanCarwingsApiClient:
                 msg,
             ) from exception
         else:
-            return battery_status
+            return BatteryState.from_response(battery_status) if battery_status else None
 
     async def async_get_climate_data(
         self,
-    ) -> CarwingsLatestClimateControlStatusResponse | None:
+    ) -> ClimateState | None:
         """Get data from the API."""
         try:
-            response = await self._carwings3.get_leaf()
-            LOGGER.debug("carwings3.get_leaf() OK: vin=%s", response.vin)
-            climate_status: CarwingsLatestClimateControlStatusResponse | None = await response.get_latest_hvac_status()
+            climate_status: CarwingsLatestClimateControlStatusResponse | None = await self._async_call(
+                API_OPERATION_HVAC_STATUS, lambda leaf: leaf.get_latest_hvac_status()
+            )
             if climate_status:
                 LOGGER.debug(
                     f"carwings3.get_latest_hvac_status() OK: running={climate_status.is_hvac_running}, remaining_time={climate_status.ac_duration}, start/stop timestamp: {climate_status.ac_start_stop_date_and_time}"  # noqa: E501
                 )
 
+        except (NissanCarwingsApiCircuitOpenError, NissanCarwingsApiClientAuthenticationError):
+            # fail fast without logging an error for each call, the breaker logs the outage
+            # (and the rejected credentials start the reauthentication)
+            raise
         except Exception as exception:
             msg = f"Error fetching climate data - {exception.__class__.__name__}: {exception}"
             LOGGER.error(msg)
@@ -204,33 +601,87 @@ class NissanCarwingsApiClient:
                 msg,
             ) from exception
         else:
-            return climate_status
+            return ClimateState.from_response(climate_status) if climate_status else None
 
-    async def async_set_climate(self, *, switch_on: bool = True) -> Any:
-        """Set climate control."""
+    async def async_set_climate(self, *, switch_on: bool = True) -> str | None:
+        """Set climate control, returns the result key of the command (None if it could not be sent)."""
+        from pycarwings3 import CarwingsError
 
         try:
-            response = await self._carwings3.get_leaf()
-            LOGGER.debug("carwings3.get_leaf() OK: vin=%s", response.vin)
-
-            result_key = await response.start_climate_control() if switch_on else await response.stop_climate_control()
+            if switch_on:
+                result_key = await self._async_call(
+                    API_OPERATION_START_CLIMATE, lambda leaf: leaf.start_climate_control(), RequestPriority.USER
+                )
+            else:
+                result_key = await self._async_call(
+                    API_OPERATION_STOP_CLIMATE, lambda leaf: leaf.stop_climate_control(), RequestPriority.USER
+                )
             LOGGER.debug(f"carwings3.{'start' if switch_on else 'stop'}_climate_control() OK: resultKey={result_key}")
         except CarwingsError as exception:
             LOGGER.error("Error setting climate control - %s", exception)
+            return None
+        else:
+            self.commands.issue(API_OPERATION_START_CLIMATE if switch_on else API_OPERATION_STOP_CLIMATE, result_key)
+            return result_key
+
+    async def async_get_climate_result(self, result_key: str, *, switch_on: bool) -> ClimateCommandResult:
+        """
+        Wait for the answer of the car to a climate control command.
+
+        Raises NissanCarwingsApiUpdateTimeoutError if the car does not answer in time.
+        """
+        description = f"carwings3.get_{'start' if switch_on else 'stop'}_climate_control_result()"
+        command = self.commands.find(result_key)
+        try:
+            response = await async_poll_for_result(
+                lambda: self._async_call(
+                    API_OPERATION_CLIMATE_RESULT,
+                    lambda leaf: leaf.get_start_climate_control_result(result_key)
+                    if switch_on
+                    else leaf.get_stop_climate_control_result(result_key),
+                    RequestPriority.USER,
+                ),
+                self._climate_result_polling,
+                description,
+            )
+        except Exception as exception:
+            if command is not None:
+                self.commands.fail(command, str(exception) or exception.__class__.__name__)
+            if isinstance(
+                exception,
+                NissanCarwingsApiUpdateTimeoutError
+                | NissanCarwingsApiBudgetExceededError
+                | NissanCarwingsApiCircuitOpenError
+                | NissanCarwingsApiClientAuthenticationError,
+            ):
+                raise
+            raise NissanCarwingsApiClientError from exception
+
+        LOGGER.debug("%s OK: hvac_status=%s", description, response.hvac_status)
+        if command is not None:
+            if bool(response.is_hvac_running) == switch_on:
+                self.commands.confirm(command)
+            else:
+                self.commands.fail(command, f"hvac_status={response.hvac_status}")
+        return ClimateCommandResult.from_response(response, datetime.now(UTC))
 
     async def async_get_driving_analysis_data(
         self,
-    ) -> CarwingsDrivingAnalysisResponse | None:
+    ) -> DrivingAnalysis | None:
         """Get data from the API."""
         try:
-            response = await self._carwings3.get_leaf()
-            LOGGER.debug("carwings3.get_leaf() OK: vin=%s", response.vin)
-            driving_analysis: CarwingsDrivingAnalysisResponse | None = await response.get_driving_analysis()
+            driving_analysis: CarwingsDrivingAnalysisResponse | None = await self._async_call(
+                API_OPERATION_DRIVING_ANALYSIS, lambda leaf: leaf.get_driving_analysis()
+            )
             if driving_analysis:
                 LOGGER.debug(
                     f"carwings3.get_drive_analysis() OK; target_date={driving_analysis.target_date}, mileage={driving_analysis.electric_mileage}"
                 )
 
+        except (NissanCarwingsApiCircuitOpenError, NissanCarwingsApiClientAuthenticationError):
+            # fail fast without logging an error for each call, the breaker logs the outage
+            # (and the rejected credentials start the reauthentication)
+            raise
         except Exception as exception:
             msg = f"Error fetching driving analysis data - {exception.__class__.__name__}: {exception}"
             LOGGER.error(msg)
@@ -238,11 +689,37 @@ class NissanCarwingsApiClient:
                 msg,
             ) from exception
         else:
-            return driving_analysis
+            return DrivingAnalysis.from_response(driving_analysis) if driving_analysis else None
+
+    async def async_get_driving_history(self, target_month: str) -> list[DrivingAnalysis]:
+        """Get the driving analysis of each day with trips of a month (YYYYMM) from the electric rate simulation."""
+        try:
+            simulation: CarwingsElectricRateSimulationResponse | None = await self._async_call(
+                API_OPERATION_ELECTRIC_RATE_SIMULATION, lambda leaf: leaf.get_electric_rate_simulation(target_month)
+            )
+            if simulation:
+                LOGGER.debug(
+                    f"carwings3.get_electric_rate_simulation() OK; month={simulation.month}, trips={simulation.total_number_of_trips}"
+                )
+
+        except (NissanCarwingsApiCircuitOpenError, NissanCarwingsApiClientAuthenticationError):
+            # fail fast without logging an error for each call, the breaker logs the outage
+            # (and the rejected credentials start the reauthentication)
+            raise
+        except Exception as exception:
+            msg = f"Error fetching driving history of {target_month} - {exception.__class__.__name__}: {exception}"
+            LOGGER.error(msg)
+            raise NissanCarwingsApiClientError(
+                msg,
+            ) from exception
+        else:
+            return driving_analyses_from_simulation(simulation) if simulation else []
 
-    async def async_start_charging(self) -> bool:
-        """Start charging."""
-        response = await self._carwings3.get_leaf()
-        result = await response.start_charging()
+    async def async_start_charging(self) -> TrackedCommand | None:
+        """Start charging, returns the tracked command (None if the Nissan servers did not accept it)."""
+        result = await self._async_call(
+            API_OPERATION_START_CHARGING, lambda leaf: leaf.start_charging(), RequestPriority.USER
+        )
         LOGGER.debug("carwings3.start_charging(): result=%s", result)
-        return result
+        # the result only tells whether the servers have received the command, not that the car is charging
+        return self.commands.issue(API_OPERATION_START_CHARGING) if result else None
@@ -10,8 +10,6 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 
-from custom_components.nissan_carwings.const import DATA_BATTERY_STATUS_KEY
-
 from .entity import NissanCarwingsEntity
 
 if TYPE_CHECKING:
@@ -40,6 +38,7 @@ class LeafPluggedInSensor(NissanCarwingsEntity, BinarySensorEntity):
     """Plugged In Sensor class."""
 
     _attr_translation_key = "plug_status"
+    coordinator: CarwingsDataUpdateCoordinator
 
     def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
         """Initialize the sensor class."""
@@ -54,17 +53,14 @@ class LeafPluggedInSensor(NissanCarwingsEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if plugged in."""
-
-        if self.coordinator.data[DATA_BATTERY_STATUS_KEY] is None:
-            return None
-
-        return bool(self.coordinator.data[DATA_BATTERY_STATUS_KEY].is_connected)
+        return self.coordinator.values.is_connected
 
 
 class LeafChargingSensor(NissanCarwingsEntity, BinarySensorEntity):
     """Charging Sensor class."""
 
     _attr_translation_key = "charging_status"
+    coordinator: CarwingsDataUpdateCoordinator
 
     def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
         """Initialize the sensor class."""
@@ -79,8 +75,4 @@ class LeafChargingSensor(NissanCarwingsEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool | None:
         """Return true if charging."""
-
-        if self.coordinator.data[DATA_BATTERY_STATUS_KEY] is None:
-            return None
-
-        return bool(self.coordinator.data[DATA_BATTERY_STATUS_KEY].is_charging)
+        return self.coordinator.values.is_charging
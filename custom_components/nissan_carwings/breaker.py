@@ -0,0 +1,138 @@
+"""Circuit breaker of the Carwings API client."""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_OPEN_DURATION,
+    BREAKER_OPEN_DURATION,
+    LOGGER,
+)
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    # requests are sent
+    CLOSED = "closed"
+    # requests fail fast until the open duration has elapsed
+    OPEN = "open"
+    # a single probe request is sent, the others fail fast until its outcome is known
+    HALF_OPEN = "half_open"
+
+
+class ErrorClass(StrEnum):
+    """Class of an API error, as seen by the circuit breaker."""
+
+    # the servers are unreachable, overloaded or in maintenance, counts towards opening the circuit
+    TRANSIENT = "transient"
+    # the credentials are rejected, opens the circuit right away (retrying will not help)
+    AUTH = "auth"
+    # the servers have answered with an error, they are up so the circuit is not affected
+    PERMANENT = "permanent"
+
+
+class NissanCarwingsCircuitBreaker:
+    """
+    Circuit breaker of the API requests of an account, shared by all coordinators and services.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive transient errors (or an auth error) the circuit opens
+    and requests fail fast. Once the open duration has elapsed, a single probe request is let through:
+    if it succeeds the circuit closes, otherwise it opens again for twice the duration (up to
+    BREAKER_MAX_OPEN_DURATION).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        open_duration: float = BREAKER_OPEN_DURATION,
+        max_open_duration: float = BREAKER_MAX_OPEN_DURATION,
+    ) -> None:
+        """Initialize."""
+        self.failure_threshold = failure_threshold
+        self.open_duration = open_duration
+        self.max_open_duration = max_open_duration
+        self.state = BreakerState.CLOSED
+        # consecutive transient errors while closed
+        self.failures = 0
+        # duration of the current (or next) open state, in seconds
+        self._current_open_duration = open_duration
+        # monotonic time the circuit has been opened
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        # number of requests refused while the circuit was open
+        self.rejected = 0
+        self.last_error: str | None = None
+
+    @property
+    def retry_in(self) -> float:
+        """Return the time (in seconds) until the next probe may be sent, 0 if requests are let through."""
+        if self.state is not BreakerState.OPEN:
+            return 0.0
+        return max(self._opened_at + self._current_open_duration - time.monotonic(), 0.0)
+
+    def acquire(self) -> bool:
+        """Check if a request may be sent, counting the refusal if not."""
+        if self.state is BreakerState.OPEN and self.retry_in <= 0:
+            LOGGER.debug("Circuit half-open, sending a probe request")
+            self.state = BreakerState.HALF_OPEN
+        if self.state is BreakerState.CLOSED or (self.state is BreakerState.HALF_OPEN and not self._probe_in_flight):
+            self._probe_in_flight = self.state is BreakerState.HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """Release a request without an outcome (e.g. cancelled), a probe may be sent again."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a request answered by the servers."""
+        self._probe_in_flight = False
+        if self.state is not BreakerState.CLOSED:
+            LOGGER.info("Nissan servers reachable again, circuit closed")
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self._current_open_duration = self.open_duration
+
+    def record_failure(self, error_class: ErrorClass, error: str) -> None:
+        """Record a failed request."""
+        if error_class is ErrorClass.PERMANENT:
+            # the servers have answered, which is all the breaker cares about
+            self.record_success()
+            return
+
+        self._probe_in_flight = False
+        self.last_error = error
+        if self.state is BreakerState.HALF_OPEN:
+            # the probe has failed, back off further
+            self._open(min(self._current_open_duration * 2, self.max_open_duration), error)
+            return
+
+        self.failures += 1
+        if self.state is BreakerState.CLOSED and (
+            error_class is ErrorClass.AUTH or self.failures >= self.failure_threshold
+        ):
+            self._open(self.open_duration, error)
+
+    def _open(self, duration: float, error: str) -> None:
+        """Open the circuit for the given duration."""
+        self.state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._current_open_duration = duration
+        LOGGER.warning("Nissan servers failing (%s), pausing all requests for %.0f s", error, duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the breaker as a dict."""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in),
+            "open_duration": self._current_open_duration,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,123 @@
+"""Request budget of the Carwings API client."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    BUDGET_LOW_THRESHOLD,
+    BUDGET_MAX_STRETCH,
+    BUDGET_USER_RESERVE,
+    DEFAULT_BUDGET_PER_DAY,
+    DEFAULT_BUDGET_PER_HOUR,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_HOUR = 3600
+_DAY = 86400
+
+
+class RequestPriority(IntEnum):
+    """Priority of an API request."""
+
+    # periodic refreshes and polls
+    BACKGROUND = 0
+    # commands and update requests initiated by the user (buttons, switches, services)
+    USER = 1
+
+
+class NissanCarwingsRequestBudget:
+    """
+    Per-hour and per-day budget of the API requests, shared by all coordinators and services.
+
+    Background requests may only use the budget up to the share reserved for user initiated
+    requests (BUDGET_USER_RESERVE); when the remaining background budget runs low, the
+    coordinators stretch their intervals by stretch_factor. A budget of 0 means unlimited.
+    """
+
+    def __init__(self, per_day: int = DEFAULT_BUDGET_PER_DAY, per_hour: int = DEFAULT_BUDGET_PER_HOUR) -> None:
+        """Initialize."""
+        self.per_day = per_day
+        self.per_hour = per_hour
+        # monotonic timestamps of the requests made in the last 24 hours
+        self._requests: deque[float] = deque()
+        # number of requests refused because of the budget, by priority
+        self.denied: dict[str, int] = {priority.name.lower(): 0 for priority in RequestPriority}
+        self._listeners: list[Callable[[], None]] = []
+
+    def _prune(self, now: float) -> None:
+        """Forget the requests older than a day."""
+        while self._requests and now - self._requests[0] > _DAY:
+            self._requests.popleft()
+
+    def used(self, window: int) -> int:
+        """Return the number of requests made within the window (in seconds)."""
+        now = time.monotonic()
+        self._prune(now)
+        if window >= _DAY:
+            return len(self._requests)
+        return sum(1 for timestamp in reversed(self._requests) if now - timestamp <= window)
+
+    def _remaining_fractions(self, priority: RequestPriority) -> list[float]:
+        """Return the remaining fraction of each (limited) budget available to the priority."""
+        share = 1.0 if priority is RequestPriority.USER else 1.0 - BUDGET_USER_RESERVE
+        return [
+            max(limit * share - self.used(window), 0) / (limit * share)
+            for limit, window in ((self.per_hour, _HOUR), (self.per_day, _DAY))
+            if limit > 0
+        ]
+
+    def is_available(self, priority: RequestPriority) -> bool:
+        """Return True if a request of the given priority fits into the budget."""
+        return all(fraction > 0 for fraction in self._remaining_fractions(priority))
+
+    def acquire(self, priority: RequestPriority) -> bool:
+        """Check if a request of the given priority may be made, counting the refusal if not."""
+        if self.is_available(priority):
+            return True
+        self.denied[priority.name.lower()] += 1
+        self._notify()
+        return False
+
+    def record(self) -> None:
+        """Record a request made to the API."""
+        now = time.monotonic()
+        self._prune(now)
+        self._requests.append(now)
+        self._notify()
+
+    @property
+    def stretch_factor(self) -> float:
+        """Return the factor to stretch the background intervals by (1.0 while the budget is not running low)."""
+        remaining = min(self._remaining_fractions(RequestPriority.BACKGROUND), default=1.0)
+        if remaining >= BUDGET_LOW_THRESHOLD:
+            return 1.0
+        if remaining <= 0:
+            return BUDGET_MAX_STRETCH
+        return min(BUDGET_LOW_THRESHOLD / remaining, BUDGET_MAX_STRETCH)
+
+    def _notify(self) -> None:
+        """Notify the listeners about a change."""
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a listener called after each change of the budget usage, returns a function to remove it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budget usage as a dict."""
+        return {
+            "budget_per_day": self.per_day,
+            "budget_per_hour": self.per_hour,
+            "used_last_day": self.used(_DAY),
+            "used_last_hour": self.used(_HOUR),
+            "denied": dict(self.denied),
+            "stretch_factor": round(self.stretch_factor, 2),
+        }
@@ -9,6 +9,7 @@ from homeassistant.exceptions import HomeAssistantError
 
 from custom_components.nissan_carwings.const import LOGGER
 
+from .budget import RequestPriority
 from .entity import NissanCarwingsEntity
 
 if TYPE_CHECKING:
@@ -50,18 +51,18 @@ class UpdateButton(NissanCarwingsEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         client = self.coordinator.config_entry.runtime_data.client
-        if not client.is_update_in_progress:
-            client.is_update_in_progress = True
-            self.async_write_ha_state()
-            try:
-                await client.async_update_data()
-            except Exception as exception:
-                LOGGER.error("Error performing update via update button: %s", exception)
-            await self.coordinator.async_request_refresh()
-        else:
-            LOGGER.warning(
-                "Update was triggered via async_press() but there is already an update in progress."  # noqa: E501
-            )
+        if client.is_update_in_progress:
+            LOGGER.debug("Update was triggered via async_press(), joining the update already in progress.")
+        update = client.async_request_update(RequestPriority.USER)
+        # the button is unavailable while the update is in progress
+        self.async_write_ha_state()
+        try:
+            await update
+        except Exception as exception:
+            LOGGER.error("Error performing update via update button: %s", exception)
+        # available again, the coordinator does not notify its listeners if the data has not changed
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
 
     @property
     def available(self) -> bool:
@@ -83,9 +84,8 @@ class StartChargingButton(NissanCarwingsEntity, ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        client = self.coordinator.config_entry.runtime_data.client
         try:
-            result = await client.async_start_charging()
+            result = await self.coordinator.async_start_charging()
             if not result:
                 raise HomeAssistantError("Failed to start charging")
         except Exception as exception:
@@ -0,0 +1,87 @@
+"""Coalescing queue of the commands sent to the car by nissan_carwings."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import DEFAULT_COMMAND_WINDOW, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass
+class _QueuedCommand:
+    """A command waiting to be sent, shared by all callers it has superseded."""
+
+    execute: Callable[[], Awaitable[Any]]
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    # number of commands superseded by this one
+    superseded: int = 0
+
+
+class NissanCarwingsCommandQueue:
+    """
+    Per-vehicle queue of the commands sent to the car.
+
+    A command is held back for the coalescing window; a command of the same group (e.g. climate)
+    submitted meanwhile supersedes it (the last intent wins). The remaining commands are sent one
+    at a time, and every caller of a coalesced command gets the outcome of the command actually sent.
+    """
+
+    def __init__(self, window: float = DEFAULT_COMMAND_WINDOW) -> None:
+        """Initialize."""
+        self.window = window
+        # commands not yet sent, by group
+        self._queued: dict[str, _QueuedCommand] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def async_submit(self, group: str, execute: Callable[[], Awaitable[Any]]) -> Any:
+        """Queue a command and return the outcome of the (effective) command sent for the group."""
+        queued = self._queued.get(group)
+        if queued is not None:
+            LOGGER.debug("%s command superseded by a newer one", group)
+            queued.execute = execute
+            queued.superseded += 1
+        else:
+            queued = _QueuedCommand(execute=execute)
+            self._queued[group] = queued
+            task = asyncio.get_running_loop().create_task(
+                self._async_run(group, queued), name=f"nissan_carwings {group} command"
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        # shield the shared command, a cancelled caller must not cancel it for the others
+        return await asyncio.shield(queued.future)
+
+    async def _async_run(self, group: str, queued: _QueuedCommand) -> None:
+        """Send a command after the coalescing window, once the previous commands have been sent."""
+        try:
+            await asyncio.sleep(self.window)
+            async with self._lock:
+                # from now on, newer commands of the group are queued separately
+                del self._queued[group]
+                if queued.superseded:
+                    LOGGER.debug("Sending the %s command, %d superseded command(s) dropped", group, queued.superseded)
+                result = await queued.execute()
+        except asyncio.CancelledError:
+            queued.future.cancel()
+            raise
+        except Exception as exception:  # noqa: BLE001
+            queued.future.set_exception(exception)
+            # mark the exception as retrieved, the callers may all have been cancelled meanwhile
+            queued.future.exception()
+        else:
+            queued.future.set_result(result)
+
+    def cancel(self) -> None:
+        """Cancel the commands not yet sent (on unload)."""
+        for task in self._tasks:
+            task.cancel()
+        # a task cancelled before it started never cancels its command, its callers would wait forever
+        for queued in self._queued.values():
+            queued.future.cancel()
+        self._queued.clear()
@@ -0,0 +1,83 @@
+"""Tracking of the commands sent to the car by nissan_carwings."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+from .const import COMMAND_HISTORY_SIZE, LOGGER
+
+
+class CommandState(StrEnum):
+    """State of a command sent to the car."""
+
+    # accepted by the Nissan servers, not yet confirmed by the car
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    # rejected, not answered in time or answered with a different state
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class TrackedCommand:
+    """A command sent to the car."""
+
+    # name of the command (the API operation, e.g. start_charging)
+    name: str
+    issued_at: datetime
+    # result key of the command, if the API returns one
+    result_key: str | None = None
+    state: CommandState = CommandState.PENDING
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the command as a dict."""
+        return {
+            "name": self.name,
+            "issued_at": self.issued_at.isoformat(),
+            "state": self.state.value,
+            "finished_at": self.finished_at.isoformat() if self.finished_at is not None else None,
+            "latency": round((self.finished_at - self.issued_at).total_seconds(), 1)
+            if self.finished_at is not None
+            else None,
+            "error": self.error,
+        }
+
+
+class NissanCarwingsCommandTracker:
+    """Keep the latest commands sent to the car (up to COMMAND_HISTORY_SIZE) and their outcome."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.commands: deque[TrackedCommand] = deque(maxlen=COMMAND_HISTORY_SIZE)
+
+    def issue(self, name: str, result_key: str | None = None) -> TrackedCommand:
+        """Record a command accepted by the Nissan servers."""
+        command = TrackedCommand(name=name, issued_at=datetime.now(UTC), result_key=result_key)
+        self.commands.append(command)
+        return command
+
+    def find(self, result_key: str) -> TrackedCommand | None:
+        """Return the command with the given result key."""
+        return next((command for command in self.commands if command.result_key == result_key), None)
+
+    def confirm(self, command: TrackedCommand) -> None:
+        """Mark a command as confirmed by the car."""
+        command.state = CommandState.CONFIRMED
+        command.finished_at = datetime.now(UTC)
+        LOGGER.debug("%s confirmed after %s", command.name, command.finished_at - command.issued_at)
+
+    def fail(self, command: TrackedCommand, error: str) -> None:
+        """Mark a command as failed."""
+        command.state = CommandState.FAILED
+        command.finished_at = datetime.now(UTC)
+        command.error = error
+        LOGGER.debug("%s failed: %s", command.name, error)
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        """Return the tracked commands, the most recent first."""
+        return [command.as_dict() for command in reversed(self.commands)]
@@ -16,6 +16,7 @@ from .api import (
     NissanCarwingsApiClientAuthenticationError,
     NissanCarwingsApiClientCommunicationError,
     NissanCarwingsApiClientError,
+    async_import_pycarwings3,
 )
 from .const import CONF_PYCARWINGS3_BASE_URL, DOMAIN, LOGGER
 
@@ -98,6 +99,7 @@ class CarwingsFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         self, username: str, password: str, region: str, base_url: str | None
     ) -> dict[str, str]:
         """Validate credentials."""
+        await async_import_pycarwings3(self.hass)
         client = NissanCarwingsApiClient(
             username=username,
             password=password,
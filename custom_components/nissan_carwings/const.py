@@ -6,10 +6,37 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "nissan_carwings"
 
-PYCARWINGS_SLEEP = 25
-PYCARWINGS_MAX_RESPONSE_ATTEMPTS = 10
+# polling for the result of asynchronous operations (request_update etc.): a short first probe,
+# then geometric backoff with jitter until RESULT_POLLING_TIMEOUT (all values in seconds)
+RESULT_POLLING_FIRST_DELAY = 5
+RESULT_POLLING_INTERVAL = 5
+RESULT_POLLING_BACKOFF = 1.5
+RESULT_POLLING_MAX_INTERVAL = 30
+RESULT_POLLING_JITTER = 0.1
+RESULT_POLLING_TIMEOUT = 250
+# the car answers climate control commands within seconds to a few minutes, so their result is polled faster
+CLIMATE_RESULT_POLLING_FIRST_DELAY = 3
+CLIMATE_RESULT_POLLING_INTERVAL = 3
+CLIMATE_RESULT_POLLING_MAX_INTERVAL = 15
+CLIMATE_RESULT_POLLING_TIMEOUT = 180
+# start_charging has no result key: the latest battery status (which does not wake up the car) is polled
+# until it reports charging, then a single update is requested from the car
+CHARGING_CONFIRMATION_POLLING_FIRST_DELAY = 15
+CHARGING_CONFIRMATION_POLLING_INTERVAL = 15
+CHARGING_CONFIRMATION_POLLING_MAX_INTERVAL = 60
+CHARGING_CONFIRMATION_POLLING_TIMEOUT = 600
+# number of commands sent to the car kept with their outcome (see commands.py)
+COMMAND_HISTORY_SIZE = 20
+# commands are held back for this window (in seconds), a newer command of the same kind supersedes them
+OPTIONS_COMMAND_WINDOW = "command_window"
+DEFAULT_COMMAND_WINDOW = 2
+COMMAND_GROUP_CLIMATE = "climate"
+COMMAND_GROUP_CHARGING = "charging"
 PYCARWINGS3_BASE_URL = None  # use default BASE_URL
 
+# maximum age of the cached Leaf handle (login session) before we log in again, in seconds
+LEAF_CACHE_TTL = 3600
+
 CONF_PYCARWINGS3_BASE_URL = "pycarwings3_base_url"
 
 OPTIONS_UPDATE_INTERVAL = "update_interval"
@@ -20,16 +47,117 @@ DEFAULT_UPDATE_INTERVAL = 300
 UPDATE_INTERVAL_WHILE_AWAITING_UPDATE = 60
 DEFAULT_POLL_INTERVAL = 7200
 DEFAULT_POLL_INTERVAL_CHARGING = 900
+# fetch battery, climate and driving analysis together in one refresh cycle (driven by the battery coordinator)
+OPTIONS_UNIFIED_REFRESH = "unified_refresh"
+DEFAULT_UNIFIED_REFRESH = False
+
+# budget of API requests (0 = unlimited), shared by all coordinators and services (see budget.py)
+OPTIONS_BUDGET_PER_DAY = "budget_per_day"
+OPTIONS_BUDGET_PER_HOUR = "budget_per_hour"
+DEFAULT_BUDGET_PER_DAY = 1500
+DEFAULT_BUDGET_PER_HOUR = 150
+# share of the budget reserved for user initiated requests (commands, update button/service)
+BUDGET_USER_RESERVE = 0.1
+# background intervals are stretched when less than this share of the background budget is left ...
+BUDGET_LOW_THRESHOLD = 0.25
+# ... up to this factor
+BUDGET_MAX_STRETCH = 8
+# ... and to at most one day (in seconds), the daily budget window has renewed by then
+BUDGET_MAX_STRETCHED_INTERVAL = 86400
+
+# deadline (in seconds) of the first refresh of each coordinator, run in the background on setup;
+# it covers a full update request (see RESULT_POLLING_TIMEOUT) followed by the fetch
+BOOTSTRAP_REFRESH_DEADLINE = 300
+
+# circuit breaker of the API client (see breaker.py): consecutive transient errors opening the circuit,
+# initial and maximum duration (in seconds) of the open state, doubled after each failed probe
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_OPEN_DURATION = 60
+BREAKER_MAX_OPEN_DURATION = 3600
+
+# stale-while-revalidate: after a failed refresh the last good data is served up to this age (in seconds,
+# 0 = entities become unavailable right away), while revalidating with a backoff of up to the max interval
+OPTIONS_MAX_STALENESS = "max_staleness"
+DEFAULT_MAX_STALENESS = 21600
+STALE_REVALIDATE_MAX_INTERVAL = 3600
 
 # we will use this poll interval when the last update has failed to avoid hammering the API with too many requests
 POLL_INTERVAL_WHEN_FAILED = 900
 
+# the diagnostic sensors updated by the API client (latency, request budget) write their state at most once
+# per this cooldown (in seconds), rather than on every request
+DIAGNOSTIC_STATE_WRITE_COOLDOWN = 60
+
+# SOC estimation while charging (see estimator.py): state update interval of the estimated sensors,
+# maximum extrapolation (the confidence drops to 0 at this age), smoothing factor of the learned charge rate
+# and the estimation error (in percent) at which the confidence drops to 0
+SOC_ESTIMATE_UPDATE_INTERVAL = 60
+SOC_ESTIMATE_MAX_AGE = 10800
+SOC_ESTIMATE_RATE_SMOOTHING = 0.5
+SOC_ESTIMATE_MAX_ERROR = 10
+
+# number of battery samples kept in memory (see history.py), imported hourly into the long-term statistics
+BATTERY_HISTORY_SIZE = 500
+# number of finished charging sessions kept (see sessions.py), and returned by the service by default
+CHARGING_SESSIONS_MAX = 100
+DEFAULT_CHARGING_SESSIONS_LIMIT = 10
+
+# profile service (see profiler.py): number of functions returned by default (ranked by their own time),
+# and interval (in seconds) of the probe measuring the event loop lag during the profiled refresh
+DEFAULT_PROFILE_TOP = 20
+PROFILE_LOOP_LAG_INTERVAL = 0.05
+
+# the daily driving analysis has no timestamp and changes a few times a day at most: it is only fetched on a
+# new day, after the car has been driven (SOC dropped) or when the latest fetch is older than the max age (seconds)
+DRIVING_ANALYSIS_MAX_AGE = 21600
+# number of days kept in the driving analysis history, and the months backfilled on the first setup
+DRIVING_HISTORY_DAYS = 400
+DRIVING_BACKFILL_MONTHS = 3
+
+# names of the instrumented API operations (see metrics.py)
+API_OPERATION_LOGIN = "login"
+API_OPERATION_BATTERY_STATUS = "battery_status"
+API_OPERATION_HVAC_STATUS = "hvac_status"
+API_OPERATION_DRIVING_ANALYSIS = "driving_analysis"
+API_OPERATION_ELECTRIC_RATE_SIMULATION = "electric_rate_simulation"
+API_OPERATION_REQUEST_UPDATE = "request_update"
+API_OPERATION_UPDATE_RESULT = "request_update_result"
+API_OPERATION_START_CLIMATE = "start_climate"
+API_OPERATION_STOP_CLIMATE = "stop_climate"
+API_OPERATION_CLIMATE_RESULT = "climate_result"
+API_OPERATION_START_CHARGING = "start_charging"
+# operations exposed as (diagnostic) latency sensors
+API_OPERATIONS_WITH_SENSOR = (
+    API_OPERATION_LOGIN,
+    API_OPERATION_BATTERY_STATUS,
+    API_OPERATION_HVAC_STATUS,
+    API_OPERATION_DRIVING_ANALYSIS,
+    API_OPERATION_REQUEST_UPDATE,
+    API_OPERATION_UPDATE_RESULT,
+)
+# number of calls per operation kept for the latency percentiles and histogram
+METRICS_WINDOW_SIZE = 100
+# upper bounds of the latency histogram buckets, in seconds
+METRICS_HISTOGRAM_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30)
+
+# persisted snapshots of the coordinator data, used to restore the entity states on startup
+SNAPSHOT_STORAGE_VERSION = 2
+SNAPSHOT_SAVE_DELAY = 10
+
 DATA_BATTERY_STATUS_KEY = "battery_status"
 DATA_CLIMATE_STATUS_KEY = "climate_status"
 DATA_DRIVING_ANALYSIS_KEY = "driving_analysis"
 DATA_TIMESTAMP_KEY = "timestamp"
+# time of the last successful refresh, only part of the persisted snapshots
+DATA_FETCHED_AT_KEY = "fetched_at"
+DATA_CHARGING_SESSIONS_KEY = "charging_sessions"
+DATA_DRIVING_HISTORY_KEY = "driving_history"
+# the Carwings login session, reused after a restart (see NissanCarwingsApiClient.restore_auth_state)
+DATA_AUTH_STATE_KEY = "auth_state"
 
 SERVICE_UPDATE = "update"
 SERVICE_START_CLIMATE = "start_climate"
 SERVICE_STOP_CLIMATE = "stop_climate"
 SERVICE_START_CHARGING = "start_charging"
+SERVICE_GET_CHARGING_SESSIONS = "get_charging_sessions"
+SERVICE_PROFILE = "profile"
@@ -2,123 +2,457 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
-from datetime import datetime
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 from zoneinfo import ZoneInfo
-from pytz import UTC
 
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pycarwings3.responses import CarwingsLatestClimateControlStatusResponse
+from homeassistant.util.unit_system import US_CUSTOMARY_SYSTEM
 
 from .api import (
+    NissanCarwingsApiBudgetExceededError,
     NissanCarwingsApiClientAuthenticationError,
     NissanCarwingsApiClientError,
     NissanCarwingsApiUpdateTimeoutError,
+    ResultPollingPolicy,
+    async_poll_for_result,
 )
+from .budget import RequestPriority
 from .const import (
+    BOOTSTRAP_REFRESH_DEADLINE,
+    BUDGET_MAX_STRETCHED_INTERVAL,
+    CHARGING_CONFIRMATION_POLLING_FIRST_DELAY,
+    CHARGING_CONFIRMATION_POLLING_INTERVAL,
+    CHARGING_CONFIRMATION_POLLING_MAX_INTERVAL,
+    CHARGING_CONFIRMATION_POLLING_TIMEOUT,
+    COMMAND_GROUP_CHARGING,
+    COMMAND_GROUP_CLIMATE,
     DATA_BATTERY_STATUS_KEY,
+    DATA_CHARGING_SESSIONS_KEY,
     DATA_CLIMATE_STATUS_KEY,
     DATA_DRIVING_ANALYSIS_KEY,
+    DATA_DRIVING_HISTORY_KEY,
+    DATA_FETCHED_AT_KEY,
     DATA_TIMESTAMP_KEY,
+    DEFAULT_MAX_STALENESS,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_POLL_INTERVAL_CHARGING,
+    DEFAULT_UNIFIED_REFRESH,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    DRIVING_ANALYSIS_MAX_AGE,
+    DRIVING_BACKFILL_MONTHS,
     LOGGER,
+    OPTIONS_MAX_STALENESS,
     OPTIONS_POLL_INTERVAL,
     OPTIONS_POLL_INTERVAL_CHARGING,
+    OPTIONS_UNIFIED_REFRESH,
     OPTIONS_UPDATE_INTERVAL,
     POLL_INTERVAL_WHEN_FAILED,
+    STALE_REVALIDATE_MAX_INTERVAL,
     UPDATE_INTERVAL_WHILE_AWAITING_UPDATE,
 )
+from .estimator import SocEstimator
+from .history import BatteryHistory, DrivingAnalysisHistory
+from .sessions import ChargingSessionTracker
+from .values import BatteryValues, ClimateValues, DrivingAnalysisValues
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
+    from .commands import TrackedCommand
     from .data import NissanCarwingsConfigEntry
+    from .models import BatteryState, ClimateState
 
 
-class CarwingsBaseDataUpdateCoordinator(DataUpdateCoordinator):
+# polling the latest battery status for the confirmation of a start_charging command
+CHARGING_CONFIRMATION_POLLING = ResultPollingPolicy(
+    first_delay=CHARGING_CONFIRMATION_POLLING_FIRST_DELAY,
+    interval=CHARGING_CONFIRMATION_POLLING_INTERVAL,
+    max_interval=CHARGING_CONFIRMATION_POLLING_MAX_INTERVAL,
+    timeout=CHARGING_CONFIRMATION_POLLING_TIMEOUT,
+)
+
+
+def _is_same_data(previous: dict[str, Any] | None, data: dict[str, Any]) -> bool:
+    """Compare coordinator data by the Nissan timestamp and the content of the (immutable) model objects."""
+    if previous is None or previous.get(DATA_TIMESTAMP_KEY) != data.get(DATA_TIMESTAMP_KEY):
+        return False
+    return previous == data
+
+
+class CarwingsBaseDataUpdateCoordinator(DataUpdateCoordinator, ABC):
     """Base class to manage fetching data from the API."""
 
     config_entry: NissanCarwingsConfigEntry
 
+    # the data key (and snapshot key) of the main value managed by this coordinator
+    data_key: str
+
+    # True if this coordinator is refreshed by the battery coordinator when the unified refresh is enabled
+    unified_refresh_member: bool = False
+
+    # entity values derived from the data, and the data (and unit system) they have been derived from
+    _values: Any = None
+    _values_source: tuple[Any, bool] | None = None
+
+    # time of the last successful refresh (UTC), None if unknown
+    data_fetched_at: datetime | None = None
+    # error of the latest refresh while serving stale data, None once a refresh has succeeded
+    last_error: str | None = None
+    # consecutive failed refreshes while serving stale data
+    _stale_failures: int = 0
+
     def __init__(
         self,
         hass: HomeAssistant,
         config_entry: NissanCarwingsConfigEntry,
-        always_update: bool = True,
+        always_update: bool = False,
     ) -> None:
         """Initialize."""
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(
-                seconds=config_entry.options.get(OPTIONS_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-            ),
+            update_interval=None,
             always_update=always_update,
         )
         self.config_entry = config_entry
+        self.update_interval = self.default_update_interval
 
         LOGGER.debug(
             f"{self.__class__} initialized with update interval %s",
             self.update_interval,
         )
 
+    @property
+    def values(self) -> Any:
+        """Return the entity values, derived once per data update."""
+        use_miles = self.hass.config.units is US_CUSTOMARY_SYSTEM
+        if (
+            self._values_source is None
+            or self._values_source[0] is not self.data
+            or self._values_source[1] != use_miles
+        ):
+            self._values = self._build_values(use_miles=use_miles)
+            self._values_source = (self.data, use_miles)
+        return self._values
+
+    @abstractmethod
+    def _build_values(self, *, use_miles: bool) -> Any:
+        """Derive the entity values from the data."""
+
+    @property
+    def is_unified_refresh(self) -> bool:
+        """Return True if battery, climate and driving analysis are fetched together in one refresh cycle."""
+        return self.config_entry.options.get(OPTIONS_UNIFIED_REFRESH, DEFAULT_UNIFIED_REFRESH)
+
+    @property
+    def default_update_interval(self) -> timedelta | None:
+        """Return the regular update interval (None when refreshed as part of the unified refresh)."""
+        if self.unified_refresh_member and self.is_unified_refresh:
+            return None
+        return timedelta(seconds=self.config_entry.options.get(OPTIONS_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))
+
+    @property
+    def max_staleness(self) -> timedelta:
+        """Return the maximum age of the data served after failed refreshes."""
+        return timedelta(seconds=self.config_entry.options.get(OPTIONS_MAX_STALENESS, DEFAULT_MAX_STALENESS))
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return the time since the last successful refresh, None if unknown."""
+        if self.data_fetched_at is None:
+            return None
+        return datetime.now(UTC) - self.data_fetched_at
+
+    @property
+    def is_stale(self) -> bool:
+        """Return True while the data of the last successful refresh is served after failed refreshes."""
+        return self.last_error is not None
+
+    def restore_snapshot(self, snapshot: dict[str, Any] | None) -> None:
+        """Serve the data persisted on the last run (if any) until the first refresh has completed."""
+        if snapshot is None:
+            self.data = {
+                self.data_key: None,
+                DATA_TIMESTAMP_KEY: None,
+            }
+            return
+        self.data_fetched_at = snapshot.pop(DATA_FETCHED_AT_KEY, None)
+        self.data = snapshot
+
+    async def _async_update_data(self) -> Any:
+        """Update data via library."""
+        return await self.async_fetch_update()
+
+    async def async_fetch_update(self) -> Any:
+        """
+        Fetch the data and return what the refresh is to apply (the stale data after a failed fetch).
+
+        Also used by the unified refresh of the battery coordinator, which applies the result itself.
+        Raises ConfigEntryAuthFailed if the credentials are rejected and UpdateFailed if there is no
+        (recent enough) data to serve.
+        """
+        try:
+            data = await self._async_fetch_data()
+        except NissanCarwingsApiUpdateTimeoutError as exception:
+            return self._async_serve_stale(exception)
+        except NissanCarwingsApiClientAuthenticationError as exception:
+            raise ConfigEntryAuthFailed(exception) from exception
+        except NissanCarwingsApiClientError as exception:
+            return self._async_serve_stale(exception)
+
+        if data is None:
+            # nothing has been fetched (not due), the data is as old (or stale) as it was
+            return self.data
+
+        self.update_interval = self._next_update_interval(data)
+        self.data_fetched_at = datetime.now(UTC)
+        was_stale = self.is_stale
+        self.last_error = None
+        self._stale_failures = 0
+
+        if _is_same_data(self.data, data):
+            # nothing has changed, keep the current data object so that the listeners are not notified
+            # (unless the entities have to drop their staleness attributes)
+            if was_stale:
+                self.async_update_listeners()
+            return self.data
+
+        # persist the latest data, so that it can be restored on the next startup
+        if data.get(self.data_key) is not None:
+            self.config_entry.runtime_data.snapshot_store.async_save_snapshot(
+                self.data_key, {**data, DATA_FETCHED_AT_KEY: self.data_fetched_at}
+            )
+
+        return data
+
+    def _async_serve_stale(self, exception: Exception) -> Any:
+        """
+        Keep serving the last good data after a failed refresh (stale-while-revalidate).
+
+        Raises UpdateFailed (the entities become unavailable) once the data is older than max_staleness.
+        """
+        age = self.data_age
+        if self.data is None or self.data.get(self.data_key) is None or age is None or age > self.max_staleness:
+            raise UpdateFailed(exception) from exception
+
+        if not self.is_stale:
+            LOGGER.warning(
+                "Refresh of %s failed (%s), serving the data of %s", self.data_key, exception, self.data_fetched_at
+            )
+        self.last_error = f"{exception.__class__.__name__}: {exception}"
+        self._stale_failures += 1
+        # revalidate with an exponential backoff
+        if (interval := self._next_update_interval(self.data)) is not None:
+            backoff = min(interval * 2**self._stale_failures, timedelta(seconds=STALE_REVALIDATE_MAX_INTERVAL))
+            self.update_interval = max(backoff, interval)
+        # the data object is unchanged, notify the listeners so that the staleness attributes are updated
+        self.async_update_listeners()
+        return self.data
+
+    async def async_bootstrap_refresh(self, deadline: float = BOOTSTRAP_REFRESH_DEADLINE) -> None:
+        """
+        Run the first refresh, bounded by a deadline (in seconds), meant to run as a background task.
+
+        Unlike async_config_entry_first_refresh, a slow or failing refresh does not hold up the setup:
+        the coordinator keeps serving the restored snapshot (if any) and retries on its regular schedule.
+        """
+        try:
+            async with asyncio.timeout(deadline):
+                await self.async_refresh()
+        except TimeoutError:
+            LOGGER.warning("First refresh of %s not completed within %s s, retrying later", self.data_key, deadline)
+            if self.data is None or self.data.get(self.data_key) is None:
+                # nothing to serve yet, mark the entities unavailable until the next successful refresh
+                self.async_set_update_error(UpdateFailed(f"First refresh timed out after {deadline} s"))
+
+    def _next_update_interval(self, data: dict[str, Any]) -> timedelta | None:  # noqa: ARG002
+        """Return the interval until the next refresh, stretched when the request budget runs low."""
+        interval = self.default_update_interval
+        if interval is None:
+            return None
+        return self._stretch_interval(interval)
+
+    def _stretch_interval(self, interval: timedelta) -> timedelta:
+        """Stretch an interval by the stretch factor of the request budget, up to BUDGET_MAX_STRETCHED_INTERVAL."""
+        stretched = interval * self.config_entry.runtime_data.client.budget.stretch_factor
+        # intervals configured longer than the maximum are kept as they are
+        return max(min(stretched, timedelta(seconds=BUDGET_MAX_STRETCHED_INTERVAL)), interval)
+
+    @abstractmethod
+    async def _async_fetch_data(self) -> dict[str, Any] | None:
+        """Fetch the data from the API, returns None if nothing has been fetched (the current data is kept)."""
+
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class CarwingsDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
+    data_key = DATA_BATTERY_STATUS_KEY
+
     # we will store the timestamp of the last failed attempt to update the data
     last_failed_attempt_timestamp: datetime | None = None
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
-        try:
-            # check if we need to perform a poll
-            interval = timedelta(
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: NissanCarwingsConfigEntry,
+    ) -> None:
+        """Initialize."""
+        super().__init__(hass=hass, config_entry=config_entry)
+        # interpolates the SOC between the battery status samples while charging
+        self.soc_estimator = SocEstimator()
+        # samples reported by the car, imported into the long-term statistics
+        self.battery_history = BatteryHistory()
+        # charging sessions derived from the samples (persisted along with the snapshots)
+        self.charging_sessions = ChargingSessionTracker()
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the latest battery status, together with the other data when the unified refresh is enabled."""
+        if not self.is_unified_refresh:
+            return await self._async_fetch_battery_status()
+
+        # fetch all endpoints concurrently (sharing the client's Leaf handle), so that the refresh only
+        # takes as long as the slowest call, then fan out the results to the other coordinators
+        members = (
+            self.config_entry.runtime_data.climate_coordinator,
+            self.config_entry.runtime_data.driving_analysis_coordinator,
+        )
+        data, *results = await asyncio.gather(
+            self._async_fetch_battery_status(),
+            *(member.async_fetch_update() for member in members),
+            return_exceptions=True,
+        )
+
+        auth_failed: ConfigEntryAuthFailed | None = None
+        for member, result in zip(members, results, strict=True):
+            if isinstance(result, ConfigEntryAuthFailed):
+                # raised by this refresh instead, so that the reauthentication is started
+                member.async_set_update_error(result)
+                auth_failed = result
+            elif isinstance(result, Exception):
+                member.async_set_update_error(result)
+            elif isinstance(result, BaseException):
+                raise result
+            elif result is not member.data or not member.last_update_success:
+                member.async_set_updated_data(result)
+
+        if isinstance(data, BaseException):
+            raise data
+        if auth_failed is not None:
+            raise auth_failed
+        return data
+
+    async def _async_fetch_battery_status(self) -> dict[str, Any]:
+        """Fetch the latest battery status, requesting an update from the car if due."""
+        # check if we need to perform a poll
+        # polls wake up the car, so they are stretched as well when the request budget runs low
+        interval = self._stretch_interval(
+            timedelta(
                 seconds=self.config_entry.options.get(OPTIONS_POLL_INTERVAL_CHARGING, DEFAULT_POLL_INTERVAL_CHARGING)
                 if self.is_charging
                 else self.config_entry.options.get(OPTIONS_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
             )
+        )
 
-            interval_when_failed = timedelta(seconds=POLL_INTERVAL_WHEN_FAILED)
-            if (
-                self.latest_update_timestamp is not None
-                and interval.seconds > 0
-                and (
-                    self.last_failed_attempt_timestamp is None
-                    and datetime.now(UTC) - self.latest_update_timestamp > interval
-                    or self.last_failed_attempt_timestamp is not None
-                    and datetime.now(UTC) - self.last_failed_attempt_timestamp > interval_when_failed
-                )
-            ):
-                local_timestamp = self.latest_update_timestamp.astimezone(tz=ZoneInfo(self.hass.config.time_zone))
-                LOGGER.info(
-                    f"Polling for new battery_status data; old_timestamp={local_timestamp}, interval={interval} (is_charging={self.is_charging})"
+        interval_when_failed = timedelta(seconds=POLL_INTERVAL_WHEN_FAILED)
+        if (
+            self.latest_update_timestamp is not None
+            # an interval of 0 disables polling
+            and interval.total_seconds() > 0
+            and (
+                self.last_failed_attempt_timestamp is None
+                and datetime.now(UTC) - self.latest_update_timestamp > interval
+                or self.last_failed_attempt_timestamp is not None
+                and datetime.now(UTC) - self.last_failed_attempt_timestamp > interval_when_failed
+            )
+        ):
+            local_timestamp = self.latest_update_timestamp.astimezone(tz=ZoneInfo(self.hass.config.time_zone))
+            LOGGER.info(
+                f"Polling for new battery_status data; old_timestamp={local_timestamp}, interval={interval} (is_charging={self.is_charging})"
+            )
+            try:
+                await self.config_entry.runtime_data.client.async_update_data()
+                self.last_failed_attempt_timestamp = None
+            except (NissanCarwingsApiUpdateTimeoutError, NissanCarwingsApiBudgetExceededError):
+                # handle timeout errors (and polls refused by the request budget) gracefully
+                self.last_failed_attempt_timestamp = datetime.now(UTC)
+
+        battery_status = await self.config_entry.runtime_data.client.async_get_data()
+        self.add_battery_sample(battery_status)
+
+        return {
+            DATA_BATTERY_STATUS_KEY: battery_status,
+            DATA_TIMESTAMP_KEY: battery_status.timestamp if battery_status else None,
+        }
+
+    def add_battery_sample(self, battery_status: BatteryState | None, *, import_statistics: bool = True) -> None:
+        """Feed a battery status reported by the car to the estimator, the history and the charging sessions."""
+        self.soc_estimator.add_sample(battery_status)
+        if self.battery_history.add(battery_status, import_statistics=import_statistics):
+            if self.charging_sessions.add_sample(self.battery_history.samples[-1]):
+                self.config_entry.runtime_data.snapshot_store.async_save_snapshot(
+                    DATA_CHARGING_SESSIONS_KEY, self.charging_sessions.as_dict()
                 )
-                try:
-                    await self.config_entry.runtime_data.client.async_update_data()
-                    self.last_failed_attempt_timestamp = None
-                except NissanCarwingsApiUpdateTimeoutError:
-                    # handle timeout errors gracefully
-                    self.last_failed_attempt_timestamp = datetime.now(UTC)
-
-            battery_status = await self.config_entry.runtime_data.client.async_get_data()
-
-            return {
-                DATA_BATTERY_STATUS_KEY: battery_status,
-                DATA_TIMESTAMP_KEY: battery_status.timestamp if battery_status else None,
-            }
+            self.battery_history.async_import_statistics(
+                self.hass, self.config_entry.data["vin"], self.config_entry.title
+            )
 
-        except NissanCarwingsApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except NissanCarwingsApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+    async def async_start_charging(self) -> bool:
+        """Start charging, returns False if the command has not been accepted by the Nissan servers."""
+        client = self.config_entry.runtime_data.client
+
+        async def execute() -> bool:
+            command = await client.async_start_charging()
+            if command is None:
+                return False
+            self.config_entry.async_create_background_task(
+                self.hass, self._async_confirm_charging(command), "nissan_carwings start charging confirmation"
+            )
+            return True
+
+        # repeated requests within the coalescing window result in a single command
+        return await client.command_queue.async_submit(COMMAND_GROUP_CHARGING, execute)
+
+    async def _async_confirm_charging(self, command: TrackedCommand) -> None:
+        """Wait until the car reports charging, then request one update from the car and refresh."""
+        client = self.config_entry.runtime_data.client
+        # the battery status timestamp has a resolution of one minute
+        issued_at = command.issued_at.replace(second=0, microsecond=0)
+
+        async def probe() -> BatteryState | None:
+            battery_status = await client.async_get_data()
+            if battery_status is not None and battery_status.timestamp >= issued_at and battery_status.is_charging:
+                return battery_status
+            return None
+
+        try:
+            await async_poll_for_result(probe, CHARGING_CONFIRMATION_POLLING, "start charging confirmation")
+        except (NissanCarwingsApiUpdateTimeoutError, NissanCarwingsApiClientError) as exception:
+            client.commands.fail(command, str(exception) or exception.__class__.__name__)
+        else:
+            client.commands.confirm(command)
+
+        # one targeted update, so that the charging state and the time to full are up to date right away
+        try:
+            await client.async_update_data(RequestPriority.USER)
+        except (NissanCarwingsApiUpdateTimeoutError, NissanCarwingsApiClientError) as exception:
+            LOGGER.warning("Update after starting to charge failed: %s", exception)
+        await self.async_request_refresh()
+
+    @property
+    def values(self) -> BatteryValues:
+        """Return the entity values, derived once per data update."""
+        return super().values
+
+    def _build_values(self, *, use_miles: bool) -> BatteryValues:
+        """Derive the entity values from the data."""
+        return BatteryValues.from_data(self.data, use_miles=use_miles)
 
     @property
     def is_charging(self) -> bool:
@@ -139,43 +473,144 @@ class CarwingsDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
 class CarwingsClimateDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
-        try:
-            climate_status = await self.config_entry.runtime_data.client.async_get_climate_data()
-            if climate_status:
-                # check if the pending state is still in effect
-                if not self.is_climate_pending_state_active:
-                    # pending state is no longer in effect, we will return to the normal update interval
-                    self.update_interval = timedelta(
-                        seconds=self.config_entry.options.get(OPTIONS_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-                    )
-
-            return {
-                DATA_CLIMATE_STATUS_KEY: climate_status,
-                DATA_TIMESTAMP_KEY: climate_status.timestamp if climate_status else None,
-            }
-        except NissanCarwingsApiUpdateTimeoutError as exception:
-            raise UpdateFailed(exception) from exception
-        except NissanCarwingsApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except NissanCarwingsApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+    data_key = DATA_CLIMATE_STATUS_KEY
+    unified_refresh_member = True
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: NissanCarwingsConfigEntry,
+    ) -> None:
+        """Initialize."""
+        # is_hvac_running also depends on the current time (AC timer), the entities filter unchanged states
+        super().__init__(
+            hass=hass,
+            config_entry=config_entry,
+            always_update=True,
+        )
 
-    def set_climate_pending_state(self, pending_state: bool) -> None:
-        """Set the climate pending state."""
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch the latest climate control status."""
+        climate_status = await self.config_entry.runtime_data.client.async_get_climate_data()
+        return {
+            DATA_CLIMATE_STATUS_KEY: climate_status,
+            DATA_TIMESTAMP_KEY: climate_status.timestamp if climate_status else None,
+        }
+
+    @property
+    def values(self) -> ClimateValues:
+        """Return the entity values, derived once per data update."""
+        return super().values
+
+    def _build_values(self, *, use_miles: bool) -> ClimateValues:  # noqa: ARG002
+        """Derive the entity values from the data."""
+        return ClimateValues.from_data(self.data)
+
+    def _next_update_interval(self, data: dict[str, Any]) -> timedelta | None:
+        """Keep the current (short) update interval while the pending state is still in effect."""
+        climate_status: ClimateState | None = data[DATA_CLIMATE_STATUS_KEY]
+        if climate_status is None or self._is_pending_state_active(climate_status):
+            return self.update_interval
+        # pending state is no longer in effect, we will return to the normal update interval
+        return super()._next_update_interval(data)
+
+    async def async_set_climate(self, *, switch_on: bool) -> bool:
+        """
+        Switch the climate control on or off, returns the state actually requested from the car.
+
+        Commands are coalesced: the last one within the window wins, and all callers get its state.
+        Raises HomeAssistantError if the command could not be sent.
+        """
+        client = self.config_entry.runtime_data.client
+        # reflect the intent right away, the command is sent after the coalescing window
+        self.config_entry.runtime_data.climate_pending_state.pending_state = switch_on
+
+        async def execute() -> bool:
+            try:
+                result_key = await client.async_set_climate(switch_on=switch_on)
+            except NissanCarwingsApiClientError as exception:
+                # not sent (e.g. circuit open, budget used up)
+                raise self._async_climate_not_sent(str(exception), switch_on=switch_on) from exception
+            if result_key is None:
+                # rejected by the Nissan servers, the car will not act on it
+                raise self._async_climate_not_sent("command not accepted", switch_on=switch_on)
+            self.set_climate_pending_state(switch_on, result_key)
+            return switch_on
+
+        return await client.command_queue.async_submit(COMMAND_GROUP_CLIMATE, execute)
+
+    def _async_climate_not_sent(self, reason: str, *, switch_on: bool) -> HomeAssistantError:
+        """Roll back the state reflected optimistically for a command not sent, returns the error to raise."""
+        self.config_entry.runtime_data.climate_pending_state.clear()
+        self.async_update_listeners()
+        return HomeAssistantError(f"Error {'starting' if switch_on else 'stopping'} the climate control: {reason}")
+
+    def set_climate_pending_state(self, pending_state: bool, result_key: str | None = None) -> None:
+        """
+        Set the climate pending state.
+
+        With the result key of the command, the pending state is confirmed (or rolled back) by the
+        answer of the car; else the climate control status is polled until it reflects the change.
+        """
         self.config_entry.runtime_data.climate_pending_state.pending_state = pending_state
+        if result_key is not None:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_confirm_climate(result_key, pending_state),
+                "nissan_carwings climate control confirmation",
+            )
+            return
+
+        self._async_poll_pending_state()
+
+    def _async_poll_pending_state(self) -> None:
+        """Poll the climate control status at a short interval while the pending state is in effect."""
         self.update_interval = timedelta(seconds=UPDATE_INTERVAL_WHILE_AWAITING_UPDATE)
 
         # hack to reset the current update schedule (else the modified update_interval will not be applied)
         if self.data is not None:
             self.async_set_updated_data(self.data)
 
+    async def _async_confirm_climate(self, result_key: str, pending_state: bool) -> None:
+        """Wait for the answer of the car to a climate control command and apply it."""
+        try:
+            result = await self.config_entry.runtime_data.client.async_get_climate_result(
+                result_key, switch_on=pending_state
+            )
+        except (NissanCarwingsApiUpdateTimeoutError, NissanCarwingsApiClientError) as exception:
+            LOGGER.warning("No answer to the climate control command, polling the status instead: %s", exception)
+            self._async_poll_pending_state()
+            return
+
+        climate_pending_state = self.config_entry.runtime_data.climate_pending_state
+        if climate_pending_state.pending_state != pending_state:
+            # another command has been issued meanwhile, its own confirmation will be applied
+            return
+        if result.is_hvac_running != pending_state:
+            LOGGER.warning("The car has not %s the climate control", "started" if pending_state else "stopped")
+        # the (confirmed or rolled back) state stays in effect until the status reflects it
+        climate_pending_state.apply_answer(result.is_hvac_running)
+
+        climate_status: ClimateState | None = self.data.get(DATA_CLIMATE_STATUS_KEY) if self.data else None
+        if climate_status is None:
+            # nothing to apply the answer to, fetch the full status
+            await self.async_refresh()
+            return
+
+        data = {
+            DATA_CLIMATE_STATUS_KEY: climate_status.with_command_result(result),
+            DATA_TIMESTAMP_KEY: result.confirmed_at,
+        }
+        self.config_entry.runtime_data.snapshot_store.async_save_snapshot(self.data_key, data)
+        # the pending state is no longer in effect, back to the normal update interval
+        self.update_interval = self._next_update_interval(data)
+        self.async_set_updated_data(data)
+
     @property
     def is_hvac_running(self) -> bool:
         """Return the current state of the climate control."""
 
-        climate_status: CarwingsLatestClimateControlStatusResponse | None = self.data.get(DATA_CLIMATE_STATUS_KEY)
+        climate_status: ClimateState | None = self.data.get(DATA_CLIMATE_STATUS_KEY)
         climate_pending_state = self.config_entry.runtime_data.climate_pending_state
 
         is_hvac_running = (
@@ -201,8 +636,11 @@ class CarwingsClimateDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
     @property
     def is_climate_pending_state_active(self) -> bool:
         """Is the climate status in a pending state? This means, that the state has been requested but not yet confirmed by the car."""
+        return self._is_pending_state_active(self.data[DATA_CLIMATE_STATUS_KEY])
+
+    def _is_pending_state_active(self, climate_status: ClimateState | None) -> bool:
+        """Check the pending state against a climate status."""
         climate_pending_state = self.config_entry.runtime_data.climate_pending_state
-        climate_status: CarwingsLatestClimateControlStatusResponse = self.data[DATA_CLIMATE_STATUS_KEY]
 
         # we will also consider the pending state as active if there is no status data available
         return (
@@ -215,30 +653,106 @@ class CarwingsClimateDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
 class CarwingsDrivingAnalysisDataUpdateCoordinator(CarwingsBaseDataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
+    data_key = DATA_DRIVING_ANALYSIS_KEY
+    unified_refresh_member = True
+
+    @property
+    def values(self) -> DrivingAnalysisValues:
+        """Return the entity values, derived once per data update."""
+        return super().values
+
+    def _build_values(self, *, use_miles: bool) -> DrivingAnalysisValues:  # noqa: ARG002
+        """Derive the entity values from the data."""
+        return DrivingAnalysisValues.from_data(self.data)
+
     def __init__(
         self,
         hass: HomeAssistant,
         config_entry: NissanCarwingsConfigEntry,
     ) -> None:
         """Initialize."""
-        super().__init__(
-            hass=hass,
-            config_entry=config_entry,
-            always_update=False,
-        )
+        super().__init__(hass=hass, config_entry=config_entry)
+        # the daily analyses (persisted along with the snapshots), imported into the long-term statistics
+        self.driving_history = DrivingAnalysisHistory()
+        self._backfill_attempted = False
+        # time of the latest fetch and the SOC reported by the car at that time
+        self._last_fetch: datetime | None = None
+        self._soc_at_last_fetch: float | None = None
+
+    async def _async_fetch_data(self) -> dict[str, Any] | None:
+        """Fetch the latest driving analysis, if it may have changed since the latest fetch."""
+        if not self.driving_history.backfilled and not self._backfill_attempted:
+            self._backfill_attempted = True
+            await self._async_backfill()
+
+        if self.data is not None and not self._is_fetch_plausible():
+            return None
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
-        try:
-            driving_analysis = await self.config_entry.runtime_data.client.async_get_driving_analysis_data()
-            return {
-                DATA_DRIVING_ANALYSIS_KEY: driving_analysis,
-                DATA_TIMESTAMP_KEY: None,  # unfortunately there is no timestamp info in the response
-            }
+        driving_analysis = await self.config_entry.runtime_data.client.async_get_driving_analysis_data()
+        self._last_fetch = datetime.now(UTC)
+        self._soc_at_last_fetch = self._latest_soc
+        if self.driving_history.add(driving_analysis):
+            self._async_history_changed()
 
-        except NissanCarwingsApiUpdateTimeoutError as exception:
-            raise UpdateFailed(exception) from exception
-        except NissanCarwingsApiClientAuthenticationError as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
+        return {
+            DATA_DRIVING_ANALYSIS_KEY: driving_analysis,
+            DATA_TIMESTAMP_KEY: None,  # unfortunately there is no timestamp info in the response
+        }
+
+    @property
+    def _latest_soc(self) -> float | None:
+        """Return the latest SOC reported by the car."""
+        sample = self.config_entry.runtime_data.coordinator.battery_history.latest
+        return sample.soc if sample is not None else None
+
+    def _is_fetch_plausible(self) -> bool:
+        """Return True if the driving analysis may have changed since the latest fetch."""
+        if self._last_fetch is None or self.data.get(DATA_DRIVING_ANALYSIS_KEY) is None:
+            return True
+
+        now = datetime.now(UTC)
+        if (now - self._last_fetch).total_seconds() > DRIVING_ANALYSIS_MAX_AGE:
+            return True
+
+        # a new day has started (the analysis is about the current day)
+        time_zone = ZoneInfo(self.hass.config.time_zone)
+        if now.astimezone(time_zone).date() != self._last_fetch.astimezone(time_zone).date():
+            return True
+
+        # the car has been driven since the latest fetch
+        soc = self._latest_soc
+        return soc is not None and self._soc_at_last_fetch is not None and soc < self._soc_at_last_fetch
+
+    async def _async_backfill(self) -> None:
+        """Backfill the history with the days of the past months, from the electric rate simulation."""
+        client = self.config_entry.runtime_data.client
+        today = datetime.now(ZoneInfo(self.hass.config.time_zone)).date()
+        months = [
+            f"{year:04d}{month + 1:02d}"
+            for year, month in (
+                divmod(today.year * 12 + today.month - 1 - offset, 12) for offset in range(DRIVING_BACKFILL_MONTHS)
+            )
+        ]
+        try:
+            for target_month in months:
+                for driving_analysis in await client.async_get_driving_history(target_month):
+                    # the daily analysis (if known) is more detailed
+                    self.driving_history.add(driving_analysis, replace=False)
+        except NissanCarwingsApiClientAuthenticationError:
+            # retried after the reauthentication (which reloads the entry)
+            raise
         except NissanCarwingsApiClientError as exception:
-            raise UpdateFailed(exception) from exception
+            LOGGER.warning(
+                "Backfilling the driving analysis history failed, will retry on the next startup: %s", exception
+            )
+        else:
+            LOGGER.info("Backfilled the driving analysis history of the months %s", ", ".join(months))
+            self.driving_history.backfilled = True
+        self._async_history_changed()
+
+    def _async_history_changed(self) -> None:
+        """Persist the history and import the new days into the long-term statistics."""
+        self.config_entry.runtime_data.snapshot_store.async_save_snapshot(
+            DATA_DRIVING_HISTORY_KEY, self.driving_history.as_dict()
+        )
+        self.driving_history.async_import_statistics(self.hass, self.config_entry.data["vin"], self.config_entry.title)
@@ -4,8 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
-from datetime import datetime
-from pytz import UTC
+from datetime import UTC, datetime
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -17,6 +16,7 @@ if TYPE_CHECKING:
         CarwingsDataUpdateCoordinator,
         CarwingsDrivingAnalysisDataUpdateCoordinator,
     )
+    from .store import NissanCarwingsSnapshotStore
 
 
 type NissanCarwingsConfigEntry = ConfigEntry[NissanCarwingsData]
@@ -31,6 +31,7 @@ class NissanCarwingsData:
     climate_coordinator: CarwingsClimateDataUpdateCoordinator
     climate_pending_state: NissanCarwingsClimatePendingState
     driving_analysis_coordinator: CarwingsDrivingAnalysisDataUpdateCoordinator
+    snapshot_store: NissanCarwingsSnapshotStore
     integration: Integration
 
 
@@ -60,3 +61,17 @@ class NissanCarwingsClimatePendingState:
         """Set the pending state and update the timestamp."""
         self._pending_state = state
         self._pending_timestamp = datetime.now(UTC).replace(second=0, microsecond=0)
+
+    def apply_answer(self, state: bool) -> None:
+        """
+        Set the state answered by the car, keeping the timestamp of the request.
+
+        The answer (applied as the climate status) is newer than the request, so the pending state
+        ends with it, also if a minute has started in between.
+        """
+        self._pending_state = state
+
+    def clear(self) -> None:
+        """Drop the pending state (e.g. the command could not be sent), the climate status applies again."""
+        self._pending_state = False
+        self._pending_timestamp = datetime.fromtimestamp(0).replace(tzinfo=UTC)
@@ -0,0 +1,45 @@
+"""Diagnostics support for nissan_carwings."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import NissanCarwingsConfigEntry
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, "vin"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: NissanCarwingsConfigEntry,
+) -> dict[str, Any]:
+    """Return the diagnostics of a config entry, including the API latency and error metrics."""
+    runtime_data = entry.runtime_data
+    coordinators = {
+        "battery": runtime_data.coordinator,
+        "climate": runtime_data.climate_coordinator,
+        "driving_analysis": runtime_data.driving_analysis_coordinator,
+    }
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "api_metrics": runtime_data.client.metrics.as_dict(),
+        "request_budget": runtime_data.client.budget.as_dict(),
+        "circuit_breaker": runtime_data.client.breaker.as_dict(),
+        "commands": runtime_data.client.commands.as_dict(),
+        "coordinators": {
+            name: {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+            }
+            for name, coordinator in coordinators.items()
+        },
+    }
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -41,6 +42,39 @@ class NissanCarwingsEntity(CoordinatorEntity[CarwingsBaseDataUpdateCoordinator])
             name=nickname,
         )
 
+    # the state, availability, icon and attributes last written to the state machine
+    _written_state: tuple[Any, ...] | None = None
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return the derived values which make up the state of the entity."""
+        if not self.available:
+            return (False,)
+        return (True, self.state, self.icon, self.extra_state_attributes)
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember what has been written."""
+        self._written_state = self._state_fingerprint()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if a derived value has changed."""
+        if self._written_state is not None and self._state_fingerprint() == self._written_state:
+            return
+        self.async_write_ha_state()
+
+    @property
+    def staleness_attributes(self) -> dict[str, Any]:
+        """Return the age of the data and the error of the latest refresh, only while stale data is served."""
+        if not self.coordinator.is_stale:
+            return {}
+        data_age = self.coordinator.data_age
+        return {
+            "data_age_seconds": round(data_age.total_seconds()) if data_age is not None else None,
+            "last_error": self.coordinator.last_error,
+        }
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return default attributes for Nissan leaf entities."""
@@ -48,4 +82,5 @@ class NissanCarwingsEntity(CoordinatorEntity[CarwingsBaseDataUpdateCoordinator])
         return {
             "VIN": self.coordinator.config_entry.data["vin"],
             "timestamp": self.coordinator.data.get(DATA_TIMESTAMP_KEY),
+            **self.staleness_attributes,
         }
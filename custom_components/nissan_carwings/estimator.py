@@ -0,0 +1,155 @@
+"""State of charge estimation between the battery status polls of nissan_carwings."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from .const import SOC_ESTIMATE_MAX_AGE, SOC_ESTIMATE_MAX_ERROR, SOC_ESTIMATE_RATE_SMOOTHING
+
+if TYPE_CHECKING:
+    from .models import BatteryState
+
+
+@dataclass(frozen=True)
+class SocSample:
+    """A battery status sample reported by the car."""
+
+    timestamp: datetime
+    soc: float
+    energy_wh: float | None
+    is_charging: bool
+
+
+@dataclass(frozen=True)
+class SocEstimate:
+    """An (interpolated) state of charge."""
+
+    soc: float
+    energy_wh: float | None
+    # seconds since the latest sample reported by the car
+    age: float
+    # 0..1, decreases with the age and the error of the previous estimate
+    confidence: float
+    # learned charge rate, in percent per hour (None if not charging or not yet known)
+    charge_rate: float | None
+    is_interpolated: bool
+
+
+class SocEstimator:
+    """
+    Estimate the state of charge while charging.
+
+    The charge rate (percent and Wh per second) is learned from successive samples of the same
+    charging session. Between the samples, the SOC and energy are extrapolated from the latest
+    sample, so a new sample corrects the estimate right away.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.sample: SocSample | None = None
+        # learned charge rates per second (smoothed), None until two samples of a charging session are known
+        self._soc_rate: float | None = None
+        self._energy_rate: float | None = None
+        # number of sample intervals the rate has been learned from
+        self._rate_samples = 0
+        # absolute error (in percent) of the estimate for the latest sample
+        self._last_error = 0.0
+
+    @property
+    def is_charging(self) -> bool:
+        """Return True if the latest sample has been taken while charging."""
+        return self.sample is not None and self.sample.is_charging
+
+    def add_sample(self, battery_status: BatteryState | None) -> None:
+        """Add a battery status reported by the car, samples already known are ignored."""
+        # 0% SOC is not a valid value
+        if battery_status is None or not battery_status.battery_percent:
+            return
+
+        sample = SocSample(
+            timestamp=battery_status.timestamp,
+            soc=battery_status.battery_percent,
+            energy_wh=battery_status.battery_remaining_amount_wh,
+            is_charging=battery_status.is_charging,
+        )
+        previous = self.sample
+        if previous is not None and sample.timestamp <= previous.timestamp:
+            return
+
+        if not sample.is_charging or previous is None or not previous.is_charging or sample.soc < previous.soc:
+            # a new charging session (or none at all), forget the learned rate
+            self._reset_rate()
+        else:
+            if self._soc_rate is not None:
+                # how far off the extrapolation was (the estimate is based on the previous sample)
+                self._last_error = abs(self.estimate(sample.timestamp).soc - sample.soc)
+            self._learn_rate(previous, sample)
+
+        self.sample = sample
+
+    def _reset_rate(self) -> None:
+        """Forget the learned charge rate."""
+        self._soc_rate = None
+        self._energy_rate = None
+        self._rate_samples = 0
+        self._last_error = 0.0
+
+    def _learn_rate(self, previous: SocSample, sample: SocSample) -> None:
+        """Update the charge rate with the interval between two samples of the same charging session."""
+        elapsed = (sample.timestamp - previous.timestamp).total_seconds()
+        soc_rate = (sample.soc - previous.soc) / elapsed
+        self._soc_rate = self._smooth(self._soc_rate, soc_rate)
+        if sample.energy_wh is not None and previous.energy_wh is not None:
+            self._energy_rate = self._smooth(self._energy_rate, (sample.energy_wh - previous.energy_wh) / elapsed)
+        self._rate_samples += 1
+
+    @staticmethod
+    def _smooth(current: float | None, value: float) -> float:
+        """Exponentially smooth a rate."""
+        if current is None:
+            return value
+        return SOC_ESTIMATE_RATE_SMOOTHING * value + (1 - SOC_ESTIMATE_RATE_SMOOTHING) * current
+
+    def estimate(self, now: datetime) -> SocEstimate | None:
+        """Return the estimated state of charge at the given time."""
+        sample = self.sample
+        if sample is None:
+            return None
+
+        age = max((now - sample.timestamp).total_seconds(), 0.0)
+        confidence = max(1 - age / SOC_ESTIMATE_MAX_AGE, 0.0)
+
+        if not sample.is_charging or self._soc_rate is None or self._soc_rate <= 0:
+            # while charging without a known rate, the latest sample is all we have
+            if sample.is_charging:
+                confidence *= 0.5
+            return SocEstimate(
+                soc=sample.soc,
+                energy_wh=sample.energy_wh,
+                age=age,
+                confidence=round(confidence, 2),
+                charge_rate=None,
+                is_interpolated=False,
+            )
+
+        # extrapolate up to a full battery, but not beyond the maximum age
+        elapsed = min(age, SOC_ESTIMATE_MAX_AGE, (100 - sample.soc) / self._soc_rate)
+        energy_wh = sample.energy_wh
+        if energy_wh is not None and self._energy_rate is not None:
+            energy_wh += self._energy_rate * elapsed
+
+        # a rate learned from a single interval is less reliable, as is one which mispredicted the latest sample
+        if self._rate_samples < 2:  # noqa: PLR2004
+            confidence *= 0.75
+        confidence *= max(1 - self._last_error / SOC_ESTIMATE_MAX_ERROR, 0.0)
+
+        return SocEstimate(
+            soc=sample.soc + self._soc_rate * elapsed,
+            energy_wh=energy_wh,
+            age=age,
+            confidence=round(confidence, 2),
+            charge_rate=self._soc_rate * 3600,
+            is_interpolated=elapsed > 0,
+        )
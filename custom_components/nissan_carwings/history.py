@@ -0,0 +1,231 @@
+"""Battery sample and driving analysis history of nissan_carwings, imported into the long-term statistics."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
+from statistics import fmean
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
+
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfLength
+from homeassistant.util import slugify
+
+from .const import BATTERY_HISTORY_SIZE, DOMAIN, DRIVING_HISTORY_DAYS, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.core import HomeAssistant
+
+    from .models import BatteryState, DrivingAnalysis
+
+
+@dataclass(frozen=True, slots=True)
+class BatterySample:
+    """A battery status sample, as measured by the car."""
+
+    # time of the measurement, as reported by the car (UTC)
+    timestamp: datetime
+    soc: float
+    energy_wh: float | None
+    range_ac_on_km: float | None
+    range_ac_off_km: float | None
+    is_connected: bool
+    is_charging: bool
+
+    @classmethod
+    def from_battery_state(cls, battery_status: BatteryState) -> BatterySample:
+        """Create a sample from a battery status."""
+        return cls(
+            timestamp=battery_status.timestamp,
+            soc=battery_status.battery_percent,
+            energy_wh=battery_status.battery_remaining_amount_wh,
+            range_ac_on_km=battery_status.cruising_range_ac_on_km,
+            range_ac_off_km=battery_status.cruising_range_ac_off_km,
+            is_connected=battery_status.is_connected,
+            is_charging=battery_status.is_charging,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _BatteryStatistic:
+    """A long-term statistic derived from the battery samples."""
+
+    key: str
+    name: str
+    unit: str
+    value: Callable[[BatterySample], float | None]
+
+
+_STATISTICS = (
+    _BatteryStatistic("battery_soc", "Battery", PERCENTAGE, lambda sample: sample.soc),
+    _BatteryStatistic("battery_energy", "Battery Energy", UnitOfEnergy.WATT_HOUR, lambda sample: sample.energy_wh),
+    _BatteryStatistic("range_ac_on", "Range (AC)", UnitOfLength.KILOMETERS, lambda sample: sample.range_ac_on_km),
+    _BatteryStatistic("range_ac_off", "Range", UnitOfLength.KILOMETERS, lambda sample: sample.range_ac_off_km),
+)
+
+
+def _hour_start(timestamp: datetime) -> datetime:
+    """Return the start of the (statistics) hour a timestamp belongs to."""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _async_import(
+    hass: HomeAssistant, vin: str, key: str, name: str, unit: str | None, statistics: list[StatisticData]
+) -> None:
+    """Import a batch of statistics rows of the vehicle."""
+    # the recorder (and SQLAlchemy with it) is not imported with the integration, it is loaded by now
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    metadata: StatisticMetaData = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": f"{DOMAIN}:{slugify(vin)}_{key}",
+        "unit_of_measurement": unit,
+    }
+    LOGGER.debug("Importing %d row(s) of %s statistics", len(statistics), metadata["statistic_id"])
+    async_add_external_statistics(hass, metadata, statistics)
+
+
+class BatteryHistory:
+    """
+    Bounded ring buffer of the battery samples reported by the car.
+
+    New samples mark their hour as pending; flushing the history imports the hourly mean, min and
+    max of all pending hours in one batch per statistic, keyed by the car's own timestamps.
+
+    Samples added without importing them (e.g. restored on startup) make their hour incomplete: the
+    earlier samples of that hour are gone, the row imported before the restart is not overwritten.
+    """
+
+    def __init__(self, maxlen: int = BATTERY_HISTORY_SIZE) -> None:
+        """Initialize."""
+        self.samples: deque[BatterySample] = deque(maxlen=maxlen)
+        # start of the hours with samples not yet imported into the statistics
+        self._pending_hours: set[datetime] = set()
+        # start of the latest hour whose samples have not all been seen, never imported
+        self._incomplete_hour: datetime | None = None
+
+    @property
+    def latest(self) -> BatterySample | None:
+        """Return the latest sample."""
+        return self.samples[-1] if self.samples else None
+
+    def add(self, battery_status: BatteryState | None, *, import_statistics: bool = True) -> bool:
+        """Add a battery status reported by the car, returns False if it is already known (or invalid)."""
+        # 0% SOC is not a valid value
+        if battery_status is None or not battery_status.battery_percent:
+            return False
+        if (latest := self.latest) is not None and battery_status.timestamp <= latest.timestamp:
+            return False
+
+        sample = BatterySample.from_battery_state(battery_status)
+        self.samples.append(sample)
+        if import_statistics:
+            self._pending_hours.add(_hour_start(sample.timestamp))
+        else:
+            self._incomplete_hour = _hour_start(sample.timestamp)
+        return True
+
+    def _samples_by_hour(self, hours: Iterable[datetime]) -> dict[datetime, list[BatterySample]]:
+        """Return the buffered samples of the given hours."""
+        samples_by_hour: dict[datetime, list[BatterySample]] = {hour: [] for hour in hours}
+        for sample in self.samples:
+            if (samples := samples_by_hour.get(_hour_start(sample.timestamp))) is not None:
+                samples.append(sample)
+        return samples_by_hour
+
+    def async_import_statistics(self, hass: HomeAssistant, vin: str, name: str) -> None:
+        """Import the pending hours into the long-term statistics (needs the recorder)."""
+        if not self._pending_hours:
+            return
+        if "recorder" not in hass.config.components:
+            # without the recorder there is nowhere to import to, keep the history in memory only
+            self._pending_hours.clear()
+            return
+
+        hours = sorted(
+            hour for hour in self._pending_hours if self._incomplete_hour is None or hour > self._incomplete_hour
+        )
+        samples_by_hour = self._samples_by_hour(hours)
+        self._pending_hours.clear()
+
+        for statistic in _STATISTICS:
+            statistics: list[StatisticData] = []
+            for hour, samples in samples_by_hour.items():
+                values = [value for sample in samples if (value := statistic.value(sample)) is not None]
+                if values:
+                    statistics.append({"start": hour, "mean": fmean(values), "min": min(values), "max": max(values)})
+            if statistics:
+                _async_import(hass, vin, statistic.key, f"{name} {statistic.name}", statistic.unit, statistics)
+
+
+class DrivingAnalysisHistory:
+    """
+    Driving analyses of the latest DRIVING_HISTORY_DAYS days, keyed by their target_date.
+
+    The daily electric mileage is imported into the statistics (one row at the start of the day);
+    days backfilled from the electric rate simulation never replace a daily driving analysis.
+    """
+
+    def __init__(self, maxlen: int = DRIVING_HISTORY_DAYS) -> None:
+        """Initialize."""
+        self.days: dict[str, DrivingAnalysis] = {}
+        # True once the past months have been backfilled
+        self.backfilled = False
+        self._maxlen = maxlen
+        # target dates not yet imported into the statistics
+        self._pending_dates: set[str] = set()
+
+    def add(self, driving_analysis: DrivingAnalysis | None, *, replace: bool = True) -> bool:
+        """Add the driving analysis of a day, returns False if it is already known."""
+        if driving_analysis is None:
+            return False
+        known = self.days.get(driving_analysis.target_date)
+        if known == driving_analysis or (known is not None and not replace):
+            return False
+
+        self.days[driving_analysis.target_date] = driving_analysis
+        self._pending_dates.add(driving_analysis.target_date)
+        if len(self.days) > self._maxlen:
+            # target dates (YYYY-MM-DD) sort chronologically
+            for target_date in sorted(self.days)[: len(self.days) - self._maxlen]:
+                del self.days[target_date]
+                self._pending_dates.discard(target_date)
+        return True
+
+    def async_import_statistics(self, hass: HomeAssistant, vin: str, name: str) -> None:
+        """Import the electric mileage of the pending days into the long-term statistics (needs the recorder)."""
+        pending = [self.days[target_date] for target_date in sorted(self._pending_dates)]
+        self._pending_dates.clear()
+        if not pending or "recorder" not in hass.config.components:
+            return
+
+        time_zone = ZoneInfo(hass.config.time_zone)
+        statistics_by_unit: dict[str, list[StatisticData]] = {}
+        for driving_analysis in pending:
+            if driving_analysis.electric_mileage is None:
+                continue
+            day_start = datetime.combine(date.fromisoformat(driving_analysis.target_date), time(), tzinfo=time_zone)
+            mileage = driving_analysis.electric_mileage
+            statistics_by_unit.setdefault(driving_analysis.electric_cost_scale, []).append(
+                {"start": _hour_start(day_start.astimezone(UTC)), "mean": mileage, "min": mileage, "max": mileage}
+            )
+
+        # the unit (e.g. miles/kWh) is part of the metadata, it only changes with the car's settings
+        for unit, statistics in statistics_by_unit.items():
+            _async_import(hass, vin, "electric_mileage", f"{name} Daily Efficiency", unit, statistics)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the history, to be persisted."""
+        return {"days": list(self.days.values()), "backfilled": self.backfilled}
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the state persisted by as_dict()."""
+        self.days = {driving_analysis.target_date: driving_analysis for driving_analysis in data["days"]}
+        self.backfilled = data["backfilled"]
@@ -0,0 +1,94 @@
+"""Latency and error metrics of the Carwings API calls."""
+
+from __future__ import annotations
+
+import statistics
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .const import METRICS_HISTOGRAM_BUCKETS, METRICS_WINDOW_SIZE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass
+class OperationMetrics:
+    """Metrics of a single API operation."""
+
+    count: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+    # latencies of the most recent calls (rolling window), in seconds
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=METRICS_WINDOW_SIZE))
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of failed calls."""
+        return sum(self.errors.values())
+
+    def percentile(self, percentile: int) -> float | None:
+        """Return a latency percentile (of the rolling window), in seconds."""
+        if not self.latencies:
+            return None
+        if len(self.latencies) == 1:
+            return self.latencies[0]
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percentile - 1]
+
+    def histogram(self) -> dict[str, int]:
+        """Return the latency histogram of the rolling window, keyed by the bucket upper bound."""
+        buckets = dict.fromkeys((f"<={bound}s" for bound in METRICS_HISTOGRAM_BUCKETS), 0)
+        buckets[f">{METRICS_HISTOGRAM_BUCKETS[-1]}s"] = 0
+        for latency in self.latencies:
+            bound = next((bound for bound in METRICS_HISTOGRAM_BUCKETS if latency <= bound), None)
+            buckets[f"<={bound}s" if bound is not None else f">{METRICS_HISTOGRAM_BUCKETS[-1]}s"] += 1
+        return buckets
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dict."""
+        return {
+            "count": self.count,
+            "error_count": self.error_count,
+            "errors": dict(self.errors),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self.latencies, default=None),
+            "histogram": self.histogram(),
+        }
+
+
+class NissanCarwingsApiMetrics:
+    """Collects the metrics of all API operations of a client."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.operations: dict[str, OperationMetrics] = {}
+        self._listeners: list[Callable[[str], None]] = []
+
+    def get(self, operation: str) -> OperationMetrics:
+        """Return the metrics of an operation."""
+        if operation not in self.operations:
+            self.operations[operation] = OperationMetrics()
+        return self.operations[operation]
+
+    def record(self, operation: str, duration: float, exception: BaseException | None = None) -> None:
+        """Record a finished call of an operation."""
+        metrics = self.get(operation)
+        metrics.count += 1
+        metrics.latencies.append(duration)
+        if exception is not None:
+            # the underlying cause (e.g. the aiohttp error) is more meaningful than the CarwingsError wrapper
+            metrics.errors[type(exception.__cause__ or exception).__name__] += 1
+
+        for listener in self._listeners:
+            listener(operation)
+
+    def add_listener(self, listener: Callable[[str], None]) -> Callable[[], None]:
+        """Register a listener called with the operation name after each call, returns a function to remove it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of all operations as a dict."""
+        return {operation: metrics.as_dict() for operation, metrics in self.operations.items()}
@@ -0,0 +1,276 @@
+"""Data model of nissan_carwings, converted from the pycarwings3 responses."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from pycarwings3 import Session
+    from pycarwings3.responses import (
+        CarwingsDrivingAnalysisResponse,
+        CarwingsElectricRateSimulationResponse,
+        CarwingsLatestBatteryStatusResponse,
+        CarwingsLatestClimateControlStatusResponse,
+        CarwingsStartClimateControlResponse,
+        CarwingsStopClimateControlResponse,
+    )
+
+
+def _as_float(value: Any) -> float | None:
+    """Convert an API value (a string, empty if unknown) to float."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_int(value: Any) -> int | None:
+    """Convert an API value (a string, empty if unknown) to int."""
+    number = _as_float(value)
+    return int(number) if number is not None else None
+
+
+def _as_list(value: Any) -> list[Any]:
+    """Return a list of the API value (single items are not wrapped in a list, empty lists may be a string)."""
+    if isinstance(value, list):
+        return value
+    return [value] if isinstance(value, dict) else []
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryState:
+    """Battery status of the vehicle."""
+
+    # time of the status, as reported by the car (UTC)
+    timestamp: datetime
+    battery_percent: float
+    battery_capacity: int | None
+    battery_remaining_amount: int | None
+    battery_remaining_amount_wh: float | None
+    charging_status: str
+    is_charging: bool
+    is_quick_charging: bool
+    plugin_state: str
+    is_connected: bool
+    is_connected_to_quick_charger: bool
+    cruising_range_ac_on_km: float | None
+    cruising_range_ac_off_km: float | None
+    time_to_full_trickle: timedelta | None
+    time_to_full_l2: timedelta | None
+    time_to_full_l2_6kw: timedelta | None
+
+    @classmethod
+    def from_response(cls, response: CarwingsLatestBatteryStatusResponse) -> BatteryState:
+        """Convert a pycarwings3 battery status response."""
+        return cls(
+            timestamp=response.timestamp,
+            battery_percent=float(response.battery_percent),
+            battery_capacity=_as_int(response.battery_capacity),
+            battery_remaining_amount=_as_int(response.battery_remaining_amount),
+            battery_remaining_amount_wh=_as_float(response.battery_remaining_amount_wh),
+            charging_status=response.charging_status,
+            is_charging=bool(response.is_charging),
+            is_quick_charging=bool(response.is_quick_charging),
+            plugin_state=response.plugin_state,
+            is_connected=bool(response.is_connected),
+            is_connected_to_quick_charger=bool(response.is_connected_to_quick_charger),
+            cruising_range_ac_on_km=_as_float(response.cruising_range_ac_on_km),
+            cruising_range_ac_off_km=_as_float(response.cruising_range_ac_off_km),
+            time_to_full_trickle=response.time_to_full_trickle,
+            time_to_full_l2=response.time_to_full_l2,
+            time_to_full_l2_6kw=response.time_to_full_l2_6kw,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateState:
+    """Climate control status of the vehicle."""
+
+    # time of the status, as reported by the car (UTC)
+    timestamp: datetime
+    is_hvac_running: bool
+    is_plugged_in: bool
+    ac_duration: timedelta | None
+    ac_start_stop_date_and_time: datetime | None
+    cruising_range_ac_on_km: float | None
+    cruising_range_ac_off_km: float | None
+
+    @classmethod
+    def from_response(cls, response: CarwingsLatestClimateControlStatusResponse) -> ClimateState:
+        """Convert a pycarwings3 climate control status response."""
+        return cls(
+            timestamp=response.timestamp,
+            is_hvac_running=bool(response.is_hvac_running),
+            is_plugged_in=bool(response.is_plugged_in),
+            ac_duration=response.ac_duration,
+            ac_start_stop_date_and_time=response.ac_start_stop_date_and_time,
+            cruising_range_ac_on_km=_as_float(response.cruising_range_ac_on_km),
+            cruising_range_ac_off_km=_as_float(response.cruising_range_ac_off_km),
+        )
+
+    def with_command_result(self, result: ClimateCommandResult) -> ClimateState:
+        """Return the status after a climate control command confirmed by the car."""
+        return replace(
+            self,
+            timestamp=result.confirmed_at,
+            is_hvac_running=result.is_hvac_running,
+            ac_duration=result.ac_duration or self.ac_duration,
+            ac_start_stop_date_and_time=result.confirmed_at,
+            cruising_range_ac_on_km=result.cruising_range_ac_on_km or self.cruising_range_ac_on_km,
+            cruising_range_ac_off_km=result.cruising_range_ac_off_km or self.cruising_range_ac_off_km,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateCommandResult:
+    """Answer of the car to a climate control (start/stop) command."""
+
+    # time the answer has been received (UTC), the car's own timestamp has no time zone
+    confirmed_at: datetime
+    is_hvac_running: bool
+    # only part of the answer to a start command
+    ac_duration: timedelta | None
+    cruising_range_ac_on_km: float | None
+    cruising_range_ac_off_km: float | None
+
+    @classmethod
+    def from_response(
+        cls,
+        response: CarwingsStartClimateControlResponse | CarwingsStopClimateControlResponse,
+        confirmed_at: datetime,
+    ) -> ClimateCommandResult:
+        """Convert a pycarwings3 start/stop climate control result response."""
+        return cls(
+            confirmed_at=confirmed_at,
+            is_hvac_running=bool(response.is_hvac_running),
+            ac_duration=getattr(response, "ac_continue_time", None),
+            cruising_range_ac_on_km=getattr(response, "cruising_range_ac_on_km", None),
+            cruising_range_ac_off_km=getattr(response, "cruising_range_ac_off_km", None),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DrivingAnalysis:
+    """Driving analysis (energy efficiency) of a day."""
+
+    # the day the analysis is about (YYYY-MM-DD)
+    target_date: str
+    display_date: str
+    electric_mileage: float | None
+    electric_mileage_level: int | None
+    electric_cost_scale: str
+    power_consumption_moter: float | None
+    power_consumption_moter_level: int | None
+    power_consumption_minus: float | None
+    power_consumption_minus_level: int | None
+    power_consumption_aux: float | None
+    power_consumption_aux_level: int | None
+    # the first advice of the list
+    advice_title: str | None
+    advice_body: str | None
+
+    @classmethod
+    def from_response(cls, response: CarwingsDrivingAnalysisResponse) -> DrivingAnalysis:
+        """Convert a pycarwings3 driving analysis response."""
+        advice = response.advice[0] if getattr(response, "advice", None) else {}
+        return cls(
+            target_date=response.target_date,
+            display_date=response.display_date,
+            electric_mileage=_as_float(response.electric_mileage),
+            electric_mileage_level=_as_int(response.electric_mileage_level),
+            electric_cost_scale=response.electric_cost_scale,
+            power_consumption_moter=_as_float(response.power_consumption_moter),
+            power_consumption_moter_level=_as_int(response.power_consumption_moter_level),
+            power_consumption_minus=_as_float(response.power_consumption_minus),
+            power_consumption_minus_level=_as_int(response.power_consumption_minus_level),
+            power_consumption_aux=_as_float(response.power_consumption_aux),
+            power_consumption_aux_level=_as_int(response.power_consumption_aux_level),
+            advice_title=advice.get("title"),
+            advice_body=advice.get("body"),
+        )
+
+    @classmethod
+    def from_simulation_day(cls, day: dict[str, Any], electric_cost_scale: str) -> DrivingAnalysis | None:
+        """
+        Convert a day of the electric rate simulation (a list of trips), None if no trip has been recorded.
+
+        The electric mileage is the mean of the trips, weighted by their distance; the detailed
+        consumption, levels and advice are only part of the daily driving analysis.
+        """
+        trips = _as_list((day.get("PriceSimulatorDetailInfoTripList") or {}).get("PriceSimulatorDetailInfoTrip"))
+        weighted = [
+            (mileage, distance)
+            for trip in trips
+            if (mileage := _as_float(trip.get("ElectricMileage"))) is not None
+            and (distance := _as_float(trip.get("TravelDistance")))
+        ]
+        if not weighted:
+            return None
+
+        return cls(
+            target_date=day["TargetDate"],
+            display_date=day.get("DisplayDate", day["TargetDate"]),
+            electric_mileage=round(
+                sum(mileage * distance for mileage, distance in weighted) / sum(distance for _, distance in weighted), 1
+            ),
+            electric_mileage_level=None,
+            electric_cost_scale=electric_cost_scale,
+            power_consumption_moter=None,
+            power_consumption_moter_level=None,
+            power_consumption_minus=None,
+            power_consumption_minus_level=None,
+            power_consumption_aux=None,
+            power_consumption_aux_level=None,
+            advice_title=None,
+            advice_body=None,
+        )
+
+
+def driving_analyses_from_simulation(response: CarwingsElectricRateSimulationResponse) -> list[DrivingAnalysis]:
+    """Convert the days (with trips) of a pycarwings3 electric rate simulation response."""
+    return [
+        analysis
+        for day in _as_list(response.travellist)
+        if (analysis := DrivingAnalysis.from_simulation_day(day, response.electric_cost_scale)) is not None
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class AuthState:
+    """State of an authenticated Carwings session, persisted so that it can be reused after a restart."""
+
+    # the account and region the session belongs to
+    username: str
+    region: str
+    custom_sessionid: str
+    gdc_user_id: str | None
+    dcm_id: str | None
+    tz: str | None
+    language: str | None
+    vin: str
+    nickname: str | None
+    bound_time: str | None
+    # time of the login (UTC)
+    logged_in_at: datetime
+
+    @classmethod
+    def from_session(cls, session: Session, logged_in_at: datetime) -> AuthState:
+        """Capture the state of a logged in pycarwings3 session."""
+        return cls(
+            username=session.username,
+            region=session.region_code,
+            custom_sessionid=session.custom_sessionid,
+            gdc_user_id=session.gdc_user_id,
+            dcm_id=session.dcm_id,
+            tz=session.tz,
+            language=session.language,
+            vin=session.leaf.vin,
+            nickname=session.leaf.nickname,
+            bound_time=session.leaf.bound_time,
+            logged_in_at=logged_in_at,
+        )
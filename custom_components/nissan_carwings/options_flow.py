@@ -9,11 +9,21 @@ from homeassistant import config_entries
 from homeassistant.helpers import config_validation as cv
 
 from custom_components.nissan_carwings.const import (
+    DEFAULT_BUDGET_PER_DAY,
+    DEFAULT_BUDGET_PER_HOUR,
+    DEFAULT_COMMAND_WINDOW,
+    DEFAULT_MAX_STALENESS,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_POLL_INTERVAL_CHARGING,
+    DEFAULT_UNIFIED_REFRESH,
     DEFAULT_UPDATE_INTERVAL,
+    OPTIONS_BUDGET_PER_DAY,
+    OPTIONS_BUDGET_PER_HOUR,
+    OPTIONS_COMMAND_WINDOW,
+    OPTIONS_MAX_STALENESS,
     OPTIONS_POLL_INTERVAL,
     OPTIONS_POLL_INTERVAL_CHARGING,
+    OPTIONS_UNIFIED_REFRESH,
     OPTIONS_UPDATE_INTERVAL,
 )
 
@@ -51,6 +61,26 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             OPTIONS_POLL_INTERVAL_CHARGING, DEFAULT_POLL_INTERVAL_CHARGING
                         ),
                     ): cv.positive_int,
+                    vol.Required(
+                        OPTIONS_BUDGET_PER_DAY,
+                        default=self.config_entry.options.get(OPTIONS_BUDGET_PER_DAY, DEFAULT_BUDGET_PER_DAY),
+                    ): cv.positive_int,
+                    vol.Required(
+                        OPTIONS_BUDGET_PER_HOUR,
+                        default=self.config_entry.options.get(OPTIONS_BUDGET_PER_HOUR, DEFAULT_BUDGET_PER_HOUR),
+                    ): cv.positive_int,
+                    vol.Required(
+                        OPTIONS_MAX_STALENESS,
+                        default=self.config_entry.options.get(OPTIONS_MAX_STALENESS, DEFAULT_MAX_STALENESS),
+                    ): cv.positive_int,
+                    vol.Required(
+                        OPTIONS_COMMAND_WINDOW,
+                        default=self.config_entry.options.get(OPTIONS_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW),
+                    ): cv.positive_float,
+                    vol.Required(
+                        OPTIONS_UNIFIED_REFRESH,
+                        default=self.config_entry.options.get(OPTIONS_UNIFIED_REFRESH, DEFAULT_UNIFIED_REFRESH),
+                    ): cv.boolean,
                 }
             ),
         )
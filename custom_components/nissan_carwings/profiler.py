@@ -0,0 +1,186 @@
+"""Profiling of a full nissan_carwings refresh cycle (profile service)."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import contextlib
+import pstats
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, LOGGER, PROFILE_LOOP_LAG_INTERVAL
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import NissanCarwingsConfigEntry
+
+# time spent by the event loop waiting for I/O (the loop is idle, e.g. waiting for the Nissan servers)
+CATEGORY_NETWORK_WAIT = "network_wait"
+CATEGORY_PYCARWINGS3 = "pycarwings3"
+# aiohttp and the JSON decoding of the responses
+CATEGORY_HTTP_CLIENT = "http_client"
+CATEGORY_COORDINATOR = "coordinator"
+CATEGORY_STATE_WRITES = "entity_state_writes"
+CATEGORY_OTHER = "other"
+
+# built-in functions the event loop waits for I/O in (epoll, kqueue, select)
+_IO_WAIT_FUNCTIONS = ("<method 'poll' of 'select.", "<method 'control' of 'select.", "<built-in method select.")
+_INTEGRATION_DIR = str(Path(__file__).parent)
+# modules of the integration deriving and writing the entity states
+_ENTITY_MODULES = ("entity.py", "sensor.py", "binary_sensor.py", "switch.py", "button.py", "values.py")
+_HTTP_CLIENT_PACKAGES = ("/aiohttp/", "/yarl/", "/multidict/", "/json/", "/ssl.py")
+_STATE_WRITE_MODULES = ("/homeassistant/helpers/entity.py", "/homeassistant/core.py")
+_COORDINATOR_MODULES = ("/homeassistant/helpers/update_coordinator.py",)
+
+
+def _category(filename: str, function: str) -> str:
+    """Return the category of a profiled function."""
+    if filename == "~":
+        return CATEGORY_NETWORK_WAIT if function.startswith(_IO_WAIT_FUNCTIONS) else CATEGORY_OTHER
+    if filename.startswith(_INTEGRATION_DIR):
+        return CATEGORY_STATE_WRITES if filename.endswith(_ENTITY_MODULES) else CATEGORY_COORDINATOR
+    if "/pycarwings3/" in filename:
+        return CATEGORY_PYCARWINGS3
+    if any(package in filename for package in _HTTP_CLIENT_PACKAGES):
+        return CATEGORY_HTTP_CLIENT
+    if filename.endswith(_STATE_WRITE_MODULES):
+        return CATEGORY_STATE_WRITES
+    if filename.endswith(_COORDINATOR_MODULES):
+        return CATEGORY_COORDINATOR
+    return CATEGORY_OTHER
+
+
+def _analyze(
+    profiler: cProfile.Profile, top: int, profile_file: str | None
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Return the time spent per category (ranked) and the top functions by their own time.
+
+    Also writes the profile to profile_file, if given. Runs in the executor: the profile covers
+    everything run on the event loop meanwhile, its analysis may take a while.
+    """
+    stats = pstats.Stats(profiler)
+    if profile_file is not None:
+        stats.dump_stats(profile_file)
+
+    totals: dict[str, float] = {}
+    functions = []
+    # the pstats entries map (file, line, function) to (primitive calls, calls, own time, cumulative time, callers)
+    for (filename, line, function), (_, calls, own_time, cumulative_time, _) in stats.stats.items():  # type: ignore[attr-defined]
+        category = _category(filename, function)
+        totals[category] = totals.get(category, 0.0) + own_time
+        functions.append((own_time, cumulative_time, calls, f"{filename}:{line}({function})", category))
+
+    total = sum(totals.values()) or 1.0
+    breakdown = [
+        {"category": category, "seconds": round(seconds, 4), "share": round(seconds / total, 3)}
+        for category, seconds in sorted(totals.items(), key=lambda item: -item[1])
+    ]
+    top_functions = [
+        {
+            "function": name,
+            "category": category,
+            "calls": calls,
+            "own_seconds": round(own_time, 4),
+            "cumulative_seconds": round(cumulative_time, 4),
+        }
+        for own_time, cumulative_time, calls, name, category in sorted(functions, reverse=True)[:top]
+    ]
+    return breakdown, top_functions
+
+
+async def _async_timed(awaitable: Awaitable[Any]) -> float:
+    """Await and return the elapsed (wall) time, in seconds."""
+    start = time.monotonic()
+    await awaitable
+    return time.monotonic() - start
+
+
+async def _async_sample_loop_lag(lags: list[float]) -> None:
+    """Sample how late the event loop wakes up a sleeping task, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(PROFILE_LOOP_LAG_INTERVAL)
+        lags.append(max(loop.time() - start - PROFILE_LOOP_LAG_INTERVAL, 0.0))
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant, entry: NissanCarwingsConfigEntry, *, top: int, save_profile: bool
+) -> dict[str, Any]:
+    """
+    Run a full refresh cycle (battery, climate, driving analysis) under cProfile.
+
+    Returns the time spent per category, the wall time of each refresh task, the event loop
+    lag measured meanwhile and the top functions; optionally the profile is written to a
+    .prof file in the config directory (e.g. for snakeviz). Everything running on the event
+    loop during the refresh is profiled, including other integrations.
+    """
+    runtime_data = entry.runtime_data
+    # with the unified refresh, the battery coordinator also fetches the climate and driving analysis data
+    coordinators = (
+        {"battery": runtime_data.coordinator}
+        if runtime_data.coordinator.is_unified_refresh
+        else {
+            "battery": runtime_data.coordinator,
+            "climate": runtime_data.climate_coordinator,
+            "driving_analysis": runtime_data.driving_analysis_coordinator,
+        }
+    )
+
+    lags: list[float] = []
+    lag_task = hass.async_create_background_task(_async_sample_loop_lag(lags), f"{DOMAIN} profile loop lag")
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as exception:
+        # e.g. the profiler integration is running
+        lag_task.cancel()
+        msg = f"Profiling not possible: {exception}"
+        raise HomeAssistantError(msg) from exception
+
+    start = time.monotonic()
+    try:
+        durations = await asyncio.gather(
+            *(_async_timed(coordinator.async_refresh()) for coordinator in coordinators.values())
+        )
+    finally:
+        profiler.disable()
+        duration = time.monotonic() - start
+        lag_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await lag_task
+
+    profile_file = (
+        hass.config.path(f"{DOMAIN}_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}.prof") if save_profile else None
+    )
+    breakdown, top_functions = await hass.async_add_executor_job(_analyze, profiler, top, profile_file)
+    if profile_file is not None:
+        LOGGER.info("Profile of the refresh cycle written to %s", profile_file)
+
+    return {
+        "duration_seconds": round(duration, 3),
+        "breakdown": breakdown,
+        "tasks": {
+            name: {
+                "duration_seconds": round(task_duration, 3),
+                "last_update_success": coordinator.last_update_success,
+            }
+            for (name, coordinator), task_duration in zip(coordinators.items(), durations, strict=True)
+        },
+        "loop_lag": {
+            "samples": len(lags),
+            "max_ms": round(max(lags, default=0.0) * 1000, 1),
+            "mean_ms": round(sum(lags) / len(lags) * 1000, 1) if lags else 0.0,
+        },
+        "top_functions": top_functions,
+        "profile_file": profile_file,
+    }
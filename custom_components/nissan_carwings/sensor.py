@@ -2,23 +2,22 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.components.sensor.const import SensorDeviceClass
-from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfLength
-from homeassistant.helpers.icon import icon_for_battery_level
-from homeassistant.util.unit_conversion import DistanceConverter
-from homeassistant.util.unit_system import US_CUSTOMARY_SYSTEM
-import pycarwings3
-import pycarwings3.responses
+from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfEnergy, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_time_interval
 
 from custom_components.nissan_carwings.const import (
-    DATA_BATTERY_STATUS_KEY,
-    DATA_CLIMATE_STATUS_KEY,
-    DATA_DRIVING_ANALYSIS_KEY,
+    API_OPERATIONS_WITH_SENSOR,
     DATA_TIMESTAMP_KEY,
+    DIAGNOSTIC_STATE_WRITE_COOLDOWN,
+    LOGGER,
+    SOC_ESTIMATE_UPDATE_INTERVAL,
 )
 from custom_components.nissan_carwings.coordinator import (
     CarwingsClimateDataUpdateCoordinator,
@@ -33,6 +32,7 @@ if TYPE_CHECKING:
 
     from .coordinator import CarwingsDataUpdateCoordinator
     from .data import NissanCarwingsConfigEntry
+    from .estimator import SocEstimate, SocSample
 
 
 async def async_setup_entry(
@@ -48,9 +48,17 @@ async def async_setup_entry(
             RemainingRangeSensor(coordinator=coordinator, is_ac_on=True),
             RemainingRangeSensor(coordinator=coordinator, is_ac_on=False),
             BatteryCapacitySensor(coordinator=coordinator),
+            EstimatedBatterySensor(coordinator=coordinator),
+            EstimatedBatteryEnergySensor(coordinator=coordinator),
+            ChargingEnergySensor(coordinator=coordinator),
             DrivingAnalysisSensor(coordinator=entry.runtime_data.driving_analysis_coordinator),
             LastBatteryStatusUpdateSensor(coordinator=coordinator),
             HVACTimerSensor(coordinator=entry.runtime_data.climate_coordinator),
+            RequestBudgetSensor(coordinator=coordinator),
+            *(
+                ApiLatencySensor(coordinator=coordinator, operation=operation)
+                for operation in API_OPERATIONS_WITH_SENSOR
+            ),
         ]
     )
 
@@ -59,6 +67,7 @@ class BatterySensor(NissanCarwingsEntity, SensorEntity):
     """Battery Sensor."""
 
     _attr_translation_key = "battery_soc"
+    coordinator: CarwingsDataUpdateCoordinator
 
     def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
         """Initialize the sensor class."""
@@ -72,32 +81,21 @@ class BatterySensor(NissanCarwingsEntity, SensorEntity):
         self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
 
     @property
-    def native_value(self) -> str | None:
+    def native_value(self) -> int | None:
         """Return the native value of the sensor."""
-
-        if self.coordinator.data[DATA_BATTERY_STATUS_KEY] is None:
-            return None
-
-        # 0% SOC is not a valid value
-        if self.coordinator.data[DATA_BATTERY_STATUS_KEY].battery_percent == 0:
-            return None
-
-        return round(self.coordinator.data[DATA_BATTERY_STATUS_KEY].battery_percent)
+        return self.coordinator.values.soc
 
     @property
     def icon(self) -> str:
         """Battery state icon handling."""
-        charging = (
-            self.coordinator.data[DATA_BATTERY_STATUS_KEY].is_charging
-            if self.coordinator.data[DATA_BATTERY_STATUS_KEY] is not None
-            else None
-        )
-        return icon_for_battery_level(battery_level=self.state, charging=charging)
+        return self.coordinator.values.icon
 
 
 class RemainingRangeSensor(NissanCarwingsEntity, SensorEntity):
     """Remaining Range Sensor."""
 
+    coordinator: CarwingsDataUpdateCoordinator
+
     def __init__(self, coordinator: CarwingsDataUpdateCoordinator, *, is_ac_on: bool) -> None:
         """Initialize the sensor class."""
         super().__init__(coordinator)
@@ -113,41 +111,22 @@ class RemainingRangeSensor(NissanCarwingsEntity, SensorEntity):
         self._attr_icon = "mdi:speedometer"
 
     @property
-    def native_value(self) -> float | None:
+    def native_value(self) -> int | None:
         """Battery range in miles or kms."""
-        data: pycarwings3.responses.CarwingsLatestBatteryStatusResponse | None = self.coordinator.data[
-            DATA_BATTERY_STATUS_KEY
-        ]
-
-        if data is None:
-            return None
-
-        ret: float | None
-        if self._ac_on:
-            ret = data.cruising_range_ac_on_km
-        else:
-            ret = data.cruising_range_ac_off_km
-
-        if ret is None:
-            return None
-
-        if self.hass.config.units is US_CUSTOMARY_SYSTEM:
-            ret = DistanceConverter.convert(ret, UnitOfLength.KILOMETERS, UnitOfLength.MILES)
-
-        return round(ret)
+        values = self.coordinator.values
+        return values.range_ac_on if self._ac_on else values.range_ac_off
 
     @property
     def native_unit_of_measurement(self) -> str:
         """Battery range unit."""
-        if self.hass.config.units is US_CUSTOMARY_SYSTEM:
-            return UnitOfLength.MILES
-        return UnitOfLength.KILOMETERS
+        return self.coordinator.values.range_unit
 
 
 class BatteryCapacitySensor(NissanCarwingsEntity, SensorEntity):
     """Current Battery Capacity Sensor."""
 
     _attr_translation_key = "battery_capacity"
+    coordinator: CarwingsDataUpdateCoordinator
 
     def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
         """Initialize the sensor class."""
@@ -164,17 +143,153 @@ class BatteryCapacitySensor(NissanCarwingsEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
+        return self.coordinator.values.capacity_wh
 
-        if self.coordinator.data[DATA_BATTERY_STATUS_KEY] is None:
-            return None
 
-        return float(self.coordinator.data[DATA_BATTERY_STATUS_KEY].battery_remaining_amount_wh)
+class EstimatedSocSensorBase(NissanCarwingsEntity, SensorEntity):
+    """Base class for the sensors interpolating the battery state while charging."""
+
+    coordinator: CarwingsDataUpdateCoordinator
+
+    # the sample the estimate is based on and the time it is evaluated at: the estimate (and its
+    # confidence, decaying with the age) only changes with a new sample and on the interval while charging
+    _estimated_sample: SocSample | None = None
+    _estimated_at: datetime | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Update the estimate periodically between the coordinator updates."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._handle_estimate_interval, timedelta(seconds=SOC_ESTIMATE_UPDATE_INTERVAL)
+            )
+        )
+
+    @callback
+    def _handle_estimate_interval(self, now: datetime) -> None:
+        """Write the interpolated state while charging."""
+        if self.coordinator.soc_estimator.is_charging:
+            self._estimated_at = now
+            self.async_write_ha_state()
+
+    @property
+    def estimate(self) -> SocEstimate | None:
+        """Return the estimate, as of the latest sample or estimate interval."""
+        soc_estimator = self.coordinator.soc_estimator
+        if self._estimated_at is None or soc_estimator.sample is not self._estimated_sample:
+            self._estimated_sample = soc_estimator.sample
+            self._estimated_at = datetime.now(UTC)
+        return soc_estimator.estimate(self._estimated_at)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the sample the estimate is based on and its confidence."""
+        estimate = self.estimate
+        if estimate is None:
+            return {"VIN": self.coordinator.config_entry.data["vin"], **self.staleness_attributes}
+
+        return {
+            "VIN": self.coordinator.config_entry.data["vin"],
+            "timestamp": self.coordinator.soc_estimator.sample.timestamp,
+            "confidence": estimate.confidence,
+            "charge_rate": round(estimate.charge_rate, 1) if estimate.charge_rate is not None else None,
+            "interpolated": estimate.is_interpolated,
+            **self.staleness_attributes,
+        }
+
+
+class EstimatedBatterySensor(EstimatedSocSensorBase):
+    """Estimated (interpolated) Battery Sensor."""
+
+    _attr_translation_key = "battery_soc_estimated"
+
+    def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = SensorEntityDescription(
+            key="battery_soc_estimated",
+            name="Estimated Battery",
+            device_class=SensorDeviceClass.BATTERY,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=PERCENTAGE,
+            suggested_display_precision=0,
+        )
+        self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value of the sensor."""
+        estimate = self.estimate
+        return round(estimate.soc, 1) if estimate is not None else None
+
+
+class EstimatedBatteryEnergySensor(EstimatedSocSensorBase):
+    """Estimated (interpolated) Battery Energy Sensor."""
+
+    _attr_translation_key = "battery_energy_estimated"
+
+    def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = SensorEntityDescription(
+            key="battery_energy_estimated",
+            name="Estimated Battery Energy",
+            device_class=SensorDeviceClass.ENERGY_STORAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            entity_registry_enabled_default=False,  # Sensor not enabled by default
+        )
+        self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the native value of the sensor."""
+        estimate = self.estimate
+        return round(estimate.energy_wh) if estimate is not None and estimate.energy_wh is not None else None
+
+
+class ChargingEnergySensor(NissanCarwingsEntity, SensorEntity):
+    """Energy added by all charging sessions (for the Energy dashboard)."""
+
+    _attr_translation_key = "charging_energy"
+    coordinator: CarwingsDataUpdateCoordinator
+
+    def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = SensorEntityDescription(
+            key="charging_energy",
+            name="Charged Energy",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            suggested_display_precision=1,
+        )
+        self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float:
+        """Return the energy added by all charging sessions, including the active one."""
+        return round(self.coordinator.charging_sessions.total_energy_wh / 1000, 3)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the active (or else the latest) charging session."""
+        charging_sessions = self.coordinator.charging_sessions
+        session = charging_sessions.active or next(iter(charging_sessions.recent(1)), None)
+        return {
+            "VIN": self.coordinator.config_entry.data["vin"],
+            "charging": charging_sessions.active is not None,
+            **({"session": session.as_dict()} if session is not None else {}),
+            **self.staleness_attributes,
+        }
 
 
 class DrivingAnalysisSensor(NissanCarwingsEntity, SensorEntity):
     """Driving Analysis Sensor."""
 
     _attr_translation_key = "electric_mileage"
+    coordinator: CarwingsDrivingAnalysisDataUpdateCoordinator
 
     def __init__(self, coordinator: CarwingsDrivingAnalysisDataUpdateCoordinator) -> None:
         """Initialize the sensor class."""
@@ -192,35 +307,15 @@ class DrivingAnalysisSensor(NissanCarwingsEntity, SensorEntity):
     @property
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
-
-        if self.coordinator.data[DATA_DRIVING_ANALYSIS_KEY] is None:
-            return None
-
-        da: pycarwings3.responses.CarwingsDrivingAnalysisResponse = self.coordinator.data[DATA_DRIVING_ANALYSIS_KEY]
-        return float(da.electric_mileage)
+        return self.coordinator.values.electric_mileage
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return default attributes for Nissan leaf entities."""
-
-        if self.coordinator.data[DATA_DRIVING_ANALYSIS_KEY] is None:
-            return {
-                "VIN": self.coordinator.config_entry.data["vin"],
-            }
-
-        # flatten the advice property
-        try:
-            driving_analysis: dict[str, Any] = self.coordinator.data[DATA_DRIVING_ANALYSIS_KEY].__dict__
-            first_advice = driving_analysis["advice"][0]
-            driving_analysis["advice_title"] = first_advice["title"]
-            driving_analysis["advice_body"] = first_advice["body"]
-            del driving_analysis["advice"]
-        except (KeyError, IndexError):
-            driving_analysis = self.coordinator.data[DATA_DRIVING_ANALYSIS_KEY].__dict__
-
         return {
             "VIN": self.coordinator.config_entry.data["vin"],
-            **driving_analysis,
+            **self.coordinator.values.attributes,
+            **self.staleness_attributes,
         }
 
 
@@ -272,32 +367,133 @@ class HVACTimerSensor(NissanCarwingsEntity, SensorEntity):
         """Sensor availability."""
         if super().available is False:
             return False
-        if DATA_CLIMATE_STATUS_KEY not in self.coordinator.data:
-            return False
-
-        climate: pycarwings3.responses.CarwingsLatestClimateControlStatusResponse = self.coordinator.data[
-            DATA_CLIMATE_STATUS_KEY
-        ]
 
         return (
-            climate is not None
+            self.coordinator.values.has_duration
             and self.coordinator.is_hvac_running
             and not self.coordinator.is_climate_pending_state_active
-            and climate.ac_duration is not None
         )
 
     @property
     def native_value(self) -> datetime | None:
         """Return the native value of the sensor."""
+        return self.coordinator.values.hvac_end_time
 
-        if self.coordinator.data[DATA_CLIMATE_STATUS_KEY] is None:
-            return None
 
-        if DATA_CLIMATE_STATUS_KEY not in self.coordinator.data:
-            return None
-        climate: pycarwings3.responses.CarwingsLatestClimateControlStatusResponse = self.coordinator.data[
-            DATA_CLIMATE_STATUS_KEY
-        ]
-        if climate.ac_start_stop_date_and_time is None or climate.ac_duration is None:
-            return None
-        return climate.ac_start_stop_date_and_time + climate.ac_duration
+class ClientDiagnosticSensorBase(NissanCarwingsEntity, SensorEntity):
+    """Base class for the diagnostic sensors updated by the API client, in between the coordinator updates."""
+
+    _write_debouncer: Debouncer
+
+    async def async_added_to_hass(self) -> None:
+        """Set up the debouncer of the state writes."""
+        await super().async_added_to_hass()
+        self._write_debouncer = Debouncer(
+            self.hass,
+            LOGGER,
+            cooldown=DIAGNOSTIC_STATE_WRITE_COOLDOWN,
+            immediate=True,
+            function=self.async_write_ha_state,
+        )
+        self.async_on_remove(self._write_debouncer.async_cancel)
+
+    @property
+    def available(self) -> bool:
+        """Return True, the state comes from the API client (which is there also while the refreshes fail)."""
+        return True
+
+    @callback
+    def _async_write_ha_state_debounced(self) -> None:
+        """Write the state, at most once per DIAGNOSTIC_STATE_WRITE_COOLDOWN (each write is recorded)."""
+        self._write_debouncer.async_schedule_call()
+
+
+class ApiLatencySensor(ClientDiagnosticSensorBase):
+    """Median Latency of an API Operation (diagnostic)."""
+
+    _attr_translation_key = "api_latency"
+
+    def __init__(self, coordinator: CarwingsDataUpdateCoordinator, operation: str) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self._operation = operation
+        self.entity_description = SensorEntityDescription(
+            key=f"api_latency_{operation}",
+            name=f"API latency ({operation})",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,  # Sensor not enabled by default
+            icon="mdi:timer-sand",
+            suggested_display_precision=0,
+        )
+        self._attr_translation_placeholders = {"operation": operation}
+        self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after each call of the operation."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.config_entry.runtime_data.client.metrics.add_listener(self._handle_operation_recorded)
+        )
+
+    @callback
+    def _handle_operation_recorded(self, operation: str) -> None:
+        """Handle a finished API call."""
+        if operation == self._operation:
+            self._async_write_ha_state_debounced()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median latency, in milliseconds."""
+        p50 = self.coordinator.config_entry.runtime_data.client.metrics.get(self._operation).percentile(50)
+        return None if p50 is None else p50 * 1000
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the call and error counts, the latency percentiles and histogram."""
+        return {
+            "VIN": self.coordinator.config_entry.data["vin"],
+            **self.coordinator.config_entry.runtime_data.client.metrics.get(self._operation).as_dict(),
+        }
+
+
+class RequestBudgetSensor(ClientDiagnosticSensorBase):
+    """API Requests made within the last 24 hours (diagnostic)."""
+
+    _attr_translation_key = "request_budget"
+
+    def __init__(self, coordinator: CarwingsDataUpdateCoordinator) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+        self.entity_description = SensorEntityDescription(
+            key="request_budget",
+            name="API requests (24h)",
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="requests",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,  # Sensor not enabled by default
+            icon="mdi:counter",
+        )
+        self._attr_unique_id = f"{self.unique_id_prefix}_{self.entity_description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after each change of the budget usage."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.config_entry.runtime_data.client.budget.add_listener(self._async_write_ha_state_debounced)
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of requests made within the last 24 hours."""
+        return self.coordinator.config_entry.runtime_data.client.budget.as_dict()["used_last_day"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the budget limits, the hourly usage, refused requests and the current interval stretch factor."""
+        return {
+            "VIN": self.coordinator.config_entry.data["vin"],
+            **self.coordinator.config_entry.runtime_data.client.budget.as_dict(),
+        }
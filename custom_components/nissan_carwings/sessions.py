@@ -0,0 +1,139 @@
+"""Charging sessions of nissan_carwings, derived from the battery samples."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from .const import CHARGING_SESSIONS_MAX
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from .history import BatterySample
+
+
+@dataclass(frozen=True, slots=True)
+class ChargingSession:
+    """A charging session, from the plugged-in (or first charging) sample to the first non-charging sample."""
+
+    start: datetime
+    # time of the latest sample while the session is active
+    end: datetime
+    start_soc: float
+    end_soc: float
+    energy_added_wh: float
+
+    @property
+    def duration(self) -> timedelta:
+        """Return the duration of the session."""
+        return self.end - self.start
+
+    @property
+    def average_power_kw(self) -> float | None:
+        """Return the average charging power, None if the duration is unknown."""
+        hours = self.duration.total_seconds() / 3600
+        return self.energy_added_wh / 1000 / hours if hours > 0 else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session as a (JSON serializable) dict."""
+        average_power_kw = self.average_power_kw
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "duration_minutes": round(self.duration.total_seconds() / 60),
+            "start_soc": self.start_soc,
+            "end_soc": self.end_soc,
+            "energy_added_kwh": round(self.energy_added_wh / 1000, 3),
+            "average_power_kw": round(average_power_kw, 2) if average_power_kw is not None else None,
+        }
+
+
+def _energy_added_wh(previous: BatterySample | None, sample: BatterySample) -> float:
+    """Return the energy added between two samples (0 if it has dropped or is unknown), in Wh."""
+    if previous is None or previous.energy_wh is None or sample.energy_wh is None:
+        return 0.0
+    return max(sample.energy_wh - previous.energy_wh, 0.0)
+
+
+class ChargingSessionTracker:
+    """
+    Detect charging sessions from the battery samples, incrementally (O(1) per sample).
+
+    The energy added is summed up from the positive deltas of the remaining energy between
+    successive samples of a session; a session detected after the car has been plugged in starts
+    at that (non-charging) sample. Finished sessions are kept up to CHARGING_SESSIONS_MAX.
+    """
+
+    def __init__(self, maxlen: int = CHARGING_SESSIONS_MAX) -> None:
+        """Initialize."""
+        self.sessions: deque[ChargingSession] = deque(maxlen=maxlen)
+        self.active: ChargingSession | None = None
+        # energy added by all sessions ever tracked (including the active one), in Wh
+        self.total_energy_wh = 0.0
+        self._last_sample: BatterySample | None = None
+
+    def add_sample(self, sample: BatterySample) -> bool:
+        """Add a battery sample, returns True if the sessions have changed."""
+        previous = self._last_sample
+        if previous is not None and sample.timestamp <= previous.timestamp:
+            return False
+        self._last_sample = sample
+
+        active = self.active
+        if active is None:
+            if not sample.is_charging:
+                return False
+            start = sample
+            energy_added_wh = 0.0
+            if previous is not None and previous.is_connected and (delta := _energy_added_wh(previous, sample)) > 0:
+                # plugged in at the previous sample, the charging has started in between (idle polls are hours apart)
+                start = previous
+                energy_added_wh = delta
+            self.total_energy_wh += energy_added_wh
+            self.active = ChargingSession(
+                start=start.timestamp,
+                end=sample.timestamp,
+                start_soc=start.soc,
+                end_soc=sample.soc,
+                energy_added_wh=energy_added_wh,
+            )
+            return True
+
+        energy_added_wh = _energy_added_wh(previous, sample)
+        self.total_energy_wh += energy_added_wh
+        active = replace(
+            active,
+            end=sample.timestamp,
+            end_soc=sample.soc,
+            energy_added_wh=active.energy_added_wh + energy_added_wh,
+        )
+
+        if sample.is_charging:
+            self.active = active
+        else:
+            # the charging has ended between the previous and this sample
+            self.sessions.append(active)
+            self.active = None
+        return True
+
+    def recent(self, limit: int) -> list[ChargingSession]:
+        """Return up to limit finished sessions, the most recent first."""
+        return [self.sessions[-index] for index in range(1, min(limit, len(self.sessions)) + 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the tracker, to be persisted."""
+        return {
+            "sessions": list(self.sessions),
+            "active": self.active,
+            "last_sample": self._last_sample,
+            "total_energy_wh": self.total_energy_wh,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the state persisted by as_dict()."""
+        self.sessions.extend(data["sessions"])
+        self.active = data["active"]
+        self._last_sample = data["last_sample"]
+        self.total_energy_wh = data["total_energy_wh"]
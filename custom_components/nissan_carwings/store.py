@@ -0,0 +1,109 @@
+"""Persistent storage of the latest coordinator data (and the login session) for nissan_carwings."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .history import BatterySample
+from .models import AuthState, BatteryState, ClimateState, DrivingAnalysis
+from .sessions import ChargingSession
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# model classes which can be part of a snapshot
+_MODEL_CLASSES: dict[str, type] = {
+    cls.__name__: cls
+    for cls in (BatteryState, ClimateState, DrivingAnalysis, BatterySample, ChargingSession, AuthState)
+}
+
+_TYPE_KEY = "__type__"
+_VALUE_KEY = "value"
+
+
+def _encode(value: Any) -> Any:
+    """Encode a value (coordinator data) into a JSON serializable structure."""
+    if isinstance(value, datetime):
+        return {_TYPE_KEY: "datetime", _VALUE_KEY: value.isoformat()}
+    if isinstance(value, timedelta):
+        return {_TYPE_KEY: "timedelta", _VALUE_KEY: value.total_seconds()}
+    if type(value).__name__ in _MODEL_CLASSES:
+        return {
+            _TYPE_KEY: type(value).__name__,
+            _VALUE_KEY: {field.name: _encode(getattr(value, field.name)) for field in fields(value)},
+        }
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Decode a structure created by _encode()."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if _TYPE_KEY not in value:
+        return {key: _decode(item) for key, item in value.items()}
+
+    value_type = value[_TYPE_KEY]
+    if value_type == "datetime":
+        return datetime.fromisoformat(value[_VALUE_KEY])
+    if value_type == "timedelta":
+        return timedelta(seconds=value[_VALUE_KEY])
+
+    return _MODEL_CLASSES[value_type](**_decode(value[_VALUE_KEY]))
+
+
+class _SnapshotStore(Store[dict[str, Any]]):
+    """Store which drops snapshots of older versions."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,  # noqa: ARG002
+        old_minor_version: int,  # noqa: ARG002
+        old_data: dict[str, Any],  # noqa: ARG002
+    ) -> dict[str, Any]:
+        """Drop the old snapshots, they are refreshed from the API anyway."""
+        return {}
+
+
+class NissanCarwingsSnapshotStore:
+    """Persist the latest data of each coordinator, so that entities have a state right after startup."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+        self._store = _SnapshotStore(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+        self._snapshots: dict[str, Any] = {}
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the persisted snapshots, keyed by the coordinator data key."""
+        stored = await self._store.async_load()
+        if not stored:
+            return {}
+
+        try:
+            self._snapshots = stored
+            return {key: _decode(snapshot) for key, snapshot in stored.items()}
+        except (KeyError, TypeError, ValueError) as exception:
+            LOGGER.warning("Ignoring invalid snapshot data: %s", exception)
+            self._snapshots = {}
+            return {}
+
+    @callback
+    def async_save_snapshot(self, key: str, data: dict[str, Any]) -> None:
+        """Schedule saving the latest data of a coordinator (writes are coalesced)."""
+        self._snapshots[key] = _encode(data)
+        self._store.async_delay_save(lambda: self._snapshots, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted snapshots."""
+        await self._store.async_remove()
@@ -48,14 +48,10 @@ class ClimateControlSwitch(NissanCarwingsEntity, SwitchEntity):
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
-        client = self.coordinator.config_entry.runtime_data.client
-        await client.async_set_climate(switch_on=True)
-        self.coordinator.set_climate_pending_state(True)
+        await self.coordinator.async_set_climate(switch_on=True)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
-        client = self.coordinator.config_entry.runtime_data.client
-        await client.async_set_climate(switch_on=False)
-        self.coordinator.set_climate_pending_state(False)
+        await self.coordinator.async_set_climate(switch_on=False)
         self.async_write_ha_state()
@@ -0,0 +1,108 @@
+"""Entity values of nissan_carwings, derived once per coordinator update."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfLength
+from homeassistant.helpers.icon import icon_for_battery_level
+from homeassistant.util.unit_conversion import DistanceConverter
+
+from .const import DATA_BATTERY_STATUS_KEY, DATA_CLIMATE_STATUS_KEY, DATA_DRIVING_ANALYSIS_KEY
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .models import BatteryState, ClimateState, DrivingAnalysis
+
+
+def _convert_range(range_km: float | None, *, use_miles: bool) -> int | None:
+    """Return a range in the unit of the user's unit system, rounded."""
+    if range_km is None:
+        return None
+    if use_miles:
+        return round(DistanceConverter.convert(range_km, UnitOfLength.KILOMETERS, UnitOfLength.MILES))
+    return round(range_km)
+
+
+@dataclass(frozen=True, slots=True)
+class BatteryValues:
+    """Values of the battery status entities."""
+
+    soc: int | None
+    icon: str
+    range_ac_on: int | None
+    range_ac_off: int | None
+    range_unit: str
+    capacity_wh: float | None
+    is_charging: bool | None
+    is_connected: bool | None
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any] | None, *, use_miles: bool) -> BatteryValues:
+        """Derive the values from the battery coordinator data."""
+        battery_status: BatteryState | None = data.get(DATA_BATTERY_STATUS_KEY) if data is not None else None
+        range_unit = UnitOfLength.MILES if use_miles else UnitOfLength.KILOMETERS
+        if battery_status is None:
+            return cls(
+                soc=None,
+                icon=icon_for_battery_level(battery_level=None),
+                range_ac_on=None,
+                range_ac_off=None,
+                range_unit=range_unit,
+                capacity_wh=None,
+                is_charging=None,
+                is_connected=None,
+            )
+
+        # 0% SOC is not a valid value
+        soc = round(battery_status.battery_percent) if battery_status.battery_percent != 0 else None
+        is_charging = battery_status.is_charging
+        return cls(
+            soc=soc,
+            icon=icon_for_battery_level(battery_level=soc, charging=is_charging),
+            range_ac_on=_convert_range(battery_status.cruising_range_ac_on_km, use_miles=use_miles),
+            range_ac_off=_convert_range(battery_status.cruising_range_ac_off_km, use_miles=use_miles),
+            range_unit=range_unit,
+            capacity_wh=battery_status.battery_remaining_amount_wh,
+            is_charging=is_charging,
+            is_connected=battery_status.is_connected,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClimateValues:
+    """Values of the climate control entities."""
+
+    # end of the current (or last) climate control run, None if unknown
+    hvac_end_time: datetime | None
+    has_duration: bool
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any] | None) -> ClimateValues:
+        """Derive the values from the climate coordinator data."""
+        climate: ClimateState | None = data.get(DATA_CLIMATE_STATUS_KEY) if data is not None else None
+        if climate is None or climate.ac_duration is None:
+            return cls(hvac_end_time=None, has_duration=False)
+        if climate.ac_start_stop_date_and_time is None:
+            return cls(hvac_end_time=None, has_duration=True)
+        return cls(hvac_end_time=climate.ac_start_stop_date_and_time + climate.ac_duration, has_duration=True)
+
+
+@dataclass(frozen=True, slots=True)
+class DrivingAnalysisValues:
+    """Values of the driving analysis entities."""
+
+    electric_mileage: float | None
+    # all fields of the driving analysis
+    attributes: dict[str, Any]
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any] | None) -> DrivingAnalysisValues:
+        """Derive the values from the driving analysis coordinator data."""
+        driving_analysis: DrivingAnalysis | None = data.get(DATA_DRIVING_ANALYSIS_KEY) if data is not None else None
+        if driving_analysis is None:
+            return cls(electric_mileage=None, attributes={})
+
+        return cls(electric_mileage=driving_analysis.electric_mileage, attributes=asdict(driving_analysis))
@@ -0,0 +1,356 @@
+"""
+End-to-end latency benchmark for the nissan_carwings coordinators.
+
+Runs the battery, climate and driving analysis coordinators against the local Carwings
+mock server (see carwings_mock_server.py) and reports the refresh latency percentiles
+and the number of HTTP requests per refresh cycle.
+
+    python3 scripts/benchmark.py --cycles 50 --latency 0.2 --latency-jitter 0.3
+    python3 scripts/benchmark.py --cycles 10 --poll --result-delay 15
+    python3 scripts/benchmark.py --cycles 50 --unified
+
+With --cassette, the traffic recorded from a real account (see carwings_cassette.py)
+is replayed instead, with the recorded latencies scaled by --time-scale. Regressions
+are caught with --max-requests-per-cycle and --max-cycle-p95: the benchmark exits with
+status 1 when a limit is exceeded (or a request has no recorded response):
+
+    python3 scripts/benchmark.py --cassette battery.json.gz --time-scale 0 \
+        --max-requests-per-cycle 1
+    python3 scripts/benchmark.py --cassette climate.json.gz --climate \
+        --max-cycle-p95 2000
+"""
+
+# ruff: noqa: INP001, T201
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from carwings_cassette import CarwingsReplayServer, Cassette
+from carwings_mock_server import (
+    CarwingsMockServer,
+    MockServerConfig,
+    MockVehicle,
+)
+
+from custom_components.nissan_carwings.api import (
+    NissanCarwingsApiClient,
+    ResultPollingPolicy,
+)
+from custom_components.nissan_carwings.budget import NissanCarwingsRequestBudget
+from custom_components.nissan_carwings.const import (
+    CONF_PYCARWINGS3_BASE_URL,
+    DOMAIN,
+    OPTIONS_POLL_INTERVAL,
+    OPTIONS_UNIFIED_REFRESH,
+)
+from custom_components.nissan_carwings.coordinator import (
+    CarwingsClimateDataUpdateCoordinator,
+    CarwingsDataUpdateCoordinator,
+    CarwingsDrivingAnalysisDataUpdateCoordinator,
+)
+from custom_components.nissan_carwings.data import (
+    NissanCarwingsClimatePendingState,
+    NissanCarwingsData,
+)
+from custom_components.nissan_carwings.store import (
+    NissanCarwingsSnapshotStore,
+)
+
+PERCENTILES = (50, 95, 99)
+
+# polling for the answer to climate commands, faster than in a real setup
+CLIMATE_RESULT_POLLING = ResultPollingPolicy(
+    first_delay=0.5, interval=0.5, max_interval=2, timeout=120
+)
+
+
+def percentiles(samples: list[float]) -> dict[int, float]:
+    """Return the p50/p95/p99 values of the samples."""
+    if len(samples) < 2:  # noqa: PLR2004
+        return dict.fromkeys(PERCENTILES, samples[0] if samples else 0.0)
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {p: quantiles[p - 1] for p in PERCENTILES}
+
+
+async def async_setup(
+    hass: HomeAssistant,
+    base_url: str,
+    session: aiohttp.ClientSession,
+    *,
+    poll: bool,
+    unified: bool,
+) -> Any:
+    """Set up a config entry with the runtime data, like async_setup_entry does."""
+    data = {
+        CONF_USERNAME: "benchmark@example.com",
+        CONF_PASSWORD: "secret",
+        CONF_REGION: "NE",
+        CONF_PYCARWINGS3_BASE_URL: base_url,
+        "vin": MockVehicle.vin,
+        "nickname": MockVehicle.nickname,
+    }
+    options: dict[str, Any] = {OPTIONS_UNIFIED_REFRESH: unified}
+    if poll:
+        # a poll interval of 1s triggers a request_update on each battery refresh
+        options[OPTIONS_POLL_INTERVAL] = 1
+    entry = ConfigEntry(
+        data=data,
+        domain=DOMAIN,
+        minor_version=1,
+        options=options,
+        source=SOURCE_USER,
+        title="benchmark",
+        unique_id=None,
+        version=1,
+    )
+    entry.runtime_data = NissanCarwingsData(
+        client=NissanCarwingsApiClient(
+            username=data[CONF_USERNAME],
+            password=data[CONF_PASSWORD],
+            region=data[CONF_REGION],
+            session=session,
+            base_url=base_url,
+            vin=data["vin"],
+            # the benchmark makes far more requests than a real setup would
+            budget=NissanCarwingsRequestBudget(per_day=0, per_hour=0),
+            climate_result_polling=CLIMATE_RESULT_POLLING,
+        ),
+        integration=None,
+        coordinator=CarwingsDataUpdateCoordinator(hass=hass, config_entry=entry),
+        climate_coordinator=CarwingsClimateDataUpdateCoordinator(
+            hass=hass, config_entry=entry
+        ),
+        climate_pending_state=NissanCarwingsClimatePendingState(),
+        driving_analysis_coordinator=CarwingsDrivingAnalysisDataUpdateCoordinator(
+            hass=hass, config_entry=entry
+        ),
+        snapshot_store=NissanCarwingsSnapshotStore(hass, entry.entry_id),
+    )
+    return entry
+
+
+async def async_climate_command(entry: Any) -> None:
+    """Switch the climate control on and wait for the answer of the car."""
+    client = entry.runtime_data.client
+    result_key = await client.async_set_climate(switch_on=True)
+    if result_key is None:
+        msg = "climate command not accepted"
+        raise RuntimeError(msg)
+    await client.async_get_climate_result(result_key, switch_on=True)
+
+
+async def async_run(args: argparse.Namespace) -> int:  # noqa: PLR0912, PLR0915
+    """Run the benchmark, returns the exit status."""
+    server: CarwingsMockServer | CarwingsReplayServer
+    if args.cassette:
+        server = CarwingsReplayServer(
+            Cassette.load(args.cassette), time_scale=args.time_scale, loop=True
+        )
+    else:
+        server = CarwingsMockServer(
+            MockServerConfig(
+                latency=args.latency,
+                latency_jitter=args.latency_jitter,
+                error_rate=args.error_rate,
+                result_delay=args.result_delay,
+            )
+        )
+    base_url = await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        async with aiohttp.ClientSession() as session:
+            entry = await async_setup(
+                hass, base_url, session, poll=args.poll, unified=args.unified
+            )
+            runtime_data = entry.runtime_data
+            # with the unified refresh, the battery coordinator fetches everything
+            coordinators = (
+                {"unified": runtime_data.coordinator}
+                if args.unified
+                else {
+                    "battery": runtime_data.coordinator,
+                    "climate": runtime_data.climate_coordinator,
+                    "driving_analysis": runtime_data.driving_analysis_coordinator,
+                }
+            )
+
+            # login outside of the measurement
+            await runtime_data.coordinator.async_refresh()
+
+            latencies: dict[str, list[float]] = {
+                name: []
+                for name in (
+                    *coordinators,
+                    *(("climate_command",) if args.climate else ()),
+                    "cycle",
+                )
+            }
+            requests_per_cycle: list[int] = []
+            requests_by_endpoint: Counter[str] = Counter()
+            failures: Counter[str] = Counter()
+
+            for _ in range(args.cycles):
+                server.reset_counters()
+                cycle_start = time.perf_counter()
+                for name, coordinator in coordinators.items():
+                    start = time.perf_counter()
+                    await coordinator.async_refresh()
+                    latencies[name].append(time.perf_counter() - start)
+                    if not coordinator.last_update_success:
+                        failures[name] += 1
+                if args.climate:
+                    start = time.perf_counter()
+                    try:
+                        await async_climate_command(entry)
+                    except Exception:  # noqa: BLE001
+                        failures["climate_command"] += 1
+                    latencies["climate_command"].append(time.perf_counter() - start)
+                latencies["cycle"].append(time.perf_counter() - cycle_start)
+                requests_per_cycle.append(server.total_requests)
+                requests_by_endpoint.update(server.request_counts)
+
+            for coordinator in coordinators.values():
+                await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    await server.stop()
+
+    source = (
+        f"cassette={args.cassette} (time scale {args.time_scale})"
+        if args.cassette
+        else f"latency={args.latency}s+{args.latency_jitter}s"
+    )
+    print(
+        f"{args.cycles} cycles, poll={args.poll}, unified={args.unified}, "
+        f"climate={args.climate}, {source}"
+    )
+    print(f"{'refresh':<18}{'p50':>10}{'p95':>10}{'p99':>10}{'failed':>8}")
+    for name, samples in latencies.items():
+        values = percentiles(samples)
+        print(
+            f"{name:<18}"
+            + "".join(f"{values[p] * 1000:>8.1f}ms" for p in PERCENTILES)
+            + f"{failures.get(name, 0):>8}"
+        )
+    print(
+        f"HTTP requests per cycle: mean={statistics.mean(requests_per_cycle):.2f}, "
+        f"max={max(requests_per_cycle)}"
+    )
+    for endpoint, count in sorted(requests_by_endpoint.items()):
+        print(f"  {endpoint:<40}{count / args.cycles:>8.2f}/cycle")
+
+    regressions = []
+    if isinstance(server, CarwingsReplayServer) and server.unexpected:
+        regressions.append(f"requests not in the cassette: {dict(server.unexpected)}")
+    if (
+        args.max_requests_per_cycle is not None
+        and max(requests_per_cycle) > args.max_requests_per_cycle
+    ):
+        regressions.append(
+            f"{max(requests_per_cycle)} HTTP requests per cycle "
+            f"(limit {args.max_requests_per_cycle})"
+        )
+    cycle_p95 = percentiles(latencies["cycle"])[95] * 1000
+    if args.max_cycle_p95 is not None and cycle_p95 > args.max_cycle_p95:
+        regressions.append(
+            f"cycle p95 {cycle_p95:.1f}ms (limit {args.max_cycle_p95:.1f}ms)"
+        )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=20, help="number of refresh cycles"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.1,
+        help="base latency per request, in seconds",
+    )
+    parser.add_argument(
+        "--latency-jitter",
+        type=float,
+        default=0.0,
+        help="random extra latency, in seconds",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="probability of a request failing (0..1)",
+    )
+    parser.add_argument(
+        "--result-delay",
+        type=float,
+        default=5.0,
+        help="time the car needs to answer, in seconds",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="request an update from the car on each cycle",
+    )
+    parser.add_argument(
+        "--unified",
+        action="store_true",
+        help="fetch all data concurrently in one unified refresh",
+    )
+    parser.add_argument(
+        "--climate",
+        action="store_true",
+        help="switch the climate control on (and wait for the car) on each cycle",
+    )
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        default=None,
+        help="replay recorded traffic instead of using the mock server",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="factor applied to the recorded latencies (0 = instant)",
+    )
+    parser.add_argument(
+        "--max-requests-per-cycle",
+        type=int,
+        default=None,
+        help="fail if a cycle makes more HTTP requests",
+    )
+    parser.add_argument(
+        "--max-cycle-p95",
+        type=float,
+        default=None,
+        help="fail if the p95 cycle latency exceeds this, in milliseconds",
+    )
+    sys.exit(asyncio.run(async_run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
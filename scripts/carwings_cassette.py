@@ -0,0 +1,368 @@
+"""
+Record and replay the Carwings HTTP traffic of the integration.
+
+Recording runs a proxy in front of the Carwings API: point the integration to it
+(pycarwings3_base_url setting) and use it as usual. On exit, the request/response
+pairs are written to a cassette (gzipped JSON if the name ends with .gz), with the
+credentials, session ids, the VIN and other account identifiers scrubbed:
+
+    python3 scripts/carwings_cassette.py record --cassette climate.json.gz
+
+    => base_url: http://127.0.0.1:8766/gdc/
+
+Replaying serves the recorded responses back in order (per endpoint), with the recorded
+latencies scaled by --time-scale (1 = original timings, 0 = instant):
+
+    python3 scripts/carwings_cassette.py replay --cassette climate.json.gz \
+        --time-scale 0.1
+
+The benchmark runs the coordinators against a cassette with --cassette.
+"""
+
+# ruff: noqa: INP001, T201
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+ENDPOINT_PREFIX = "/gdc/"
+# default Carwings API endpoint of pycarwings3
+UPSTREAM_URL = "https://gdcportalgw.its-mo.com/api_v250205_NE/gdc/"
+
+CASSETTE_VERSION = 1
+
+# request parameters and response fields (compared in lower case) holding credentials
+# or identifiers of the account and the vehicle
+SENSITIVE_KEYS = frozenset(
+    {
+        "userid",
+        "password",
+        "custom_sessionid",
+        "vin",
+        "gdcuserid",
+        "dcmid",
+        "nickname",
+        "email",
+        "mailaddress",
+        "telephone",
+    }
+)
+# values shorter than this are not replaced within other strings (e.g. empty ids)
+MIN_SECRET_LENGTH = 4
+
+
+@dataclass
+class Interaction:
+    """A request made by pycarwings3 and the answer of the server."""
+
+    endpoint: str
+    params: dict[str, str]
+    status: int
+    # the parsed JSON answer, or the text if the server did not answer with JSON
+    body: Any
+    # time of the request since the start of the recording and its latency, in seconds
+    started: float
+    duration: float
+
+
+@dataclass
+class Cassette:
+    """Recorded Carwings traffic."""
+
+    interactions: list[Interaction] = field(default_factory=list)
+
+    def save(self, path: Path) -> None:
+        """Write the cassette (compact JSON, gzipped if the name ends with .gz)."""
+        content = json.dumps(
+            {
+                "version": CASSETTE_VERSION,
+                "interactions": [asdict(item) for item in self.interactions],
+            },
+            separators=(",", ":"),
+        ).encode()
+        path.write_bytes(gzip.compress(content) if path.suffix == ".gz" else content)
+
+    @classmethod
+    def load(cls, path: Path) -> Cassette:
+        """Read a cassette written by save()."""
+        content = path.read_bytes()
+        if path.suffix == ".gz":
+            content = gzip.decompress(content)
+        data = json.loads(content)
+        if data.get("version") != CASSETTE_VERSION:
+            msg = f"unsupported cassette version: {data.get('version')}"
+            raise ValueError(msg)
+        return cls([Interaction(**item) for item in data["interactions"]])
+
+    def scrubbed(self) -> Cassette:
+        """Return a copy with the credentials and identifiers replaced."""
+        secrets: dict[str, str] = {}
+        for item in self.interactions:
+            _collect_secrets(item.params, secrets)
+            _collect_secrets(item.body, secrets)
+        # replace longer values first, they may contain shorter ones
+        replacements = sorted(secrets.items(), key=lambda pair: -len(pair[0]))
+        return Cassette(
+            [
+                Interaction(
+                    endpoint=item.endpoint,
+                    params=_scrub(item.params, replacements),
+                    status=item.status,
+                    body=_scrub(item.body, replacements),
+                    started=item.started,
+                    duration=item.duration,
+                )
+                for item in self.interactions
+            ]
+        )
+
+
+def _collect_secrets(value: Any, secrets: dict[str, str], key: str = "") -> None:
+    """Collect the values of the sensitive fields, mapped to their placeholder."""
+    if isinstance(value, dict):
+        for item_key, item in value.items():
+            _collect_secrets(item, secrets, str(item_key))
+    elif isinstance(value, list):
+        for item in value:
+            _collect_secrets(item, secrets, key)
+    elif (
+        isinstance(value, str)
+        and key.lower() in SENSITIVE_KEYS
+        and len(value) >= MIN_SECRET_LENGTH
+    ):
+        secrets.setdefault(value, f"<{key.lower()}>")
+
+
+def _scrub(value: Any, replacements: list[tuple[str, str]], key: str = "") -> Any:
+    """Replace the sensitive fields, and the secrets embedded in any other string."""
+    if isinstance(value, dict):
+        return {
+            item_key: _scrub(item, replacements, str(item_key))
+            for item_key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_scrub(item, replacements, key) for item in value]
+    if not isinstance(value, str):
+        return value
+    if key.lower() in SENSITIVE_KEYS and value:
+        return f"<{key.lower()}>"
+    for secret, placeholder in replacements:
+        value = value.replace(secret, placeholder)
+    return value
+
+
+class _Server:
+    """aiohttp application serving the Carwings endpoints, counting the requests."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        # number of requests per endpoint (reset with reset_counters())
+        self.request_counts: Counter[str] = Counter()
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+    @property
+    def total_requests(self) -> int:
+        """Return the total number of requests since the last reset."""
+        return sum(self.request_counts.values())
+
+    def reset_counters(self) -> None:
+        """Reset the request counters."""
+        self.request_counts.clear()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server and return the base_url to be used by pycarwings3."""
+        app = web.Application()
+        app.router.add_post(ENDPOINT_PREFIX + "{endpoint}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.base_url = f"http://{host}:{bound_port}{ENDPOINT_PREFIX}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        raise NotImplementedError
+
+
+class CarwingsRecordingProxy(_Server):
+    """Proxy forwarding the requests to the Carwings API, recording the traffic."""
+
+    def __init__(
+        self, session: aiohttp.ClientSession, upstream: str = UPSTREAM_URL
+    ) -> None:
+        """Initialize."""
+        super().__init__()
+        self._session = session
+        self._upstream = upstream
+        self._started = time.monotonic()
+        self.cassette = Cassette()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        self.request_counts[endpoint] += 1
+        params = {key: str(value) for key, value in (await request.post()).items()}
+
+        start = time.monotonic()
+        async with self._session.post(
+            self._upstream + endpoint, data=params, headers={"User-Agent": ""}
+        ) as response:
+            text = await response.text()
+            status = response.status
+        duration = time.monotonic() - start
+
+        try:
+            body = json.loads(text)
+        except ValueError:
+            body = text
+        self.cassette.interactions.append(
+            Interaction(
+                endpoint=endpoint,
+                params=params,
+                status=status,
+                body=body,
+                started=round(start - self._started, 3),
+                duration=round(duration, 3),
+            )
+        )
+        print(f"{status} {endpoint} {duration * 1000:.0f}ms")
+        return web.Response(text=text, status=status, content_type="application/json")
+
+
+class CarwingsReplayServer(_Server):
+    """
+    Serve the responses of a cassette.
+
+    The responses of each endpoint are served in the recorded order, after the
+    recorded latency scaled by time_scale. With loop, the responses of an endpoint
+    start over once used up (e.g. for repeated benchmark cycles); otherwise, further
+    requests are answered with an error and counted as unexpected.
+    """
+
+    def __init__(
+        self, cassette: Cassette, *, time_scale: float = 1.0, loop: bool = False
+    ) -> None:
+        """Initialize."""
+        super().__init__()
+        self.time_scale = time_scale
+        self.loop = loop
+        self._recorded: dict[str, list[Interaction]] = {}
+        for item in cassette.interactions:
+            self._recorded.setdefault(item.endpoint, []).append(item)
+        self._queues = {
+            endpoint: deque(items) for endpoint, items in self._recorded.items()
+        }
+        # requests without a recorded response left, per endpoint
+        self.unexpected: Counter[str] = Counter()
+
+    def unused(self) -> dict[str, int]:
+        """Return the number of recorded responses not served yet, per endpoint."""
+        return {
+            endpoint: len(queue) for endpoint, queue in self._queues.items() if queue
+        }
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        self.request_counts[endpoint] += 1
+        await request.post()
+
+        queue = self._queues.get(endpoint)
+        if queue is not None and not queue and self.loop:
+            queue.extend(self._recorded[endpoint])
+        if not queue:
+            self.unexpected[endpoint] += 1
+            return web.json_response(
+                {"status": 404, "ErrorCode": "404", "ErrorMessage": "not recorded"}
+            )
+
+        item = queue.popleft()
+        if self.time_scale:
+            await asyncio.sleep(item.duration * self.time_scale)
+        if isinstance(item.body, str):
+            return web.Response(
+                text=item.body, status=item.status, content_type="text/html"
+            )
+        return web.json_response(item.body, status=item.status)
+
+
+async def _async_record(args: argparse.Namespace) -> None:
+    async with aiohttp.ClientSession() as session:
+        proxy = CarwingsRecordingProxy(session, args.upstream)
+        base_url = await proxy.start(args.host, args.port)
+        print(f"Recording Carwings traffic, base_url: {base_url} (Ctrl+C to stop)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await proxy.stop()
+            proxy.cassette.scrubbed().save(args.cassette)
+            count = len(proxy.cassette.interactions)
+            print(f"{count} interaction(s) written to {args.cassette}")
+
+
+async def _async_replay(args: argparse.Namespace) -> None:
+    server = CarwingsReplayServer(
+        Cassette.load(args.cassette), time_scale=args.time_scale, loop=args.loop
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f"Replaying {args.cassette}, base_url: {base_url} (Ctrl+C to stop)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(f"requests: {dict(server.request_counts)}")
+        print(f"unexpected: {dict(server.unexpected)}, unused: {server.unused()}")
+
+
+def main() -> None:
+    """Record or replay from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("record", "replay"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("--cassette", type=Path, required=True)
+        subparser.add_argument("--host", default="127.0.0.1")
+        subparser.add_argument("--port", type=int, default=8766)
+    subparsers.choices["record"].add_argument(
+        "--upstream", default=UPSTREAM_URL, help="Carwings API base_url"
+    )
+    subparsers.choices["replay"].add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="factor applied to the recorded latencies (0 = instant)",
+    )
+    subparsers.choices["replay"].add_argument(
+        "--loop",
+        action="store_true",
+        help="start over with the responses of an endpoint once used up",
+    )
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(
+            _async_record(args) if args.command == "record" else _async_replay(args)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,543 @@
+"""
+Local stand-in for the Carwings API endpoints used by pycarwings3.
+
+The server simulates a single vehicle and supports configurable latency, error rates and
+result-key delays (the time the "car" needs to answer an asynchronous request).
+
+Run it standalone and point the integration to it (pycarwings3_base_url setting):
+
+    python3 scripts/carwings_mock_server.py --port 8765 --latency 0.3 --result-delay 20
+
+    => base_url: http://127.0.0.1:8765/gdc/
+"""
+
+# ruff: noqa: INP001, T201
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import random
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from aiohttp import web
+
+ENDPOINT_PREFIX = "/gdc/"
+
+# answer pycarwings3 maps to CarwingsError("INVALID PARAMS"), used for rejected sessions
+INVALID_PARAMS_RESPONSE = {"status": 401, "message": "INVALID PARAMS"}
+
+
+@dataclass
+class MockVehicle:
+    """State of the simulated vehicle."""
+
+    vin: str = "SJNFAAZE0U0000001"
+    nickname: str = "LEAF"
+    battery_capacity_wh: int = 24000
+    soc: float = 62.0
+    is_plugged_in: bool = False
+    is_charging: bool = False
+    charge_rate_w: float = 6600.0
+    is_hvac_running: bool = False
+    hvac_duration: timedelta = timedelta(minutes=15)
+    hvac_timestamp: datetime | None = None
+    # timestamp of the data the car has reported to the server the last time
+    battery_timestamp: datetime = field(
+        default_factory=lambda: datetime.now(UTC) - timedelta(hours=3)
+    )
+    # day of the driving analysis and the daily values, as returned by the server
+    driving_analysis_date: str = field(
+        default_factory=lambda: datetime.now(UTC).date().isoformat()
+    )
+    electric_mileage: float = 6.1
+
+    @property
+    def battery_remaining_wh(self) -> int:
+        """Remaining energy in Wh."""
+        return round(self.battery_capacity_wh * self.soc / 100)
+
+    def report(self, now: datetime) -> None:
+        """Simulate the car reporting its current state to the server."""
+        if self.is_charging:
+            elapsed = (now - self.battery_timestamp).total_seconds()
+            self.soc = min(
+                100.0,
+                self.soc
+                + self.charge_rate_w * elapsed / 3600 / self.battery_capacity_wh * 100,
+            )
+            if self.soc >= 100.0:  # noqa: PLR2004
+                self.is_charging = False
+        self.battery_timestamp = now
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server."""
+
+    # base latency of each request and the random jitter added on top, in seconds
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # probability of a request failing with a Carwings error message
+    error_rate: float = 0.0
+    # time the car needs to answer an asynchronous request (request_update,
+    # climate control), in seconds
+    result_delay: float = 0.0
+    # lifetime of a login session, None for sessions which never expire, in seconds
+    session_ttl: float | None = None
+
+
+class CarwingsMockServer:
+    """aiohttp application serving the Carwings endpoints."""
+
+    def __init__(
+        self, config: MockServerConfig | None = None, vehicle: MockVehicle | None = None
+    ) -> None:
+        """Initialize."""
+        self.config = config or MockServerConfig()
+        self.vehicle = vehicle or MockVehicle()
+        # number of requests per endpoint (reset with reset_counters())
+        self.request_counts: Counter[str] = Counter()
+        self._sessions: dict[str, datetime] = {}
+        # pending asynchronous operations: result key => (operation, answer time)
+        self._pending: dict[str, tuple[str, datetime]] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url: str | None = None
+
+        self._handlers = {
+            "InitialApp_v2.php": self._initial_app,
+            "UserLoginRequest.php": self._login,
+            "BatteryStatusCheckRequest.php": self._request_update,
+            "BatteryStatusCheckResultRequest.php": self._request_update_result,
+            "BatteryStatusRecordsRequest.php": self._battery_status_records,
+            "RemoteACRecordsRequest.php": self._remote_ac_records,
+            "ACRemoteRequest.php": self._start_climate,
+            "ACRemoteResult.php": self._start_climate_result,
+            "ACRemoteOffRequest.php": self._stop_climate,
+            "ACRemoteOffResult.php": self._stop_climate_result,
+            "DriveAnalysisBasicScreenRequestEx.php": self._driving_analysis,
+            "PriceSimulatorDetailInfoRequest.php": self._electric_rate_simulation,
+            "BatteryRemoteChargingRequest.php": self._start_charging,
+        }
+
+    @property
+    def total_requests(self) -> int:
+        """Return the total number of requests since the last reset."""
+        return sum(self.request_counts.values())
+
+    def reset_counters(self) -> None:
+        """Reset the request counters."""
+        self.request_counts.clear()
+
+    def expire_sessions(self) -> None:
+        """Invalidate all login sessions (the next request gets INVALID PARAMS)."""
+        self._sessions.clear()
+
+    def make_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application()
+        app.router.add_post(ENDPOINT_PREFIX + "{endpoint}", self._handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server and return the base_url to be used by pycarwings3."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.base_url = f"http://{host}:{bound_port}{ENDPOINT_PREFIX}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        self.request_counts[endpoint] += 1
+        params = dict(await request.post())
+
+        if self.config.latency or self.config.latency_jitter:
+            await asyncio.sleep(
+                self.config.latency + random.uniform(0, self.config.latency_jitter)  # noqa: S311
+            )
+
+        handler = self._handlers.get(endpoint)
+        if handler is None:
+            return web.json_response(
+                {"status": 404, "ErrorCode": "404", "ErrorMessage": "not found"}
+            )
+
+        if self.config.error_rate and random.random() < self.config.error_rate:  # noqa: S311
+            return web.json_response(
+                {"status": 500, "ErrorCode": "-2010", "ErrorMessage": "simulated error"}
+            )
+
+        if endpoint not in (
+            "InitialApp_v2.php",
+            "UserLoginRequest.php",
+        ) and not self._is_valid_session(params.get("custom_sessionid")):
+            return web.json_response(INVALID_PARAMS_RESPONSE)
+
+        return web.json_response(handler(params))
+
+    def _is_valid_session(self, session_id: Any) -> bool:
+        created = self._sessions.get(session_id)
+        if created is None:
+            return False
+        if self.config.session_ttl is None:
+            return True
+        return (datetime.now(UTC) - created).total_seconds() < self.config.session_ttl
+
+    def _new_result_key(self, operation: str) -> str:
+        result_key = uuid.uuid4().hex
+        self._pending[result_key] = (
+            operation,
+            datetime.now(UTC) + timedelta(seconds=self.config.result_delay),
+        )
+        return result_key
+
+    def _pop_result(self, result_key: Any) -> bool:
+        """Return True (and forget the key) if the car has answered the request."""
+        pending = self._pending.get(result_key)
+        if pending is None or datetime.now(UTC) < pending[1]:
+            return False
+        del self._pending[result_key]
+        return True
+
+    def _initial_app(self, _: dict[str, Any]) -> dict[str, Any]:
+        return {"status": 200, "message": "success", "baseprm": "mock"}
+
+    def _login(self, _: dict[str, Any]) -> dict[str, Any]:
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = datetime.now(UTC)
+        vehicle_info = {
+            "nickname": self.vehicle.nickname,
+            "vin": self.vehicle.vin,
+            "custom_sessionid": session_id,
+        }
+        return {
+            "status": 200,
+            "message": "success",
+            "VehicleInfoList": {
+                "VehicleInfo": [vehicle_info],
+                "vehicleInfo": [vehicle_info],
+            },
+            "vehicle": {
+                "profile": {
+                    "vin": self.vehicle.vin,
+                    "gdcUserId": "MOCKUSER",
+                    "dcmId": "000000000000",
+                    "nickname": self.vehicle.nickname,
+                    "status": "ACCEPTED",
+                }
+            },
+            "CustomerInfo": {
+                "UserId": "MOCKUSER",
+                "Language": "en-US",
+                "Timezone": "Europe/Berlin",
+                "RegionCode": "NE",
+                "VehicleInfo": {
+                    "VIN": self.vehicle.vin,
+                    "UserVehicleBoundTime": "2020-01-01T00:00:00Z",
+                },
+            },
+        }
+
+    def _request_update(self, _: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "status": 200,
+            "message": "success",
+            "resultKey": self._new_result_key("update"),
+        }
+
+    def _request_update_result(self, params: dict[str, Any]) -> dict[str, Any]:
+        if not self._pop_result(params.get("resultKey")):
+            return {"status": 200, "responseFlag": "0"}
+
+        vehicle = self.vehicle
+        vehicle.report(datetime.now(UTC))
+        no_time = {"hours": "", "minutes": ""}
+        return {
+            "status": 200,
+            "message": "success",
+            "responseFlag": "1",
+            "operationResult": "START",
+            "timeStamp": vehicle.battery_timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "cruisingRangeAcOn": str(vehicle.soc * 1200.0),
+            "cruisingRangeAcOff": str(vehicle.soc * 1300.0),
+            "currentChargeLevel": "0",
+            "chargeMode": "NORMAL_CHARGING" if vehicle.is_charging else "NOT_CHARGING",
+            "pluginState": "CONNECTED" if vehicle.is_plugged_in else "NOT_CONNECTED",
+            "charging": "YES" if vehicle.is_charging else "NO",
+            "chargeStatus": "CT" if vehicle.is_charging else "0",
+            "batteryDegradation": str(round(vehicle.soc * 12 / 100)),
+            "batteryCapacity": "12",
+            "timeRequiredToFull": no_time,
+            "timeRequiredToFull200": no_time,
+            "timeRequiredToFull200_6kW": no_time,
+        }
+
+    def _battery_status_records(self, _: dict[str, Any]) -> dict[str, Any]:
+        vehicle = self.vehicle
+        return {
+            "status": 200,
+            "message": "success",
+            "BatteryStatusRecords": {
+                "OperationResult": "START",
+                "OperationDateAndTime": vehicle.battery_timestamp.strftime(
+                    "%b %d, %Y %I:%M %p"
+                ),
+                "BatteryStatus": {
+                    "BatteryChargingStatus": "NORMAL_CHARGING"
+                    if vehicle.is_charging
+                    else "NOT_CHARGING",
+                    "BatteryCapacity": "240",
+                    "BatteryRemainingAmount": str(round(vehicle.soc * 240 / 100)),
+                    "BatteryRemainingAmountWH": str(vehicle.battery_remaining_wh),
+                    "BatteryRemainingAmountkWH": "",
+                    "SOC": {"Value": str(round(vehicle.soc))},
+                },
+                "PluginState": "CONNECTED"
+                if vehicle.is_plugged_in
+                else "NOT_CONNECTED",
+                "CruisingRangeAcOn": str(vehicle.soc * 1200.0),
+                "CruisingRangeAcOff": str(vehicle.soc * 1300.0),
+                "TimeRequiredToFull200_6kW": {
+                    "HourRequiredToFull": "",
+                    "MinutesRequiredToFull": "",
+                },
+                "NotificationDateAndTime": vehicle.battery_timestamp.strftime(
+                    "%Y/%m/%d %H:%M"
+                ),
+                "TargetDate": vehicle.battery_timestamp.strftime("%Y/%m/%d %H:%M"),
+            },
+        }
+
+    def _remote_ac_records(self, _: dict[str, Any]) -> dict[str, Any]:
+        vehicle = self.vehicle
+        if vehicle.hvac_timestamp is None:
+            return {"status": 200, "RemoteACRecords": []}
+        return {
+            "status": 200,
+            "message": "success",
+            "RemoteACRecords": {
+                "OperationResult": "START_BATTERY"
+                if vehicle.is_hvac_running
+                else "START",
+                "OperationDateAndTime": vehicle.hvac_timestamp.strftime(
+                    "%b %d, %Y %I:%M %p"
+                ),
+                "RemoteACOperation": "START" if vehicle.is_hvac_running else "STOP",
+                "ACStartStopDateAndTime": vehicle.hvac_timestamp.strftime(
+                    "%Y/%m/%d %H:%M"
+                ),
+                "CruisingRangeAcOn": str(vehicle.soc * 1200.0),
+                "CruisingRangeAcOff": str(vehicle.soc * 1300.0),
+                "ACStartStopURL": "",
+                "PluginState": "CONNECTED"
+                if vehicle.is_plugged_in
+                else "NOT_CONNECTED",
+                "ACDurationBatterySec": str(int(vehicle.hvac_duration.total_seconds())),
+                "ACDurationPluggedSec": str(int(vehicle.hvac_duration.total_seconds())),
+            },
+        }
+
+    def _start_climate(self, _: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "status": 200,
+            "message": "success",
+            "resultKey": self._new_result_key("climate_on"),
+        }
+
+    def _start_climate_result(self, params: dict[str, Any]) -> dict[str, Any]:
+        if not self._pop_result(params.get("resultKey")):
+            return {"status": 200, "responseFlag": "0"}
+        vehicle = self.vehicle
+        vehicle.is_hvac_running = True
+        vehicle.hvac_timestamp = datetime.now(UTC)
+        return {
+            "status": 200,
+            "message": "success",
+            "responseFlag": "1",
+            "operationResult": "START_BATTERY",
+            "acContinueTime": str(int(vehicle.hvac_duration.total_seconds() / 60)),
+            "cruisingRangeAcOn": str(vehicle.soc * 1200.0),
+            "cruisingRangeAcOff": str(vehicle.soc * 1300.0),
+            "timeStamp": vehicle.hvac_timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "hvacStatus": "ON",
+        }
+
+    def _stop_climate(self, _: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "status": 200,
+            "message": "success",
+            "resultKey": self._new_result_key("climate_off"),
+        }
+
+    def _stop_climate_result(self, params: dict[str, Any]) -> dict[str, Any]:
+        if not self._pop_result(params.get("resultKey")):
+            return {"status": 200, "responseFlag": "0"}
+        vehicle = self.vehicle
+        vehicle.is_hvac_running = False
+        vehicle.hvac_timestamp = datetime.now(UTC)
+        return {
+            "status": 200,
+            "message": "success",
+            "responseFlag": "1",
+            "operationResult": "START",
+            "timeStamp": vehicle.hvac_timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "hvacStatus": "OFF",
+        }
+
+    def _driving_analysis(self, _: dict[str, Any]) -> dict[str, Any]:
+        vehicle = self.vehicle
+        target_date = datetime.fromisoformat(vehicle.driving_analysis_date)
+        return {
+            "status": 200,
+            "message": "success",
+            "DriveAnalysisBasicScreenResponsePersonalData": {
+                "DateSummary": {
+                    "TargetDate": vehicle.driving_analysis_date,
+                    "ElectricMileage": str(vehicle.electric_mileage),
+                    "ElectricMileageLevel": "3",
+                    "PowerConsumptMoter": "144.5",
+                    "PowerConsumptMoterLevel": "4",
+                    "PowerConsumptMinus": "24.0",
+                    "PowerConsumptMinusLevel": "3",
+                    "PowerConsumptAUX": "12.6",
+                    "PowerConsumptAUXLevel": "5",
+                    "DisplayDate": target_date.strftime("%b %d, %y"),
+                },
+                "ElectricCostScale": "kWh/100km",
+            },
+            "AdviceList": {
+                "Advice": {"title": "Mock advice", "body": "Drive carefully."}
+            },
+        }
+
+    def _electric_rate_simulation(self, params: dict[str, Any]) -> dict[str, Any]:
+        # one trip on the 1st of the requested month (TargetMonth: YYYYMM)
+        target_month = str(params.get("TargetMonth", ""))
+        day = datetime.strptime(target_month + "01", "%Y%m%d").replace(tzinfo=UTC)
+        trip = {
+            "TripId": "1",
+            "PowerConsumptTotal": "2100",
+            "PowerConsumptMoter": "2500",
+            "PowerConsumptMinus": "400",
+            "TravelDistance": "14000",
+            "ElectricMileage": str(self.vehicle.electric_mileage),
+            "CO2Reduction": "2",
+        }
+        return {
+            "status": 200,
+            "message": "success",
+            "PriceSimulatorDetailInfoResponsePersonalData": {
+                "DisplayMonth": day.strftime("%b/%Y"),
+                "PriceSimulatorDetailInfoDateList": {
+                    "PriceSimulatorDetailInfoDate": [
+                        {
+                            "TargetDate": day.strftime("%Y-%m-%d"),
+                            "DisplayDate": day.strftime("%b %d"),
+                            "PriceSimulatorDetailInfoTripList": {
+                                "PriceSimulatorDetailInfoTrip": [trip]
+                            },
+                        }
+                    ]
+                },
+                "PriceSimulatorTotalInfo": {
+                    "TotalNumberOfTrips": "1",
+                    "TotalPowerConsumptTotal": "2.1",
+                    "TotalPowerConsumptMoter": "2.5",
+                    "TotalPowerConsumptMinus": "0.4",
+                    "TotalTravelDistance": "14000",
+                    "TotalElectricMileage": "0.0",
+                    "TotalCO2Reductiont": "2",
+                },
+                "ElectricPrice": "0.15",
+                "ElectricBill": "0.32",
+                "ElectricCostScale": "kWh/100km",
+            },
+        }
+
+    def _start_charging(self, _: dict[str, Any]) -> dict[str, Any]:
+        vehicle = self.vehicle
+        if vehicle.is_plugged_in:
+            vehicle.report(datetime.now(UTC))
+            vehicle.is_charging = True
+        return {"status": 200, "message": "success"}
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    server = CarwingsMockServer(
+        MockServerConfig(
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            result_delay=args.result_delay,
+            session_ttl=args.session_ttl,
+        ),
+        MockVehicle(is_plugged_in=args.plugged_in),
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f"Carwings mock server listening, base_url: {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the mock server from the command line."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="base latency per request, in seconds",
+    )
+    parser.add_argument(
+        "--latency-jitter",
+        type=float,
+        default=0.0,
+        help="random extra latency, in seconds",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="probability of a request failing (0..1)",
+    )
+    parser.add_argument(
+        "--result-delay",
+        type=float,
+        default=20.0,
+        help="time the car needs to answer, in seconds",
+    )
+    parser.add_argument(
+        "--session-ttl",
+        type=float,
+        default=None,
+        help="login session lifetime, in seconds",
+    )
+    parser.add_argument(
+        "--plugged-in", action="store_true", help="simulate a plugged in vehicle"
+    )
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Import-time benchmark for the nissan_carwings package and its platform modules.
+
+Each module is imported in a fresh interpreter (--repeat times, the median is
+reported), after the Home Assistant modules which are loaded before the integration
+(and, for the platforms, after the package itself), so that only the cost of the
+integration is measured. Heavy third-party libraries (pycarwings3, pytz, ...) are to
+be imported on first use, in the executor: the benchmark fails if one of them is
+imported with a module.
+
+    python3 scripts/import_benchmark.py
+    python3 scripts/import_benchmark.py --repeat 10 --budget 50
+
+Exits with status 1 when the median import time of a module exceeds the budget (in
+milliseconds) or a deferred library is imported.
+"""
+
+# ruff: noqa: INP001, T201
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE = "custom_components.nissan_carwings"
+MODULES = (
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.binary_sensor",
+    f"{PACKAGE}.switch",
+    f"{PACKAGE}.button",
+    f"{PACKAGE}.diagnostics",
+)
+# imported by Home Assistant before the integration (core, helpers and the entity
+# components of the platforms)
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+    "homeassistant.components.switch",
+    "homeassistant.components.button",
+)
+# libraries imported on first use only (see api.async_import_pycarwings3)
+DEFERRED = ("pycarwings3", "pytz", "Crypto", "iso8601")
+DEFAULT_BUDGET_MS = 150
+
+# run in a fresh interpreter: import the preloaded modules, then time the module
+_MEASURE = """
+import importlib, json, sys, time
+for name in sys.argv[2:]:
+    importlib.import_module(name)
+before = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def measure(module: str, repeat: int) -> tuple[list[float], list[str]]:
+    """Return the import times of a module and the modules imported with it."""
+    preloaded = PRELOADED if module == PACKAGE else (*PRELOADED, PACKAGE)
+    root = Path(__file__).resolve().parent.parent
+    times = []
+    modules: list[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", _MEASURE, module, *preloaded],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        times.append(result["seconds"])
+        modules = result["modules"]
+    return times, modules
+
+
+def main() -> None:
+    """Measure the import time of each module and check the budget."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="imports per module (median reported)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="maximum median import time per module, in milliseconds",
+    )
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<45} {'median':>9} {'max':>9} {'modules':>8}")
+    for module in MODULES:
+        times, modules = measure(module, args.repeat)
+        median_ms = statistics.median(times) * 1000
+        print(
+            f"{module:<45} {median_ms:>7.1f}ms {max(times) * 1000:>7.1f}ms "
+            f"{len(modules):>8}"
+        )
+        if median_ms > args.budget:
+            failures.append(f"{module}: {median_ms:.1f}ms > {args.budget:.0f}ms")
+        deferred = sorted({name.split(".")[0] for name in modules} & set(DEFERRED))
+        if deferred:
+            failures.append(f"{module} imports {', '.join(deferred)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
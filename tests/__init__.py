@@ -0,0 +1 @@
+"""Tests for the nissan_carwings integration."""
@@ -0,0 +1,27 @@
+"""Fixtures for the nissan_carwings tests."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+
+class FakeClock:
+    """Monotonic clock advanced by the tests."""
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the monotonic clock (used by the budget and the circuit breaker)."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake_clock)
+    return fake_clock
@@ -0,0 +1,63 @@
+"""Tests for the API client, against a fake Carwings session."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from custom_components.nissan_carwings.api import NissanCarwingsApiClient
+
+if TYPE_CHECKING:
+    from custom_components.nissan_carwings.models import AuthState
+
+
+class _FakeLeaf:
+    """Leaf handle of a session which pycarwings3 renews on its own."""
+
+    vin = "VIN1"
+    nickname = "Leaf"
+    bound_time = None
+
+    def __init__(self, carwings3: Any) -> None:
+        self.carwings3 = carwings3
+        self.renew_session = False
+
+    async def get_latest_battery_status(self) -> None:
+        if self.renew_session:
+            # an HTTP error status, pycarwings3 has logged in again and retried
+            self.carwings3.custom_sessionid = "renewed"
+
+
+def test_session_renewed_by_pycarwings3() -> None:
+    """A session renewed by pycarwings3 is persisted, not only the explicit logins."""
+    persisted: list[AuthState] = []
+    session: Any = SimpleNamespace()
+    client = NissanCarwingsApiClient(
+        "user", "secret", "NE", session, None, auth_state_listener=persisted.append
+    )
+    carwings3 = client._carwings3
+    leaf = _FakeLeaf(carwings3)
+
+    async def login() -> _FakeLeaf:
+        carwings3.custom_sessionid = "first"
+        carwings3.gdc_user_id = carwings3.dcm_id = carwings3.tz = None
+        carwings3.language = "en-US"
+        carwings3.leaf = leaf
+        return leaf
+
+    carwings3.get_leaf = login
+
+    async def run() -> None:
+        await client.async_get_data()
+        await client.async_get_data()
+        leaf.renew_session = True
+        await client.async_get_data()
+        leaf.renew_session = False
+        await client.async_get_data()
+
+    asyncio.run(run())
+    assert [auth_state.custom_sessionid for auth_state in persisted] == [
+        "first",
+        "renewed",
+    ]
@@ -0,0 +1,119 @@
+"""Tests for the circuit breaker of the API client."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from custom_components.nissan_carwings.breaker import (
+    BreakerState,
+    ErrorClass,
+    NissanCarwingsCircuitBreaker,
+)
+
+if TYPE_CHECKING:
+    from .conftest import FakeClock
+
+
+def _breaker() -> NissanCarwingsCircuitBreaker:
+    return NissanCarwingsCircuitBreaker(
+        failure_threshold=3, open_duration=60, max_open_duration=200
+    )
+
+
+def _fail(breaker: NissanCarwingsCircuitBreaker, count: int = 1) -> None:
+    for _ in range(count):
+        assert breaker.acquire()
+        breaker.record_failure(ErrorClass.TRANSIENT, "TimeoutError")
+
+
+def test_opens_after_consecutive_transient_errors(clock: FakeClock) -> None:
+    """The circuit opens at the threshold, requests fail fast while it is open."""
+    breaker = _breaker()
+    _fail(breaker, 2)
+    assert breaker.state is BreakerState.CLOSED
+
+    _fail(breaker)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.retry_in == 60
+    assert not breaker.acquire()
+    assert breaker.rejected == 1
+
+    clock.now += 30
+    assert breaker.retry_in == 30
+    assert not breaker.acquire()
+
+
+def test_success_resets_the_failures() -> None:
+    """Only consecutive transient errors count."""
+    breaker = _breaker()
+    _fail(breaker, 2)
+    assert breaker.acquire()
+    breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 2
+
+
+def test_permanent_errors_do_not_count() -> None:
+    """An error answered by the servers means they are up."""
+    breaker = _breaker()
+    _fail(breaker, 2)
+    assert breaker.acquire()
+    breaker.record_failure(ErrorClass.PERMANENT, "CarwingsError: INVALID VIN")
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 0
+
+
+def test_auth_error_opens_right_away() -> None:
+    """Retrying with rejected credentials does not help."""
+    breaker = _breaker()
+    assert breaker.acquire()
+    breaker.record_failure(ErrorClass.AUTH, "CarwingsError: INVALID PARAMS")
+    assert breaker.state is BreakerState.OPEN
+
+
+def test_half_open_probe(clock: FakeClock) -> None:
+    """Once the open duration has elapsed, a single probe is let through."""
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 60
+
+    assert breaker.acquire()
+    assert breaker.state is BreakerState.HALF_OPEN
+    # the others fail fast until the outcome of the probe is known
+    assert not breaker.acquire()
+
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.acquire()
+
+
+def test_failed_probe_backs_off(clock: FakeClock) -> None:
+    """A failed probe opens the circuit for twice the duration, up to the maximum."""
+    breaker = _breaker()
+    _fail(breaker, 3)
+
+    for open_duration in (120, 200, 200):
+        clock.now += breaker.retry_in
+        _fail(breaker)
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.retry_in == open_duration
+
+    # the open duration starts over once the circuit has closed
+    clock.now += breaker.retry_in
+    assert breaker.acquire()
+    breaker.record_success()
+    _fail(breaker, 3)
+    assert breaker.retry_in == 60
+
+
+def test_released_probe(clock: FakeClock) -> None:
+    """A probe released without an outcome (cancelled) lets the next one through."""
+    breaker = _breaker()
+    _fail(breaker, 3)
+    clock.now += 60
+
+    assert breaker.acquire()
+    breaker.release()
+    assert breaker.acquire()
+    assert breaker.state is BreakerState.HALF_OPEN
@@ -0,0 +1,79 @@
+"""Tests for the request budget of the API client."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.nissan_carwings.budget import (
+    NissanCarwingsRequestBudget,
+    RequestPriority,
+)
+from custom_components.nissan_carwings.const import BUDGET_MAX_STRETCH
+
+if TYPE_CHECKING:
+    from .conftest import FakeClock
+
+
+def _use(budget: NissanCarwingsRequestBudget, count: int) -> None:
+    for _ in range(count):
+        budget.record()
+
+
+def test_hourly_window(clock: FakeClock) -> None:
+    """Background requests stop short of the hourly limit, the reserve is left."""
+    budget = NissanCarwingsRequestBudget(per_day=0, per_hour=10)
+    _use(budget, 9)
+    assert not budget.acquire(RequestPriority.BACKGROUND)
+    # the reserve is left for the user
+    assert budget.acquire(RequestPriority.USER)
+    assert budget.denied == {"background": 1, "user": 0}
+
+    clock.now += 3601
+    assert budget.used(3600) == 0
+    assert budget.acquire(RequestPriority.BACKGROUND)
+
+
+def test_daily_window(clock: FakeClock) -> None:
+    """The daily limit applies across the hours, requests are forgotten after a day."""
+    budget = NissanCarwingsRequestBudget(per_day=20, per_hour=0)
+    start = clock.now
+    for _ in range(4):
+        _use(budget, 5)
+        clock.now += 3601
+    assert budget.as_dict()["used_last_day"] == 20
+    assert budget.as_dict()["used_last_hour"] == 0
+    assert not budget.acquire(RequestPriority.USER)
+
+    # the first batch has left the 24 hours window
+    clock.now = start + 86401
+    assert budget.used(86400) == 15
+    assert budget.acquire(RequestPriority.USER)
+
+
+def test_unlimited() -> None:
+    """A budget of 0 never refuses a request nor stretches the intervals."""
+    budget = NissanCarwingsRequestBudget(per_day=0, per_hour=0)
+    _use(budget, 1000)
+    assert budget.acquire(RequestPriority.BACKGROUND)
+    assert budget.stretch_factor == 1.0
+
+
+@pytest.mark.usefixtures("clock")
+def test_stretch_factor() -> None:
+    """The intervals are stretched once the background budget runs low."""
+    # 90 requests of the hourly budget are available to background requests
+    budget = NissanCarwingsRequestBudget(per_day=0, per_hour=100)
+    _use(budget, 60)
+    assert budget.stretch_factor == 1.0
+
+    # 18 left: 20 % of the background budget
+    _use(budget, 12)
+    assert budget.stretch_factor == pytest.approx(1.25)
+
+    _use(budget, 17)
+    assert budget.stretch_factor == BUDGET_MAX_STRETCH
+
+    _use(budget, 1)
+    assert budget.stretch_factor == BUDGET_MAX_STRETCH
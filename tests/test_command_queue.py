@@ -0,0 +1,143 @@
+"""Tests for the coalescing queue of the commands sent to the car."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.nissan_carwings.command_queue import NissanCarwingsCommandQueue
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+WINDOW = 0.05
+
+
+def _command(sent: list[str], name: str) -> Callable[[], Awaitable[str]]:
+    async def execute() -> str:
+        sent.append(name)
+        await asyncio.sleep(0)
+        return name
+
+    return execute
+
+
+def test_last_intent_wins() -> None:
+    """Commands of a group within the window are coalesced into the last one."""
+    sent: list[str] = []
+
+    async def run() -> list[str]:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        return await asyncio.gather(
+            queue.async_submit("climate", _command(sent, "on")),
+            queue.async_submit("climate", _command(sent, "off")),
+            queue.async_submit("climate", _command(sent, "on again")),
+        )
+
+    assert asyncio.run(run()) == ["on again"] * 3
+    assert sent == ["on again"]
+
+
+def test_groups_are_serialized() -> None:
+    """Commands of different groups are all sent, one at a time."""
+    sent: list[str] = []
+    running = 0
+    max_running = 0
+
+    def tracked(name: str) -> Callable[[], Awaitable[str]]:
+        async def execute() -> str:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(WINDOW)
+            running -= 1
+            sent.append(name)
+            return name
+
+        return execute
+
+    async def run() -> list[str]:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        return await asyncio.gather(
+            queue.async_submit("climate", tracked("climate")),
+            queue.async_submit("charging", tracked("charging")),
+        )
+
+    assert asyncio.run(run()) == ["climate", "charging"]
+    assert sorted(sent) == ["charging", "climate"]
+    assert max_running == 1
+
+
+def test_command_after_the_window() -> None:
+    """A command submitted once the previous one has been sent is sent as well."""
+    sent: list[str] = []
+
+    async def run() -> tuple[str, str]:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        first = await queue.async_submit("climate", _command(sent, "on"))
+        second = await queue.async_submit("climate", _command(sent, "off"))
+        return first, second
+
+    assert asyncio.run(run()) == ("on", "off")
+    assert sent == ["on", "off"]
+
+
+def test_error_is_shared() -> None:
+    """All callers of a coalesced command get its error."""
+
+    async def failing() -> None:
+        msg = "budget used up"
+        raise RuntimeError(msg)
+
+    async def run() -> list[BaseException]:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        return await asyncio.gather(
+            queue.async_submit("climate", failing),
+            queue.async_submit("climate", failing),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(run())
+    assert [str(error) for error in errors] == ["budget used up"] * 2
+
+
+def test_cancelled_caller_does_not_cancel_the_command() -> None:
+    """The command is still sent for the other callers."""
+    sent: list[str] = []
+
+    async def run() -> str:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        cancelled = asyncio.ensure_future(
+            queue.async_submit("climate", _command(sent, "on"))
+        )
+        waiting = asyncio.ensure_future(
+            queue.async_submit("climate", _command(sent, "off"))
+        )
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await waiting
+
+    assert asyncio.run(run()) == "off"
+    assert sent == ["off"]
+
+
+def test_cancel_drops_the_queued_commands() -> None:
+    """Commands still in the window are not sent after cancel() (on unload)."""
+    sent: list[str] = []
+
+    async def run() -> None:
+        queue = NissanCarwingsCommandQueue(WINDOW)
+        submitted = asyncio.ensure_future(
+            queue.async_submit("climate", _command(sent, "on"))
+        )
+        await asyncio.sleep(0)
+        queue.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await submitted
+
+    asyncio.run(run())
+    assert sent == []
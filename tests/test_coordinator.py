@@ -0,0 +1,263 @@
+"""Tests for the coordinators, against a fake Carwings session."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from pycarwings3 import CarwingsError
+
+from custom_components.nissan_carwings import data
+from custom_components.nissan_carwings.api import NissanCarwingsApiClient
+from custom_components.nissan_carwings.breaker import BreakerState
+from custom_components.nissan_carwings.const import (
+    DATA_CLIMATE_STATUS_KEY,
+    DATA_DRIVING_ANALYSIS_KEY,
+    DATA_TIMESTAMP_KEY,
+    OPTIONS_UNIFIED_REFRESH,
+)
+from custom_components.nissan_carwings.coordinator import (
+    CarwingsClimateDataUpdateCoordinator,
+    CarwingsDataUpdateCoordinator,
+    CarwingsDrivingAnalysisDataUpdateCoordinator,
+)
+from custom_components.nissan_carwings.data import NissanCarwingsClimatePendingState
+from custom_components.nissan_carwings.models import ClimateCommandResult, ClimateState
+
+HASS: Any = SimpleNamespace(config=SimpleNamespace(components=set(), time_zone="UTC"))
+
+
+def _client() -> NissanCarwingsApiClient:
+    # nothing is sent, the tests replace the calls of the pycarwings3 session
+    session: Any = SimpleNamespace()
+    return NissanCarwingsApiClient("user", "secret", "NE", session, base_url=None)
+
+
+def _config_entry(client: NissanCarwingsApiClient, **options: Any) -> Any:
+    return SimpleNamespace(
+        options=options,
+        data={"vin": "VIN1"},
+        title="Leaf",
+        runtime_data=SimpleNamespace(
+            client=client,
+            snapshot_store=SimpleNamespace(async_save_snapshot=lambda *_: None),
+        ),
+    )
+
+
+class _FakeLeaf:
+    """Leaf handle whose climate control status is rejected as unauthorized."""
+
+    vin = "VIN1"
+
+    async def get_latest_battery_status(self) -> None:
+        return None
+
+    async def get_latest_hvac_status(self) -> None:
+        msg = "INVALID PARAMS"
+        raise CarwingsError(msg)
+
+    async def get_driving_analysis(self) -> None:
+        return None
+
+    async def get_electric_rate_simulation(self, _target_month: str) -> None:
+        return None
+
+
+async def _rejected_login() -> None:
+    # what pycarwings3 raises for a login with wrong credentials
+    msg = "INVALID PARAMS"
+    raise CarwingsError(msg)
+
+
+def test_rejected_login_starts_reauth() -> None:
+    """A login rejected by the servers raises ConfigEntryAuthFailed."""
+
+    async def run() -> NissanCarwingsApiClient:
+        client = _client()
+        client._carwings3.get_leaf = _rejected_login
+        coordinator = CarwingsClimateDataUpdateCoordinator(HASS, _config_entry(client))
+        with pytest.raises(ConfigEntryAuthFailed):
+            await coordinator.async_fetch_update()
+        return client
+
+    client = asyncio.run(run())
+    # no probes with the rejected credentials until the reauthentication
+    assert client.breaker.state is BreakerState.OPEN
+    assert client.breaker.failures == 1
+
+
+def test_shared_rejected_login() -> None:
+    """Concurrent callers sharing a rejected login all get the authentication error."""
+    logins = 0
+
+    async def rejected_login() -> None:
+        nonlocal logins
+        logins += 1
+        await asyncio.sleep(0)
+        await _rejected_login()
+
+    async def run() -> tuple[NissanCarwingsApiClient, list[Any]]:
+        client = _client()
+        client._carwings3.get_leaf = rejected_login
+        coordinators = [
+            CarwingsClimateDataUpdateCoordinator(HASS, _config_entry(client))
+            for _ in range(3)
+        ]
+        results = await asyncio.gather(
+            *(coordinator.async_fetch_update() for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        return client, results
+
+    client, results = asyncio.run(run())
+    assert all(isinstance(result, ConfigEntryAuthFailed) for result in results)
+    assert logins == 1
+    assert client.breaker.failures == 1
+
+
+def test_unified_refresh_member_rejected() -> None:
+    """A member of the unified refresh rejected as unauthorized starts the reauth."""
+    leaf = _FakeLeaf()
+
+    async def login() -> _FakeLeaf:
+        return leaf
+
+    async def run() -> Any:
+        client = _client()
+        client._carwings3.get_leaf = login
+        config_entry = _config_entry(client, **{OPTIONS_UNIFIED_REFRESH: True})
+        runtime_data = config_entry.runtime_data
+        runtime_data.coordinator = CarwingsDataUpdateCoordinator(HASS, config_entry)
+        runtime_data.climate_coordinator = CarwingsClimateDataUpdateCoordinator(
+            HASS, config_entry
+        )
+        runtime_data.driving_analysis_coordinator = (
+            CarwingsDrivingAnalysisDataUpdateCoordinator(HASS, config_entry)
+        )
+        with pytest.raises(ConfigEntryAuthFailed):
+            await runtime_data.coordinator.async_fetch_update()
+        return runtime_data
+
+    runtime_data = asyncio.run(run())
+    climate_coordinator = runtime_data.climate_coordinator
+    assert isinstance(climate_coordinator.last_exception, ConfigEntryAuthFailed)
+    assert not climate_coordinator.last_update_success
+    # the result of the other member is applied all the same
+    assert runtime_data.driving_analysis_coordinator.last_update_success
+
+
+def test_climate_command_not_accepted() -> None:
+    """A climate command rejected by the servers rolls back the pending state."""
+
+    async def set_climate(*, switch_on: bool) -> None:  # noqa: ARG001
+        # pycarwings3 error, logged by the client
+        return
+
+    async def run() -> NissanCarwingsClimatePendingState:
+        client = _client()
+        client.async_set_climate = set_climate  # type: ignore[method-assign]
+        client.command_queue.window = 0
+        config_entry = _config_entry(client)
+        pending_state = NissanCarwingsClimatePendingState()
+        config_entry.runtime_data.climate_pending_state = pending_state
+        coordinator = CarwingsClimateDataUpdateCoordinator(HASS, config_entry)
+        with pytest.raises(HomeAssistantError):
+            await coordinator.async_set_climate(switch_on=True)
+        return pending_state
+
+    pending_state = asyncio.run(run())
+    # the climate status applies again
+    assert pending_state == NissanCarwingsClimatePendingState()
+
+
+def test_climate_answer_ends_the_pending_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The answer of the car ends the pending state, also after a minute boundary."""
+    now = datetime(2024, 8, 1, 7, 59, 30, tzinfo=UTC)
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz: Any = None) -> Any:  # noqa: ARG003
+            return now
+
+    monkeypatch.setattr(data, "datetime", Clock)
+    answer = ClimateCommandResult(
+        confirmed_at=datetime(2024, 8, 1, 7, 59, 58, tzinfo=UTC),
+        is_hvac_running=True,
+        ac_duration=None,
+        cruising_range_ac_on_km=None,
+        cruising_range_ac_off_km=None,
+    )
+
+    async def get_climate_result(
+        _result_key: str, *, switch_on: bool
+    ) -> ClimateCommandResult:
+        nonlocal now
+        assert switch_on
+        # the answer is applied in the next minute
+        now = datetime(2024, 8, 1, 8, 0, 1, tzinfo=UTC)
+        return answer
+
+    async def run() -> CarwingsClimateDataUpdateCoordinator:
+        client = _client()
+        client.async_get_climate_result = get_climate_result  # type: ignore[method-assign]
+        config_entry = _config_entry(client)
+        config_entry.runtime_data.climate_pending_state = (
+            NissanCarwingsClimatePendingState()
+        )
+        coordinator = CarwingsClimateDataUpdateCoordinator(HASS, config_entry)
+        started_at = datetime(2024, 8, 1, 7, 0, tzinfo=UTC)
+        coordinator.data = {
+            DATA_CLIMATE_STATUS_KEY: ClimateState(
+                timestamp=started_at,
+                is_hvac_running=False,
+                is_plugged_in=False,
+                ac_duration=None,
+                ac_start_stop_date_and_time=started_at,
+                cruising_range_ac_on_km=None,
+                cruising_range_ac_off_km=None,
+            ),
+            DATA_TIMESTAMP_KEY: started_at,
+        }
+        config_entry.runtime_data.climate_pending_state.pending_state = True
+        assert coordinator.is_climate_pending_state_active
+        await coordinator._async_confirm_climate("result key", pending_state=True)
+        return coordinator
+
+    coordinator = asyncio.run(run())
+    assert not coordinator.is_climate_pending_state_active
+    assert coordinator.is_hvac_running
+    # back to the normal update interval
+    assert coordinator.update_interval == coordinator.default_update_interval
+    assert coordinator.update_interval != timedelta(seconds=60)
+
+
+def test_skipped_fetch_keeps_the_data_age() -> None:
+    """A driving analysis fetch skipped as not due does not make the data fresh."""
+    fetched_at = datetime.now(UTC) - timedelta(hours=2)
+
+    async def run() -> Any:
+        client = _client()
+        config_entry = _config_entry(client)
+        config_entry.runtime_data.coordinator = CarwingsDataUpdateCoordinator(
+            HASS, config_entry
+        )
+        coordinator = CarwingsDrivingAnalysisDataUpdateCoordinator(HASS, config_entry)
+        coordinator.driving_history.backfilled = True
+        coordinator.data = {
+            DATA_DRIVING_ANALYSIS_KEY: SimpleNamespace(),
+            DATA_TIMESTAMP_KEY: None,
+        }
+        coordinator.data_fetched_at = fetched_at
+        # fetched a moment ago, the car has not been driven since
+        coordinator._last_fetch = datetime.now(UTC)
+        assert await coordinator.async_fetch_update() is coordinator.data
+        assert client.budget.as_dict()["used_last_day"] == 0
+        return coordinator
+
+    coordinator = asyncio.run(run())
+    assert coordinator.data_fetched_at == fetched_at
@@ -0,0 +1,101 @@
+"""Tests for the battery history imported into the long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from homeassistant.components.recorder import statistics as recorder_statistics
+
+from custom_components.nissan_carwings.history import BatteryHistory
+from custom_components.nissan_carwings.models import BatteryState
+
+START = datetime(2024, 8, 1, 20, 0, tzinfo=UTC)
+HASS: Any = SimpleNamespace(config=SimpleNamespace(components={"recorder"}))
+
+
+def _battery_state(minutes: int, soc: float) -> BatteryState:
+    return BatteryState(
+        timestamp=START + timedelta(minutes=minutes),
+        battery_percent=soc,
+        battery_capacity=None,
+        battery_remaining_amount=None,
+        battery_remaining_amount_wh=soc * 200,
+        charging_status="NOT_CHARGING",
+        is_charging=False,
+        is_quick_charging=False,
+        plugin_state="NOT_CONNECTED",
+        is_connected=False,
+        is_connected_to_quick_charger=False,
+        cruising_range_ac_on_km=None,
+        cruising_range_ac_off_km=None,
+        time_to_full_trickle=None,
+        time_to_full_l2=None,
+        time_to_full_l2_6kw=None,
+    )
+
+
+@pytest.fixture
+def imported(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[Any]]:
+    """Capture the statistics imported, by statistic id."""
+    rows: dict[str, list[Any]] = {}
+
+    def add_external_statistics(
+        _hass: Any, metadata: dict[str, Any], statistics: list[Any]
+    ) -> None:
+        rows.setdefault(metadata["statistic_id"], []).extend(statistics)
+
+    monkeypatch.setattr(
+        recorder_statistics, "async_add_external_statistics", add_external_statistics
+    )
+    return rows
+
+
+def test_hourly_statistics(imported: dict[str, list[Any]]) -> None:
+    """The pending hours are imported with the mean, min and max of their samples."""
+    battery_history = BatteryHistory()
+    assert battery_history.add(_battery_state(10, 40))
+    assert battery_history.add(_battery_state(40, 50))
+    assert battery_history.add(_battery_state(70, 60))
+    # known (or older) samples and a 0% SOC are ignored
+    assert not battery_history.add(_battery_state(70, 60))
+    assert not battery_history.add(_battery_state(80, 0))
+    battery_history.async_import_statistics(HASS, "VIN1", "Leaf")
+
+    soc = imported["nissan_carwings:vin1_battery_soc"]
+    assert [(row["start"], row["mean"], row["min"], row["max"]) for row in soc] == [
+        (START, 45, 40, 50),
+        (START + timedelta(hours=1), 60, 60, 60),
+    ]
+    # rows without a value (no range reported) are not imported
+    assert "nissan_carwings:vin1_range_ac_on" not in imported
+
+    # the imported hours are no longer pending
+    imported.clear()
+    battery_history.async_import_statistics(HASS, "VIN1", "Leaf")
+    assert imported == {}
+
+
+def test_restored_hour_not_imported(imported: dict[str, list[Any]]) -> None:
+    """The hour of the restored samples is not overwritten with a partial mean."""
+    battery_history = BatteryHistory()
+    assert battery_history.add(_battery_state(10, 40), import_statistics=False)
+    assert battery_history.add(_battery_state(40, 50))
+    assert battery_history.add(_battery_state(70, 60))
+    battery_history.async_import_statistics(HASS, "VIN1", "Leaf")
+
+    soc = imported["nissan_carwings:vin1_battery_soc"]
+    assert [row["start"] for row in soc] == [START + timedelta(hours=1)]
+
+
+def test_without_recorder(imported: dict[str, list[Any]]) -> None:
+    """Without the recorder, the history is kept in memory only."""
+    battery_history = BatteryHistory()
+    assert battery_history.add(_battery_state(10, 40))
+    hass: Any = SimpleNamespace(config=SimpleNamespace(components=set()))
+    battery_history.async_import_statistics(hass, "VIN1", "Leaf")
+    battery_history.async_import_statistics(HASS, "VIN1", "Leaf")
+    assert imported == {}
+    assert battery_history.latest is not None
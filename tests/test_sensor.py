@@ -0,0 +1,122 @@
+"""Tests for the sensors derived from the battery coordinator."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.nissan_carwings import sensor
+from custom_components.nissan_carwings.api import NissanCarwingsApiClient
+from custom_components.nissan_carwings.const import API_OPERATION_BATTERY_STATUS
+from custom_components.nissan_carwings.coordinator import CarwingsDataUpdateCoordinator
+from custom_components.nissan_carwings.estimator import SocSample
+from custom_components.nissan_carwings.sensor import (
+    ApiLatencySensor,
+    EstimatedBatterySensor,
+    RequestBudgetSensor,
+)
+
+START = datetime(2024, 8, 1, 20, 0, tzinfo=UTC)
+HASS: Any = SimpleNamespace(config=SimpleNamespace(components=set(), time_zone="UTC"))
+
+
+class Clock(datetime):
+    """Current time of the sensors, advanced by the tests."""
+
+    current = START
+
+    @classmethod
+    def now(cls, tz: Any = None) -> Any:  # noqa: ARG003
+        """Return the current time."""
+        return cls.current
+
+
+@pytest.fixture
+def coordinator(monkeypatch: pytest.MonkeyPatch) -> CarwingsDataUpdateCoordinator:
+    """Battery coordinator of a config entry (the client sends nothing)."""
+    monkeypatch.setattr(sensor, "datetime", Clock)
+    Clock.current = START
+    session: Any = SimpleNamespace()
+    config_entry: Any = SimpleNamespace(
+        domain="nissan_carwings",
+        entry_id="entry",
+        options={},
+        data={"vin": "VIN1", "nickname": "Leaf"},
+        runtime_data=SimpleNamespace(
+            client=NissanCarwingsApiClient("user", "secret", "NE", session, None)
+        ),
+    )
+    return CarwingsDataUpdateCoordinator(HASS, config_entry)
+
+
+def _fail_refreshes(coordinator: CarwingsDataUpdateCoordinator) -> None:
+    # the data served is stale, then too old to be served
+    coordinator.last_error = "CarwingsError: maintenance"
+    coordinator.last_update_success = False
+
+
+def _sample(minutes: int, soc: float, *, is_charging: bool = False) -> SocSample:
+    return SocSample(
+        timestamp=START + timedelta(minutes=minutes),
+        soc=soc,
+        energy_wh=soc * 200,
+        is_charging=is_charging,
+    )
+
+
+def test_estimate_stable_between_samples(
+    coordinator: CarwingsDataUpdateCoordinator,
+) -> None:
+    """The confidence does not decay (and change the state) on every update."""
+    coordinator.soc_estimator.sample = _sample(-30, 50)
+    entity = EstimatedBatterySensor(coordinator)
+    attributes = entity.extra_state_attributes
+    assert attributes["timestamp"] == START - timedelta(minutes=30)
+    assert "estimated_from" not in attributes
+
+    Clock.current = START + timedelta(hours=1)
+    assert entity.extra_state_attributes == attributes
+
+    # a new sample is estimated as of now
+    coordinator.soc_estimator.sample = _sample(45, 55)
+    attributes = entity.extra_state_attributes
+    assert attributes["timestamp"] == START + timedelta(minutes=45)
+    assert attributes["confidence"] == round(1 - 900 / 10800, 2)
+
+
+def test_estimate_advanced_while_charging(
+    coordinator: CarwingsDataUpdateCoordinator,
+) -> None:
+    """While charging, the estimate is advanced on the estimate interval."""
+    coordinator.soc_estimator.sample = _sample(0, 50, is_charging=True)
+    entity = EstimatedBatterySensor(coordinator)
+    entity.async_write_ha_state = lambda: None  # type: ignore[method-assign]
+    attributes = entity.extra_state_attributes
+
+    Clock.current = START + timedelta(minutes=30)
+    assert entity.extra_state_attributes == attributes
+    entity._handle_estimate_interval(Clock.current)
+    assert entity.extra_state_attributes["confidence"] < attributes["confidence"]
+
+
+def test_api_latency_available_while_failing(
+    coordinator: CarwingsDataUpdateCoordinator,
+) -> None:
+    """The latency of the calls is shown while the refreshes fail."""
+    entity = ApiLatencySensor(coordinator, API_OPERATION_BATTERY_STATUS)
+    _fail_refreshes(coordinator)
+    assert entity.available
+    assert "last_error" not in entity.extra_state_attributes
+
+
+def test_request_budget_available_while_failing(
+    coordinator: CarwingsDataUpdateCoordinator,
+) -> None:
+    """The budget usage is shown while the refreshes fail."""
+    entity = RequestBudgetSensor(coordinator)
+    _fail_refreshes(coordinator)
+    assert entity.available
+    assert "last_error" not in entity.extra_state_attributes
@@ -0,0 +1,125 @@
+"""Tests for the charging sessions derived from the battery samples."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.nissan_carwings.history import BatterySample
+from custom_components.nissan_carwings.sessions import ChargingSessionTracker
+
+START = datetime(2024, 8, 1, 20, 0, tzinfo=UTC)
+
+
+def _sample(
+    minutes: int,
+    soc: float,
+    energy_wh: float | None,
+    *,
+    is_charging: bool = True,
+    is_connected: bool | None = None,
+) -> BatterySample:
+    return BatterySample(
+        timestamp=START + timedelta(minutes=minutes),
+        soc=soc,
+        energy_wh=energy_wh,
+        range_ac_on_km=None,
+        range_ac_off_km=None,
+        is_connected=is_charging if is_connected is None else is_connected,
+        is_charging=is_charging,
+    )
+
+
+def test_energy_accumulation() -> None:
+    """The energy added is the sum of the positive deltas between the samples."""
+    tracker = ChargingSessionTracker()
+    assert not tracker.add_sample(_sample(0, 40, 9000, is_charging=False))
+    assert tracker.add_sample(_sample(15, 40, 9000))
+    assert tracker.add_sample(_sample(45, 50, 11000))
+    # a sample without the energy does not add anything
+    assert tracker.add_sample(_sample(60, 55, None))
+    assert tracker.add_sample(_sample(75, 60, 14000))
+    assert tracker.active is not None
+    assert tracker.active.energy_added_wh == 2000
+    assert tracker.total_energy_wh == 2000
+
+    assert tracker.add_sample(_sample(120, 70, 16000, is_charging=False))
+    assert tracker.active is None
+    (session,) = tracker.recent(10)
+    assert session.start == START + timedelta(minutes=15)
+    assert session.duration == timedelta(minutes=105)
+    assert (session.start_soc, session.end_soc) == (40, 70)
+    assert session.energy_added_wh == 4000
+    assert session.as_dict()["average_power_kw"] == round(4 / 1.75, 2)
+
+
+def test_charge_before_the_first_charging_sample() -> None:
+    """A session detected after plugging in counts the energy added since then."""
+    tracker = ChargingSessionTracker()
+    # plugged in, the charging (timer) starts in between the (hours apart) idle polls
+    tracker.add_sample(_sample(0, 40, 9000, is_charging=False, is_connected=True))
+    assert tracker.add_sample(_sample(120, 60, 13000))
+    assert tracker.active is not None
+    assert tracker.active.start == START
+    assert tracker.active.start_soc == 40
+    assert tracker.active.energy_added_wh == 4000
+    assert tracker.total_energy_wh == 4000
+
+    tracker.add_sample(_sample(150, 65, 14000, is_charging=False))
+    (session,) = tracker.recent(10)
+    assert session.duration == timedelta(minutes=150)
+    assert session.energy_added_wh == 5000
+    assert tracker.total_energy_wh == 5000
+
+
+def test_known_samples_are_ignored() -> None:
+    """Samples not newer than the latest one do not change the sessions."""
+    tracker = ChargingSessionTracker()
+    tracker.add_sample(_sample(0, 40, 9000))
+    tracker.add_sample(_sample(30, 50, 11000))
+    assert not tracker.add_sample(_sample(30, 50, 11000))
+    assert not tracker.add_sample(_sample(10, 45, 10000))
+    assert tracker.total_energy_wh == 2000
+
+
+def test_total_never_decreases() -> None:
+    """The total (a total_increasing sensor) ignores energy drops and spans sessions."""
+    tracker = ChargingSessionTracker()
+    tracker.add_sample(_sample(0, 40, 9000))
+    tracker.add_sample(_sample(30, 50, 11000))
+    # e.g. the climate control running while charging
+    tracker.add_sample(_sample(45, 49, 10800))
+    tracker.add_sample(_sample(60, 55, 12000, is_charging=False))
+    assert tracker.total_energy_wh == 3200
+
+    # driving, then the next session
+    tracker.add_sample(_sample(600, 30, 7000, is_charging=False))
+    tracker.add_sample(_sample(660, 30, 7000))
+    tracker.add_sample(_sample(720, 40, 9000))
+    assert tracker.total_energy_wh == 5200
+    assert [session.energy_added_wh for session in tracker.recent(10)] == [3200]
+
+
+def test_restore_keeps_the_total() -> None:
+    """A restored tracker continues the total and the active session (no reset)."""
+    tracker = ChargingSessionTracker()
+    tracker.add_sample(_sample(0, 40, 9000))
+    tracker.add_sample(_sample(30, 50, 11000))
+
+    restored = ChargingSessionTracker()
+    restored.restore(tracker.as_dict())
+    assert restored.total_energy_wh == 2000
+    assert restored.add_sample(_sample(60, 60, 13000))
+    assert restored.total_energy_wh == 4000
+    assert restored.active is not None
+    assert restored.active.energy_added_wh == 4000
+
+
+def test_recent_sessions_are_bounded() -> None:
+    """Only the latest maxlen sessions are kept, the most recent first."""
+    tracker = ChargingSessionTracker(maxlen=2)
+    for index in range(3):
+        tracker.add_sample(_sample(index * 100, 40, 9000))
+        tracker.add_sample(_sample(index * 100 + 50, 50, 9000 + 1000 * (index + 1)))
+        tracker.add_sample(_sample(index * 100 + 60, 50, 0, is_charging=False))
+    assert [session.energy_added_wh for session in tracker.recent(5)] == [3000, 2000]
+    assert tracker.total_energy_wh == 6000